@@ -0,0 +1,159 @@
+"""HTTP application assembly.
+
+``create_app`` is the ASGI application factory. Servers call it once per
+worker process, so each worker has its own connection pool, sized so that
+all workers together stay within ``DATABASE_MAX_CONNECTIONS``. Background
+tasks such as the activity flusher, the token version feed and the pruning of
+the token version map start on lifespan startup. The version feed is what
+makes a token revocation reach every worker; see ``user_versions``.
+
+Usage:
+    python -m app.controllers.http.server --workers 4
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from app.controllers.http.asgi import HttpApplication, Request, Response, Router
+from app.controllers.http.v1.auth import AuthController, RepositoryScope
+from app.infrastructures.databases.postgresql.activity import ActivityTracker
+from app.infrastructures.databases.postgresql.connection import Database, DatabaseSettings
+from app.infrastructures.databases.postgresql.repositories.fast_user import (
+    FastPathUserRepository
+)
+from app.infrastructures.databases.postgresql.user_versions import UserVersionFeed
+from app.infrastructures.metrics import get_metrics_registry
+from app.infrastructures.security.claims import UserVersionMap, get_user_version_map
+from app.repository.interfaces.user import UserRepository
+
+_METRICS_HEADERS = [(b"content-type", b"text/plain; version=0.0.4; charset=utf-8")]
+
+
+class HttpSettings(BaseSettings):
+    """HTTP server settings."""
+
+    model_config = SettingsConfigDict(env_prefix="HTTP_")
+
+    host: str = "127.0.0.1"
+    port: int = 8000
+    # Worker processes; one per CPU core, since each worker runs one event loop
+    workers: int = 1
+    backlog: int = 2048
+    max_body_bytes: int = 64 * 1024
+    # Seconds between prunes of token version map entries older than the token lifetime
+    version_prune_interval: float = 60.0
+
+
+@lru_cache
+def get_http_settings() -> HttpSettings:
+    """Get HTTP settings singleton."""
+    return HttpSettings()
+
+
+class PostgresRepositoryScope:
+    """Per-worker database opening one session per request.
+
+    Also owns the worker's user activity tracker and, given a version map,
+    the feed applying other workers' user changes to it; both share the
+    database. Build it inside the worker process: ``create_app`` runs there,
+    after forking, and pooled connections must not be shared between processes.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[DatabaseSettings] = None,
+        workers: int = 1,
+        versions: Optional[UserVersionMap] = None,
+    ) -> None:
+        self._database = Database.from_settings(settings, workers=workers)
+        self.activity = ActivityTracker.from_settings(self._database)
+        self.version_feed = (
+            UserVersionFeed.from_settings(self._database, versions)
+            if versions is not None else None
+        )
+
+    async def startup(self) -> None:
+        if self.activity is not None:
+            self.activity.register_metrics(get_metrics_registry())
+            await self.activity.start()
+        if self.version_feed is not None:
+            await self.version_feed.start()
+
+    async def shutdown(self) -> None:
+        if self.version_feed is not None:
+            await self.version_feed.stop()
+        if self.activity is not None:
+            await self.activity.stop()
+        await self._database.dispose()
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[UserRepository]:
+        async with self._database.get_session() as session:
+            yield FastPathUserRepository(session)
+
+
+async def health(request: Request) -> Response:
+    """``GET /health``: liveness probe."""
+    return Response.json({"status": "ok"})
+
+
+async def metrics(request: Request) -> Response:
+    """``GET /metrics``: Prometheus text exposition of this worker's metrics."""
+    return Response(200, get_metrics_registry().exposition().encode(), _METRICS_HEADERS)
+
+
+def create_app(
+    repository_scope: Optional[RepositoryScope] = None,
+    version_map: Optional[UserVersionMap] = None,
+    settings: Optional[HttpSettings] = None,
+) -> HttpApplication:
+    """Build the account service ASGI application.
+
+    Args:
+        repository_scope: Opens a user repository per request; defaults to a
+            PostgreSQL session per request on a pool sized for ``settings.workers``
+        version_map: Token revocation map; defaults to the process-wide map
+        settings: HTTP settings; read from the environment when omitted
+
+    Returns:
+        HttpApplication: ASGI application
+    """
+    settings = settings or get_http_settings()
+    versions = version_map if version_map is not None else get_user_version_map()
+    pruning: List["asyncio.Task[None]"] = []
+
+    async def start_pruning() -> None:
+        pruning.append(asyncio.get_running_loop().create_task(
+            versions.prune_periodically(settings.version_prune_interval)
+        ))
+
+    async def stop_pruning() -> None:
+        for task in pruning:
+            task.cancel()
+        await asyncio.gather(*pruning, return_exceptions=True)
+        pruning.clear()
+
+    on_startup = [start_pruning]
+    on_shutdown = [stop_pruning]
+    activity = None
+    if repository_scope is None:
+        repository_scope = PostgresRepositoryScope(workers=settings.workers, versions=versions)
+    if isinstance(repository_scope, PostgresRepositoryScope):
+        on_startup.append(repository_scope.startup)
+        on_shutdown.append(repository_scope.shutdown)
+        activity = repository_scope.activity
+
+    router = Router()
+    router.add("GET", "/health", health)
+    router.add("GET", "/metrics", metrics)
+    AuthController(repository_scope, versions, activity).register_routes(router)
+
+    return HttpApplication(
+        router,
+        max_body_bytes=settings.max_body_bytes,
+        on_startup=on_startup,
+        on_shutdown=on_shutdown,
+    )
@@ -0,0 +1,282 @@
+"""Minimal ASGI request handling: routing, body parsing and error mapping.
+
+The service exposes a handful of JSON endpoints, so it speaks ASGI directly
+instead of going through a web framework. Each request does one dictionary
+lookup to route, reads the body, and writes two ASGI messages.
+
+Every ``AppException`` escaping a handler becomes a response with the
+exception's HTTP status and ``to_dict()`` as body. Any other exception is
+logged and answered with ``InternalServerError``.
+"""
+import logging
+import math
+import time
+from typing import (
+    Any, Awaitable, Callable, Dict, Iterable, List, MutableMapping, Optional, Tuple, Type,
+    TypeVar
+)
+
+from pydantic import BaseModel, ValidationError
+
+from app.exceptions.base import AppException
+from app.exceptions.controller import (
+    InternalServerError,
+    MalformedRequestError,
+    MethodNotAllowedError,
+    RequestTooLargeError,
+    RequestValidationError,
+    RouteNotFoundError,
+)
+from app.infrastructures.metrics import get_metrics_registry
+from .serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+Handler = Callable[["Request"], Awaitable["Response"]]
+Hook = Callable[[], Awaitable[None]]
+
+M = TypeVar("M", bound=BaseModel)
+
+_UNMATCHED_ROUTE = "unmatched"
+_JSON_HEADERS = [(b"content-type", b"application/json")]
+
+_HTTP_REQUESTS = get_metrics_registry().counter(
+    "http_requests_total", "Handled HTTP requests", labels=("route", "status")
+)
+_HTTP_REQUEST_SECONDS = get_metrics_registry().histogram(
+    "http_request_seconds", "HTTP request handling time", labels=("route",)
+)
+_REQUEST_VALIDATION_SECONDS = get_metrics_registry().histogram(
+    "request_validation_seconds", "Request body parsing and validation time", labels=("schema",)
+)
+
+
+class Request:
+    """An HTTP request with its body fully read."""
+
+    __slots__ = ("scope", "body")
+
+    def __init__(self, scope: Scope, body: bytes) -> None:
+        self.scope = scope
+        self.body = body
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def path(self) -> str:
+        return self.scope["path"]
+
+    def header(self, name: bytes) -> Optional[str]:
+        """Get a header value by lower-case name."""
+        for key, value in self.scope["headers"]:
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    def bearer_token(self) -> Optional[str]:
+        """Get the token of an ``Authorization: Bearer`` header."""
+        authorization = self.header(b"authorization")
+        if authorization is None:
+            return None
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            return None
+        return token.strip()
+
+
+class Response:
+    """A fully buffered HTTP response."""
+
+    __slots__ = ("status", "body", "headers")
+
+    def __init__(
+        self, status: int, body: bytes, headers: Optional[List[Tuple[bytes, bytes]]] = None
+    ) -> None:
+        self.status = status
+        self.body = body
+        self.headers = headers if headers is not None else _JSON_HEADERS
+
+    @classmethod
+    def model(cls, model: BaseModel, status: int = 200) -> "Response":
+        """JSON response of a pydantic model, serialized by pydantic's native encoder."""
+        return cls(status, model.__pydantic_serializer__.to_json(model))
+
+    @classmethod
+    def json(cls, value: Any, status: int = 200) -> "Response":
+        return cls(status, dumps(value))
+
+    @classmethod
+    def error(cls, error: AppException) -> "Response":
+        headers = _JSON_HEADERS
+        if error.http_status == 401:
+            headers = _JSON_HEADERS + [(b"www-authenticate", b"Bearer")]
+        elif error.http_status == 503 and "retry_after" in error.details:
+            # Shed load: tell clients when an open circuit lets calls through again
+            retry_after = str(math.ceil(error.details["retry_after"])).encode()
+            headers = _JSON_HEADERS + [(b"retry-after", retry_after)]
+        body = error.prebuilt_body or dumps(error.to_dict())
+        return cls(error.http_status, body, headers)
+
+
+def parse_body(model: Type[M], body: bytes) -> M:
+    """Validate a JSON request body against a schema.
+
+    Raises:
+        MalformedRequestError: If the body is not JSON
+        RequestValidationError: If the body does not match the schema
+    """
+    started = time.perf_counter()
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as error:
+        errors = error.errors(include_url=False, include_input=False)
+        if any(item["type"] == "json_invalid" for item in errors):
+            raise MalformedRequestError()
+        raise RequestValidationError(details={
+            "errors": [
+                {"field": ".".join(str(part) for part in item["loc"]), "message": item["msg"]}
+                for item in errors
+            ]
+        })
+    finally:
+        _REQUEST_VALIDATION_SECONDS.labels(model.__name__).observe(
+            time.perf_counter() - started
+        )
+
+
+class Router:
+    """Exact-path routing table."""
+
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+        self._methods_by_path: Dict[str, List[str]] = {}
+
+    def add(self, method: str, path: str, handler: Handler) -> None:
+        """Register a handler.
+
+        Raises:
+            ValueError: If the method and path are already routed
+        """
+        key = (method.upper(), path)
+        if key in self._routes:
+            raise ValueError(f"Route {method} {path} is already registered")
+        self._routes[key] = handler
+        self._methods_by_path.setdefault(path, []).append(key[0])
+
+    def resolve(self, method: str, path: str) -> Handler:
+        """Find the handler of a request.
+
+        Raises:
+            RouteNotFoundError: If no route has the path
+            MethodNotAllowedError: If the path is routed for other methods only
+        """
+        handler = self._routes.get((method, path))
+        if handler is not None:
+            return handler
+        methods = self._methods_by_path.get(path)
+        if methods is None:
+            raise RouteNotFoundError(details={"path": path})
+        raise MethodNotAllowedError(details={"allowed": methods})
+
+    def is_routed(self, path: str) -> bool:
+        return path in self._methods_by_path
+
+
+class HttpApplication:
+    """ASGI application dispatching to a router.
+
+    Usage:
+        router = Router()
+        router.add("GET", "/health", health)
+        app = HttpApplication(router, on_startup=[database.connect])
+    """
+
+    def __init__(
+        self,
+        router: Router,
+        max_body_bytes: int = 64 * 1024,
+        on_startup: Iterable[Hook] = (),
+        on_shutdown: Iterable[Hook] = (),
+    ) -> None:
+        """Initialize the application.
+
+        Args:
+            router: Routing table
+            max_body_bytes: Larger request bodies are rejected with 413
+            on_startup: Run once per worker process before serving, e.g. to open pools
+            on_shutdown: Run once per worker process after serving
+        """
+        self._router = router
+        self._max_body_bytes = max_body_bytes
+        self._on_startup = list(on_startup)
+        self._on_shutdown = list(on_shutdown)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            await self._handle(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        started = time.perf_counter()
+        path = scope["path"]
+        route = path if self._router.is_routed(path) else _UNMATCHED_ROUTE
+        try:
+            handler = self._router.resolve(scope["method"], path)
+            request = Request(scope, await self._read_body(receive))
+            response = await handler(request)
+        except AppException as error:
+            response = Response.error(error)
+        except Exception:
+            logger.exception("Unhandled error in %s %s", scope["method"], path)
+            response = Response.error(InternalServerError())
+
+        headers = response.headers + [(b"content-length", str(len(response.body)).encode())]
+        await send({"type": "http.response.start", "status": response.status, "headers": headers})
+        await send({"type": "http.response.body", "body": response.body})
+
+        _HTTP_REQUESTS.labels(route, str(response.status)).inc()
+        _HTTP_REQUEST_SECONDS.labels(route).observe(time.perf_counter() - started)
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks: List[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self._max_body_bytes:
+                raise RequestTooLargeError(details={"max_bytes": self._max_body_bytes})
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    for hook in self._on_startup:
+                        await hook()
+                except Exception as error:
+                    logger.exception("Application startup failed")
+                    await send({"type": "lifespan.startup.failed", "message": str(error)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for hook in self._on_shutdown:
+                    try:
+                        await hook()
+                    except Exception:
+                        logger.exception("Application shutdown hook failed")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,21 @@
+"""JSON encoding of HTTP response bodies.
+
+Uses orjson when it is installed (the ``server`` extra) and falls back to the
+standard library.
+Request bodies are parsed by pydantic (``model_validate_json``), whose parser
+is already native, so only dictionaries built here are encoded by this module.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON; unknown types are encoded with ``str``."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode()
@@ -0,0 +1,59 @@
+"""Multi-process HTTP server entry point.
+
+Runs the ASGI application under uvicorn (the ``server`` extra) with one
+worker process per ``--workers``. Every worker calls ``create_app`` itself
+and sizes its connection pool to ``DATABASE_MAX_CONNECTIONS / workers``;
+the worker count reaches the workers through ``HTTP_WORKERS``.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://localhost:5432/account \\
+        python -m app.controllers.http.server --workers 4 --port 8000
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from app.controllers.http.app import get_http_settings
+
+APP_FACTORY = "app.controllers.http.app:create_app"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = get_http_settings()
+    parser = argparse.ArgumentParser(description="Run the account service HTTP server")
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=settings.workers)
+    parser.add_argument("--backlog", type=int, default=settings.backlog)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print(
+            "uvicorn is required to serve HTTP: pip install 'py-account[server]'",
+            file=sys.stderr,
+        )
+        return 2
+
+    # Workers import the factory in fresh processes and read their settings
+    # from the environment
+    os.environ["HTTP_WORKERS"] = str(args.workers)
+    uvicorn.run(
+        APP_FACTORY,
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        backlog=args.backlog,
+        log_level=args.log_level,
+        access_log=False,  # One log line per request costs more than handling it
+        lifespan="on",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""In-process ASGI client for tests, benchmarks and load generation.
+
+Calls the application coroutine directly: no sockets, no HTTP parsing, so
+measurements cover the application itself.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.controllers.http.asgi import Message
+from app.controllers.http.serialization import dumps
+
+
+class AsgiResponse(NamedTuple):
+    status: int
+    headers: Dict[bytes, bytes]
+    body: bytes
+
+
+async def call_app(
+    app: Any,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    headers: Iterable[Tuple[bytes, bytes]] = (),
+) -> AsgiResponse:
+    """Send one HTTP request through an ASGI application."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), *headers],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 80),
+    }
+    request_sent = False
+    messages: List[Message] = []
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    return AsgiResponse(
+        status=start["status"],
+        headers=dict(start["headers"]),
+        body=b"".join(message.get("body", b"") for message in messages[1:]),
+    )
+
+
+async def call_json(
+    app: Any,
+    method: str,
+    path: str,
+    payload: Optional[Any] = None,
+    token: Optional[str] = None,
+) -> AsgiResponse:
+    """Send a JSON request, optionally with a bearer token."""
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    body = dumps(payload) if payload is not None else b""
+    return await call_app(app, method, path, body, headers)
+
+
+@asynccontextmanager
+async def lifespan(app: Any) -> AsyncIterator[None]:
+    """Run the application's lifespan startup on enter and shutdown on exit.
+
+    Raises:
+        RuntimeError: If startup fails
+    """
+    inbox: "asyncio.Queue[Message]" = asyncio.Queue()
+    outbox: "asyncio.Queue[Message]" = asyncio.Queue()
+    task = asyncio.create_task(app({"type": "lifespan"}, inbox.get, outbox.put))
+
+    await inbox.put({"type": "lifespan.startup"})
+    started = await outbox.get()
+    if started["type"] != "lifespan.startup.complete":
+        await task
+        raise RuntimeError(f"Application startup failed: {started.get('message')}")
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
@@ -0,0 +1,85 @@
+"""Auth HTTP endpoints (v1)."""
+from typing import AsyncContextManager, Callable, Optional
+
+from app.controllers.http.asgi import Request, Response, Router, parse_body
+from app.exceptions.controller import MissingCredentialsError
+from app.infrastructures.security.claims import UserVersionMap, VersionTrackingUserRepository
+from app.repository.interfaces.activity import ActivityRecorder
+from app.repository.interfaces.user import UserRepository
+from app.schemas.auth import LoginRequest, RegisterRequest
+from app.services.auth import DefaultAuthService
+
+RepositoryScope = Callable[[], AsyncContextManager[UserRepository]]
+
+
+class AuthController:
+    """Register, login and token verification endpoints.
+
+    Each request runs in its own repository scope, i.e. its own database
+    session, which is closed before the response is sent. User changes made
+    through it are fed into the version map, revoking older tokens. Token
+    verification opens no scope: it only needs the signature and the map.
+    """
+
+    def __init__(
+        self,
+        repository_scope: RepositoryScope,
+        version_map: Optional[UserVersionMap] = None,
+        activity: Optional[ActivityRecorder] = None,
+    ) -> None:
+        """Initialize the controller.
+
+        Args:
+            repository_scope: Opens a user repository for the duration of one request
+            version_map: Rejects tokens of deactivated or modified users when given
+            activity: Records logins and authenticated requests when given
+        """
+        self._repository_scope = repository_scope
+        self._version_map = version_map
+        self._activity = activity
+        self._token_service = DefaultAuthService(None, version_map, activity)
+
+    def register_routes(self, router: Router) -> None:
+        router.add("POST", "/v1/auth/register", self.register)
+        router.add("POST", "/v1/auth/login", self.login)
+        router.add("GET", "/v1/auth/token", self.token)
+        router.add("GET", "/v1/auth/me", self.me)
+
+    async def register(self, request: Request) -> Response:
+        """``POST /v1/auth/register``: create a user and return it with an access token."""
+        payload = parse_body(RegisterRequest, request.body)
+        async with self._repository_scope() as repository:
+            result = await self._service(repository).register(payload)
+        return Response.model(result, status=201)
+
+    async def login(self, request: Request) -> Response:
+        """``POST /v1/auth/login``: exchange email and password for an access token."""
+        payload = parse_body(LoginRequest, request.body)
+        async with self._repository_scope() as repository:
+            result = await self._service(repository).login(payload)
+        return Response.model(result)
+
+    async def token(self, request: Request) -> Response:
+        """``GET /v1/auth/token``: verify the bearer token without a database round trip."""
+        token = _require_bearer_token(request)
+        result = await self._token_service.verify_token(token)
+        return Response.model(result)
+
+    async def me(self, request: Request) -> Response:
+        """``GET /v1/auth/me``: load the user of the bearer token."""
+        token = _require_bearer_token(request)
+        async with self._repository_scope() as repository:
+            result = await self._service(repository).get_current_user(token)
+        return Response.model(result)
+
+    def _service(self, repository: UserRepository) -> DefaultAuthService:
+        if self._version_map is not None:
+            repository = VersionTrackingUserRepository(repository, self._version_map)
+        return DefaultAuthService(repository, self._version_map, self._activity)
+
+
+def _require_bearer_token(request: Request) -> str:
+    token = request.bearer_token()
+    if token is None:
+        raise MissingCredentialsError()
+    return token
@@ -1,7 +1,32 @@
-"""Base exception module for the application."""
+"""Base exception module for the application.
+
+Concrete exceptions declare their code as class variables, and layer bases
+declare ``_layer``:
+
+    class DuplicateEmailError(RepositoryException):
+        _message = "Email is already taken"
+        _http_status = 409
+        _severity = ErrorSeverity.EXPECTED
+        _sequence = 1
+
+The code string and its metrics series are built once, when the class is
+defined, and each sequence number may be used once per layer. A duplicate
+fails the import of the module declaring it, not a request. EXPECTED errors
+are raised on every failed login or duplicate registration, so their response
+bodies are serialized up front as well (see ``AppException.prebuilt_body``).
+"""
+import json
 from dataclasses import dataclass
-from enum import Enum, auto
-from typing import Any, Dict, Optional
+from enum import Enum
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type
+
+from app.infrastructures.metrics import CounterChild, get_metrics_registry
+
+_APP_EXCEPTIONS = get_metrics_registry().counter(
+    "app_exceptions_total",
+    "Application exceptions raised, by error code",
+    labels=("code", "layer", "severity"),
+)
 
 
 class ErrorSeverity(Enum):
@@ -36,33 +61,116 @@ class ErrorCode:
         return f"{self.http_status}{self.severity.value}{self.layer.value}{str(self.sequence).zfill(3)}"
 
 
+# Concrete exceptions by (layer, sequence)
+_REGISTRY: Dict[Tuple[ErrorLayer, int], Type["AppException"]] = {}
+
+
+def _serialize(payload: Dict[str, Any]) -> bytes:
+    # Same bytes as the HTTP layer's encoder produces for string-only payloads
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def registered_exceptions() -> Dict[str, Type["AppException"]]:
+    """Get every concrete application exception by error code."""
+    return {cls.code: cls for cls in _REGISTRY.values()}
+
+
 class AppException(Exception):
     """Base exception class for the application."""
 
+    # Declared by concrete subclasses; _layer by the layer bases
+    _message: ClassVar[str] = ""
+    _http_status: ClassVar[Optional[int]] = None
+    _severity: ClassVar[Optional[ErrorSeverity]] = None
+    _layer: ClassVar[Optional[ErrorLayer]] = None
+    _sequence: ClassVar[Optional[int]] = None
+    # Further fixed messages of EXPECTED errors whose bodies are prebuilt
+    _messages: ClassVar[Tuple[str, ...]] = ()
+
+    # Derived once per class from the declarations above
+    code: ClassVar[str] = ""
+    http_status: ClassVar[int] = 500
+    _raised: ClassVar[Optional[CounterChild]] = None
+    _bodies: ClassVar[Dict[str, bytes]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Derive the code of a concrete exception and register it.
+
+        Subclasses of a concrete exception share its code.
+
+        Raises:
+            ValueError: If the declaration is invalid or its sequence is already used
+                in the layer
+        """
+        super().__init_subclass__(**kwargs)
+        if "_sequence" not in cls.__dict__:
+            return
+        http_status, severity, layer, sequence = (
+            cls._http_status, cls._severity, cls._layer, cls._sequence
+        )
+        if (
+            not isinstance(http_status, int) or not 100 <= http_status <= 599
+            or not isinstance(severity, ErrorSeverity) or not isinstance(layer, ErrorLayer)
+            or not isinstance(sequence, int) or not 1 <= sequence <= 999
+        ):
+            raise ValueError(
+                f"{cls.__qualname__} must declare _http_status (100-599), _severity, "
+                "_sequence (1-999) and inherit a _layer"
+            )
+        previous = _REGISTRY.get((layer, sequence))
+        # A reloaded module redefines its classes under the same name
+        if previous is not None and (
+            (previous.__module__, previous.__qualname__) != (cls.__module__, cls.__qualname__)
+        ):
+            raise ValueError(
+                f"{cls.__module__}.{cls.__qualname__} reuses sequence {sequence} of the "
+                f"{layer.name.lower()} layer, already used by "
+                f"{previous.__module__}.{previous.__qualname__} ({previous.code})"
+            )
+        _REGISTRY[(layer, sequence)] = cls
+
+        cls.code = str(ErrorCode(http_status, severity, layer, sequence))
+        cls.http_status = http_status
+        cls._raised = _APP_EXCEPTIONS.labels(cls.code, layer.name.lower(), severity.name.lower())
+        cls._bodies = {}
+        if severity is ErrorSeverity.EXPECTED:
+            for message in (cls._message, *cls._messages):
+                cls._bodies[message] = _serialize(
+                    {"code": cls.code, "message": message, "details": {}}
+                )
+
     def __init__(
-        self,
-        message: str,
-        http_status: int,
-        severity: ErrorSeverity,
-        layer: ErrorLayer,
-        sequence: int,
-        details: Optional[Dict[str, Any]] = None
+        self, details: Optional[Dict[str, Any]] = None, message: Optional[str] = None
     ) -> None:
         """Initialize the exception.
-        
+
         Args:
-            message: Human-readable error message
-            http_status: HTTP status code
-            severity: Error severity level
-            layer: Application layer where the error occurred
-            sequence: Error sequence number within the layer
             details: Additional error details (optional)
+            message: Human-readable error message; defaults to the class message
+
+        Raises:
+            TypeError: If the class declares no error code
         """
-        self.message = message
-        self.code = str(ErrorCode(http_status, severity, layer, sequence))
+        raised = self._raised
+        if raised is None:
+            raise TypeError(f"{type(self).__qualname__} declares no error code")
+        self.message = self._message if message is None else message
         self.details = details or {}
+        raised.inc()
         super().__init__(self.message)
 
+    @property
+    def prebuilt_body(self) -> Optional[bytes]:
+        """Serialized ``to_dict()`` shared by every instance, if there is one.
+
+        Returns:
+            Optional[bytes]: JSON body, or None when this instance must be
+                serialized itself
+        """
+        if self.details:
+            return None
+        return self._bodies.get(self.message)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary format.
         
@@ -0,0 +1,116 @@
+"""Controller layer exceptions.
+
+Raised by input adapters (HTTP) for requests that never reach a service.
+"""
+
+from .base import AppException, ErrorLayer, ErrorSeverity
+
+
+class ControllerException(AppException):
+    """Base exception for controller layer."""
+    _layer = ErrorLayer.CONTROLLER
+
+
+class MalformedRequestError(ControllerException):
+    """Raised when a request body is not valid JSON.
+
+    Error Code: 4003005001
+    - 400: Bad Request
+    - 30: Low severity (client input error)
+    - 05: Controller layer
+    - 001: Sequence within the controller layer
+    """
+    _message = "Request body is not valid JSON"
+    _http_status = 400  # Bad Request
+    _severity = ErrorSeverity.LOW
+    _sequence = 1
+
+
+class RequestValidationError(ControllerException):
+    """Raised when a request body fails schema validation.
+
+    Error Code: 4223005002
+    - 422: Unprocessable Entity
+    - 30: Low severity (client input error)
+    - 05: Controller layer
+    - 002: Sequence within the controller layer
+    """
+    _message = "Request validation failed"
+    _http_status = 422  # Unprocessable Entity
+    _severity = ErrorSeverity.LOW
+    _sequence = 2
+
+
+class RouteNotFoundError(ControllerException):
+    """Raised when no route matches the request path.
+
+    Error Code: 4049905003
+    - 404: Not Found
+    - 99: Expected severity
+    - 05: Controller layer
+    - 003: Sequence within the controller layer
+    """
+    _message = "Resource not found"
+    _http_status = 404  # Not Found
+    _severity = ErrorSeverity.EXPECTED
+    _sequence = 3
+
+
+class MethodNotAllowedError(ControllerException):
+    """Raised when the route exists but not for the request method.
+
+    Error Code: 4059905004
+    - 405: Method Not Allowed
+    - 99: Expected severity
+    - 05: Controller layer
+    - 004: Sequence within the controller layer
+    """
+    _message = "Method not allowed"
+    _http_status = 405  # Method Not Allowed
+    _severity = ErrorSeverity.EXPECTED
+    _sequence = 4
+
+
+class RequestTooLargeError(ControllerException):
+    """Raised when a request body exceeds the configured limit.
+
+    Error Code: 4133005005
+    - 413: Payload Too Large
+    - 30: Low severity (client input error)
+    - 05: Controller layer
+    - 005: Sequence within the controller layer
+    """
+    _message = "Request body too large"
+    _http_status = 413  # Payload Too Large
+    _severity = ErrorSeverity.LOW
+    _sequence = 5
+
+
+class MissingCredentialsError(ControllerException):
+    """Raised when a protected endpoint is called without a bearer token.
+
+    Error Code: 4019905006
+    - 401: Unauthorized
+    - 99: Expected severity
+    - 05: Controller layer
+    - 006: Sequence within the controller layer
+    """
+    _message = "Bearer token required"
+    _http_status = 401  # Unauthorized
+    _severity = ErrorSeverity.EXPECTED
+    _sequence = 6
+
+
+class InternalServerError(ControllerException):
+    """Raised in place of unexpected exceptions escaping a handler.
+
+    Error Code: 5000005007
+    - 500: Internal Server Error
+    - 00: Critical severity
+    - 05: Controller layer
+    - 007: Sequence within the controller layer
+    """
+    _message = "Internal server error"
+    _http_status = 500  # Internal Server Error
+    _severity = ErrorSeverity.CRITICAL
+    _sequence = 7
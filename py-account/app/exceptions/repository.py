@@ -0,0 +1,26 @@
+"""Repository layer exceptions."""
+
+from .base import AppException, ErrorLayer, ErrorSeverity
+
+
+class RepositoryException(AppException):
+    """Base exception for repository layer.
+
+    All data access exceptions should inherit from this class.
+    """
+    _layer = ErrorLayer.REPOSITORY
+
+
+class DuplicateEmailError(RepositoryException):
+    """Raised when storing a user whose email is already taken.
+
+    Error Code: 4099902001
+    - 409: Conflict
+    - 99: Expected severity (normal registration flow)
+    - 02: Repository layer
+    - 001: First repository error
+    """
+    _message = "Email is already taken"
+    _http_status = 409  # Conflict - Email must be unique
+    _severity = ErrorSeverity.EXPECTED  # Duplicate registrations are a normal flow
+    _sequence = 1
@@ -6,42 +6,66 @@ from .base import AppException, ErrorLayer, ErrorSeverity
 
 class ServiceException(AppException):
     """Base exception for service layer."""
-
-    def __init__(
-        self,
-        message: str,
-        http_status: int,
-        severity: ErrorSeverity,
-        sequence: int,
-        details: Optional[Dict[str, Any]] = None
-    ) -> None:
-        """Initialize service exception."""
-        super().__init__(message, http_status, severity, ErrorLayer.SERVICE, sequence, details)
+    _layer = ErrorLayer.SERVICE
 
 
 class UserAlreadyExistsError(ServiceException):
-    """Raised when attempting to register a user that already exists."""
+    """Raised when attempting to register a user that already exists.
+
+    The message does not repeat the address, so every instance shares one
+    prebuilt response body.
 
-    def __init__(self, email: str, details: Optional[Dict[str, Any]] = None) -> None:
-        """Initialize user already exists error."""
-        super().__init__(
-            message=f"User with email {email} already exists",
-            http_status=409,  # Conflict
-            severity=ErrorSeverity.EXPECTED,  # Expected in normal flow
-            sequence=1,
-            details=details
-        )
+    Error Code: 4099904001
+    - 409: Conflict
+    - 99: Expected severity (normal registration flow)
+    - 04: Service layer
+    - 001: First service error
+    """
+    _message = "A user with this email already exists"
+    _http_status = 409  # Conflict
+    _severity = ErrorSeverity.EXPECTED  # Expected in normal flow
+    _sequence = 1
 
 
 class InvalidCredentialsError(ServiceException):
-    """Raised when login credentials are invalid."""
-
-    def __init__(self, details: Optional[Dict[str, Any]] = None) -> None:
-        """Initialize invalid credentials error."""
-        super().__init__(
-            message="Invalid email or password",
-            http_status=401,  # Unauthorized
-            severity=ErrorSeverity.EXPECTED,  # Expected in normal flow
-            sequence=2,
-            details=details
-        )
+    """Raised when login credentials are invalid.
+
+    Error Code: 4019904002
+    - 401: Unauthorized
+    - 99: Expected severity (normal login flow)
+    - 04: Service layer
+    - 002: Second service error
+    """
+    _message = "Invalid email or password"
+    _http_status = 401  # Unauthorized
+    _severity = ErrorSeverity.EXPECTED  # Expected in normal flow
+    _sequence = 2
+
+
+class InvalidTokenError(ServiceException):
+    """Raised when an access token is expired, invalid or revoked.
+
+    Error Code: 4019904003
+    - 401: Unauthorized
+    - 99: Expected severity (expired tokens are a normal flow)
+    - 04: Service layer
+    - 003: Third service error
+    """
+    _message = "Invalid access token"
+    _http_status = 401  # Unauthorized
+    _severity = ErrorSeverity.EXPECTED  # Expired tokens are a normal flow
+    _sequence = 3
+    _messages = (
+        "Invalid access token: expired",
+        "Invalid access token: invalid",
+        "Invalid access token: revoked",
+    )
+
+    def __init__(self, reason: str, details: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize invalid token error.
+
+        Args:
+            reason: Why the token was rejected: expired, invalid or revoked
+            details: Optional error context
+        """
+        super().__init__(details, message=f"{self._message}: {reason}")
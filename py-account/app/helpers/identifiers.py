@@ -0,0 +1,152 @@
+"""Time-ordered UUIDv7 identifiers (RFC 9562).
+
+Layout (most significant bit first):
+- 48 bits: Unix timestamp in milliseconds
+- 4 bits: version (7)
+- 12 bits: counter, monotonic within one millisecond
+- 2 bits: variant (0b10)
+- 62 bits: random
+
+Consecutive identifiers sort in generation order, so B-tree inserts append to
+the right-most index page instead of splitting pages all over the index.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Tuple
+from uuid import UUID, SafeUUID
+
+_VERSION_BITS = 0x7 << 76
+_VARIANT_BITS = 0x2 << 62
+_COUNTER_MAX = 0xFFF
+_RANDOM_MASK = (1 << 62) - 1
+_TIMESTAMP_MAX = (1 << 48) - 1
+
+# Random bytes are read from the OS in chunks; one os.urandom call per
+# identifier would dominate the generation cost
+_ENTROPY_BYTES = 10
+_ENTROPY_CHUNK = _ENTROPY_BYTES * 512
+
+_lock = threading.Lock()
+_last_timestamp_ms = 0
+_last_counter = 0
+_entropy = b""
+_entropy_offset = 0
+
+
+def _discard_entropy() -> None:
+    # Forked workers must not reuse the parent's buffered random bytes
+    global _entropy, _entropy_offset
+    _entropy = b""
+    _entropy_offset = 0
+
+
+os.register_at_fork(after_in_child=_discard_entropy)
+
+
+def _pack(timestamp_ms: int, counter: int, random_bits: int) -> UUID:
+    value = (
+        (timestamp_ms << 80) | _VERSION_BITS | (counter << 64) | _VARIANT_BITS
+        | (random_bits & _RANDOM_MASK)
+    )
+    # Bypass UUID.__init__ argument parsing; the value is valid by construction
+    uuid = object.__new__(UUID)
+    object.__setattr__(uuid, "int", value)
+    object.__setattr__(uuid, "is_safe", SafeUUID.unknown)
+    return uuid
+
+
+def uuid7() -> UUID:
+    """Generate a time-ordered UUIDv7.
+
+    Identifiers generated by this process are strictly increasing: within the
+    same millisecond the 12-bit counter is incremented, and when it overflows
+    (or the clock moves backwards) the timestamp is advanced by one millisecond.
+
+    Returns:
+        UUID: New UUIDv7
+    """
+    global _last_timestamp_ms, _last_counter, _entropy, _entropy_offset
+
+    timestamp_ms = time.time_ns() // 1_000_000
+    with _lock:
+        if _entropy_offset >= len(_entropy):
+            _entropy = os.urandom(_ENTROPY_CHUNK)
+            _entropy_offset = 0
+        entropy = int.from_bytes(_entropy[_entropy_offset:_entropy_offset + _ENTROPY_BYTES], "big")
+        _entropy_offset += _ENTROPY_BYTES
+
+        if timestamp_ms > _last_timestamp_ms:
+            # Start each millisecond in the lower half of the counter range
+            # so there is room to increment
+            counter = (entropy >> 62) & 0x7FF
+        else:
+            timestamp_ms = _last_timestamp_ms
+            counter = _last_counter + 1
+            if counter > _COUNTER_MAX:
+                timestamp_ms += 1
+                counter = 0
+        _last_timestamp_ms = timestamp_ms
+        _last_counter = counter
+    return _pack(timestamp_ms, counter, entropy)
+
+
+def uuid7_at(moment: datetime, random_bits: int) -> UUID:
+    """Build a UUIDv7 for a given moment, e.g. for backfills and synthetic data.
+
+    Args:
+        moment: Timezone-aware creation time
+        random_bits: Bits for the counter and random fields (74 bits are used)
+
+    Returns:
+        UUID: UUIDv7 carrying the timestamp of ``moment``
+    """
+    return _pack(_to_timestamp_ms(moment), (random_bits >> 62) & _COUNTER_MAX, random_bits)
+
+
+def uuid7_timestamp(value: UUID) -> datetime:
+    """Extract the creation time of a UUIDv7.
+
+    Args:
+        value: UUIDv7 to inspect
+
+    Returns:
+        datetime: UTC timestamp with millisecond precision
+
+    Raises:
+        ValueError: If ``value`` is not a UUIDv7
+    """
+    if value.version != 7:
+        raise ValueError(f"UUID {value} is not a version 7 UUID")
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
+
+
+def uuid7_range(start: datetime, end: datetime) -> Tuple[UUID, UUID]:
+    """Get inclusive bounds of all UUIDv7 values created within a time range.
+
+    Usage:
+        lower, upper = uuid7_range(since, until)
+        select(UserModel).where(UserModel.id.between(lower, upper))
+
+    Args:
+        start: Timezone-aware range start
+        end: Timezone-aware range end
+
+    Returns:
+        tuple: (lowest UUID at ``start``, highest UUID at ``end``)
+
+    Raises:
+        ValueError: If ``end`` is before ``start`` or a timestamp is naive
+    """
+    start_ms = _to_timestamp_ms(start)
+    end_ms = _to_timestamp_ms(end)
+    if end_ms < start_ms:
+        raise ValueError("Range end must not be before range start")
+    return _pack(start_ms, 0, 0), _pack(end_ms, _COUNTER_MAX, _RANDOM_MASK)
+
+
+def _to_timestamp_ms(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        raise ValueError("Timestamps must be timezone-aware")
+    return min(max(int(moment.timestamp() * 1000), 0), _TIMESTAMP_MAX)
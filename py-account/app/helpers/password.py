@@ -1,8 +1,24 @@
 """Password validation and hashing utilities."""
 import re
+import time
 from typing import Optional
 import bcrypt
 
+from app.infrastructures.metrics import get_metrics_registry
+from app.infrastructures.security.breach_filter import get_breach_filter
+
+_PASSWORD_HASH_SECONDS = get_metrics_registry().histogram(
+    "password_hash_seconds",
+    "bcrypt hashing and verification time",
+    labels=("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 2.0),
+)
+_HASH_SECONDS = _PASSWORD_HASH_SECONDS.labels("hash")
+_VERIFY_SECONDS = _PASSWORD_HASH_SECONDS.labels("verify")
+_BREACHED_PASSWORDS = get_metrics_registry().counter(
+    "password_breached_total", "Passwords rejected by the breached password filter"
+)
+
 def validate_password_complexity(password: str) -> tuple[bool, Optional[str]]:
     """Validate password meets complexity requirements.
     
@@ -36,6 +52,25 @@ def validate_password_complexity(password: str) -> tuple[bool, Optional[str]]:
     
     return True, None
 
+def validate_password_not_breached(password: str) -> tuple[bool, Optional[str]]:
+    """Validate password does not appear in a known breach corpus.
+    
+    Checks the breached password filter configured by ``BREACH_FILTER_PATH``;
+    passes every password when no filter is configured.
+    
+    Args:
+        password: The password to validate
+        
+    Returns:
+        tuple: (is_valid, error_message)
+    """
+    breach_filter = get_breach_filter()
+    if breach_filter is not None and password in breach_filter:
+        _BREACHED_PASSWORDS.inc()
+        return False, "Password has appeared in a data breach, please choose another one"
+    
+    return True, None
+
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt.
     
@@ -45,8 +80,11 @@ def hash_password(password: str) -> str:
     Returns:
         str: The hashed password
     """
+    started = time.perf_counter()
     salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode(), salt).decode()
+    hashed = bcrypt.hashpw(password.encode(), salt).decode()
+    _HASH_SECONDS.observe(time.perf_counter() - started)
+    return hashed
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """Verify a password against its hash.
@@ -58,7 +96,10 @@ def verify_password(password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return bcrypt.checkpw(
+    started = time.perf_counter()
+    matches = bcrypt.checkpw(
         password.encode(), 
         hashed_password.encode()
     )
+    _VERIFY_SECONDS.observe(time.perf_counter() - started)
+    return matches
@@ -0,0 +1,256 @@
+"""Request coalescing for repository point lookups.
+
+``BatchLoader`` collects keys requested within one event-loop tick (or a short
+window), de-duplicates them and resolves every caller from a single batch call.
+``CoalescingUserRepository`` applies it to ``get_by_id`` and ``get_by_email``
+so that fan-out over overlapping users issues one ``= ANY(...)`` query instead
+of one ``SELECT`` per coroutine.
+
+Loaders cache results for their lifetime. Create one ``CoalescingUserRepository``
+per request (next to the request's session) so results never leak across
+requests; share a ``BatchStats`` instance between them to aggregate metrics.
+"""
+import asyncio
+from typing import (
+    Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, Set, TypeVar
+)
+from uuid import UUID
+
+from app.repository.interfaces.user import UserRepository
+from app.repository.models.user import User
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchStats:
+    """Aggregated batching metrics."""
+
+    __slots__ = ("loads", "cache_hits", "batches", "keys_dispatched", "max_batch_size")
+
+    def __init__(self) -> None:
+        self.loads = 0
+        self.cache_hits = 0
+        self.batches = 0
+        self.keys_dispatched = 0
+        self.max_batch_size = 0
+
+    def record_batch(self, size: int) -> None:
+        """Record one dispatched batch of ``size`` unique keys."""
+        self.batches += 1
+        self.keys_dispatched += size
+        if size > self.max_batch_size:
+            self.max_batch_size = size
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.keys_dispatched / self.batches if self.batches else 0.0
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesce single-key loads into batch calls.
+
+    Usage:
+        loader = BatchLoader(repository.get_many_by_ids)
+        users = await asyncio.gather(*(loader.load(user_id) for user_id in user_ids))
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 500,
+        window: float = 0.0,
+        stats: Optional[BatchStats] = None,
+    ) -> None:
+        """Initialize the loader.
+
+        Args:
+            batch_fn: Loads many keys at once; keys missing from the result resolve to None
+            max_batch_size: Dispatch immediately once this many unique keys are queued
+            window: Seconds to wait for more keys; 0 dispatches at the end of the current tick
+            stats: Metrics sink, shared between loaders to aggregate
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._window = window
+        self._stats = stats or BatchStats()
+        self._futures: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._queue: List[K] = []
+        self._scheduled: Optional[asyncio.Handle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def stats(self) -> BatchStats:
+        return self._stats
+
+    async def load(self, key: K) -> Optional[V]:
+        """Load one key, sharing the lookup with concurrent callers.
+
+        Returns:
+            The loaded value, or None if the batch returned nothing for the key
+        """
+        self._stats.loads += 1
+        future = self._futures.get(key)
+        if future is not None:
+            self._stats.cache_hits += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) >= self._max_batch_size:
+                self._dispatch()
+            elif self._scheduled is None:
+                if self._window > 0:
+                    self._scheduled = loop.call_later(self._window, self._dispatch)
+                else:
+                    self._scheduled = loop.call_soon(self._dispatch)
+        # Shielded so that one cancelled caller does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def prime(self, key: K, value: V) -> None:
+        """Store a known value, e.g. after a write."""
+        future = self._futures.get(key)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._futures[key] = future
+
+    def clear(self, key: K) -> None:
+        """Forget a cached value so the next load fetches it again."""
+        future = self._futures.get(key)
+        if future is not None and future.done():
+            del self._futures[key]
+
+    def _dispatch(self) -> None:
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        keys, self._queue = self._queue, []
+        if not keys:
+            return
+        self._stats.record_batch(len(keys))
+        task = asyncio.get_running_loop().create_task(self._run_batch(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, keys: List[K]) -> None:
+        try:
+            results = await self._batch_fn(keys)
+        except Exception as error:
+            # Failed keys are not cached, so a later load retries them
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(error)
+                    # Mark retrieved: callers that went away must not trigger warnings
+                    future.exception()
+            return
+        except BaseException:
+            for key in keys:
+                self._futures.pop(key).cancel()
+            raise
+
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+class CoalescingUserRepository(UserRepository):
+    """UserRepository wrapper that batches concurrent point lookups.
+
+    Batches run one at a time, so a wrapped repository bound to a single
+    ``AsyncSession`` is never used concurrently.
+    """
+
+    def __init__(
+        self,
+        repository: UserRepository,
+        max_batch_size: int = 500,
+        window: float = 0.0,
+        stats: Optional[BatchStats] = None,
+    ) -> None:
+        self._repository = repository
+        self._lock = asyncio.Lock()
+        stats = stats or BatchStats()
+        # Emails as loaded, since callers may mutate the cached users before updating them
+        self._emails_by_id: Dict[str, str] = {}
+        self._by_id: BatchLoader[str, User] = BatchLoader(
+            self._load_by_ids, max_batch_size=max_batch_size, window=window, stats=stats
+        )
+        self._by_email: BatchLoader[str, User] = BatchLoader(
+            self._load_by_emails, max_batch_size=max_batch_size, window=window, stats=stats
+        )
+
+    @property
+    def stats(self) -> BatchStats:
+        return self._by_id.stats
+
+    async def create(self, user: User) -> User:
+        async with self._lock:
+            created = await self._repository.create(user)
+        self._prime(created)
+        return created
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            canonical_id = str(UUID(user_id))
+        except ValueError:
+            return None
+        return await self._by_id.load(canonical_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._by_email.load(email)
+
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        users = await asyncio.gather(*(self.get_by_id(user_id) for user_id in user_ids))
+        return {str(user.id): user for user in users if user}
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        users = await asyncio.gather(*(self.get_by_email(email) for email in emails))
+        return {email: user for email, user in zip(emails, users) if user}
+
+    async def update(self, user: User) -> User:
+        async with self._lock:
+            updated = await self._repository.update(user)
+        self._forget(str(user.id))
+        self._prime(updated)
+        return updated
+
+    async def delete(self, user_id: str) -> bool:
+        async with self._lock:
+            deleted = await self._repository.delete(user_id)
+        try:
+            canonical_id = str(UUID(user_id))
+        except ValueError:
+            return deleted
+        self._forget(canonical_id)
+        return deleted
+
+    def _prime(self, user: User) -> None:
+        user_id = str(user.id)
+        self._forget(user_id)
+        self._by_email.clear(user.email)
+        self._by_id.prime(user_id, user)
+        self._by_email.prime(user.email, user)
+        self._emails_by_id[user_id] = user.email
+
+    def _forget(self, user_id: str) -> None:
+        self._by_id.clear(user_id)
+        email = self._emails_by_id.pop(user_id, None)
+        if email:
+            self._by_email.clear(email)
+
+    async def _load_by_ids(self, user_ids: List[str]) -> Dict[str, User]:
+        async with self._lock:
+            users = await self._repository.get_many_by_ids(user_ids)
+        self._emails_by_id.update((user_id, user.email) for user_id, user in users.items())
+        return users
+
+    async def _load_by_emails(self, emails: List[str]) -> Dict[str, User]:
+        async with self._lock:
+            users = await self._repository.get_many_by_emails(emails)
+        self._emails_by_id.update((str(user.id), email) for email, user in users.items())
+        return users
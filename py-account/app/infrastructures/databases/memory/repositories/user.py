@@ -0,0 +1,112 @@
+"""In-memory user repository.
+
+Stores users in process memory with hash indexes on id and email. It follows
+the domain rules of the repository layer: emails are unique (soft-deleted users
+keep their email reserved, like the unique constraint on ``users.email``),
+updates are verified against the stored version, and deletes are soft.
+
+Users are copied on the way in and out, so callers never share state with the
+store. Mutations run under an ``asyncio.Lock`` and never yield to the event loop
+between reading and writing the indexes, so concurrent coroutines observe each
+operation atomically.
+"""
+import asyncio
+from copy import copy
+from typing import Dict, Iterable, Optional, Sequence
+from uuid import UUID
+
+from app.exceptions.repository import DuplicateEmailError
+from app.repository.interfaces.user import UserRepository
+from app.repository.models.user import User
+
+
+class InMemoryUserRepository(UserRepository):
+    def __init__(self, users: Optional[Iterable[User]] = None):
+        self._users: Dict[UUID, User] = {}
+        self._ids_by_email: Dict[str, UUID] = {}
+        self._lock = asyncio.Lock()
+        for user in users or ():
+            self._insert(user)
+
+    async def create(self, user: User) -> User:
+        async with self._lock:
+            self._insert(user)
+        return copy(user)
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            uuid_id = UUID(user_id)
+        except ValueError:
+            return None
+        return self._get_active(uuid_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        user_id = self._ids_by_email.get(email)
+        return self._get_active(user_id) if user_id else None
+
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        users: Dict[str, User] = {}
+        for user_id in user_ids:
+            user = await self.get_by_id(user_id)
+            if user:
+                users[str(user.id)] = user
+        return users
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        users: Dict[str, User] = {}
+        for email in emails:
+            user = await self.get_by_email(email)
+            if user:
+                users[email] = user
+        return users
+
+    async def update(self, user: User) -> User:
+        if not user.id:
+            raise ValueError("User ID is required for update")
+
+        async with self._lock:
+            stored = self._users.get(user.id)
+            if not stored or stored.is_deleted:
+                raise ValueError(f"User with id {user.id} not found")
+
+            # Verify version to detect concurrent modifications
+            user.verify_version(stored.version)
+
+            if user.email != stored.email:
+                if user.email in self._ids_by_email:
+                    raise DuplicateEmailError(details={"email": user.email})
+                del self._ids_by_email[stored.email]
+                self._ids_by_email[user.email] = user.id
+
+            # Update version before saving
+            user.update_version()
+            self._users[user.id] = copy(user)
+        return copy(user)
+
+    async def delete(self, user_id: str) -> bool:
+        try:
+            uuid_id = UUID(user_id)
+        except ValueError:
+            return False
+
+        async with self._lock:
+            stored = self._users.get(uuid_id)
+            if not stored or stored.is_deleted:
+                return False
+            stored.soft_delete()
+            stored.update_version()
+            return True
+
+    def _insert(self, user: User) -> None:
+        if user.email in self._ids_by_email:
+            raise DuplicateEmailError(details={"email": user.email})
+        if user.id in self._users:
+            raise ValueError(f"User with id {user.id} already exists")
+        self._users[user.id] = copy(user)
+        self._ids_by_email[user.email] = user.id
+
+    def _get_active(self, user_id: UUID) -> Optional[User]:
+        stored = self._users.get(user_id)
+        if not stored or stored.is_deleted:
+            return None
+        return copy(stored)
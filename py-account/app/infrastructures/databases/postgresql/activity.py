@@ -0,0 +1,337 @@
+"""Write-coalesced user activity timestamps.
+
+``users.last_login_at`` and ``users.last_seen_at`` change on nearly every
+request. Writing them through ``PostgresUserRepository.update`` would turn
+each login into a versioned write: a row lock, a new ``version`` and a spurious
+``OptimisticLockException`` for anyone concurrently editing the user.
+
+An ``ActivityTracker`` records timestamps in a dictionary instead, keeping
+only the latest per user, and a background task flushes it every
+``flush_interval`` seconds with one statement per batch:
+
+    UPDATE users SET last_login_at = GREATEST(users.last_login_at, v.last_login_at), ...
+    FROM unnest(:ids, :logins, :seen) AS v(id, last_login_at, last_seen_at)
+    WHERE users.id = v.id
+
+The statement leaves ``version`` and ``updated_at`` alone. ``GREATEST``
+ignores NULLs and never moves a timestamp backwards, so workers may flush
+overlapping users in any order. The order in which the UPDATE visits the rows
+of a join is up to the planner, so each batch first locks its rows with
+``SELECT ... ORDER BY id FOR UPDATE`` in the same transaction. Concurrent
+flushes therefore lock shared users in the same order and do not deadlock
+each other.
+
+Timestamps are stale by at most ``flush_interval`` while flushes succeed. A
+failed flush puts its entries back into the map for the next one, so
+staleness grows during an outage instead of data being lost;
+``staleness_seconds`` exposes it. Entries still pending when the process dies
+are lost, which is acceptable for activity data. When ``max_pending`` users are
+waiting, activity of further users is dropped and counted.
+
+Usage:
+    tracker = ActivityTracker(database)
+    async with tracker:
+        tracker.record_login(user.id)
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PgUUID
+
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+_table = UserModel.__table__
+
+# Arrays bind as single typed parameters, so every batch size shares one prepared
+# statement
+_LOCK_USERS = text(
+    f"SELECT id FROM {_table.name} WHERE id = ANY(:ids) ORDER BY id FOR UPDATE"
+).bindparams(bindparam("ids", type_=ARRAY(PgUUID(as_uuid=True))))
+_UPDATE_ACTIVITY = text(
+    f"UPDATE {_table.name} AS u SET "
+    "last_login_at = GREATEST(u.last_login_at, v.last_login_at), "
+    "last_seen_at = GREATEST(u.last_seen_at, v.last_seen_at) "
+    "FROM unnest(:ids, :logins, :seen) AS v(id, last_login_at, last_seen_at) "
+    "WHERE u.id = v.id"
+).bindparams(
+    bindparam("ids", type_=ARRAY(PgUUID(as_uuid=True))),
+    bindparam("logins", type_=ARRAY(DateTime(timezone=True))),
+    bindparam("seen", type_=ARRAY(DateTime(timezone=True))),
+)
+
+
+class ActivitySettings(BaseSettings):
+    """User activity tracking settings."""
+
+    model_config = SettingsConfigDict(env_prefix="USER_ACTIVITY_")
+
+    enabled: bool = True
+    # Seconds between flushes; the bound on staleness while flushes succeed
+    flush_interval: float = 5.0
+    max_pending: int = 100_000
+    batch_size: int = 5_000
+
+
+@lru_cache
+def get_activity_settings() -> ActivitySettings:
+    """Get user activity settings singleton."""
+    return ActivitySettings()
+
+
+class ActivityStats:
+    """Activity tracking metrics."""
+
+    __slots__ = (
+        "recorded", "coalesced", "dropped", "written", "flushes", "failed_flushes",
+        "max_pending",
+    )
+
+    def __init__(self) -> None:
+        self.recorded = 0        # Login and seen events recorded
+        self.coalesced = 0       # Events merged into a user already pending
+        self.dropped = 0         # Events of new users rejected at max_pending
+        self.written = 0         # User rows sent to the database
+        self.flushes = 0
+        self.failed_flushes = 0  # Flushes that raised; their entries are kept
+        self.max_pending = 0
+
+
+class _Activity:
+    """Latest pending timestamps of one user."""
+
+    __slots__ = ("last_login_at", "last_seen_at")
+
+    def __init__(self) -> None:
+        self.last_login_at: Optional[datetime] = None
+        self.last_seen_at: Optional[datetime] = None
+
+    def merge(self, other: "_Activity") -> None:
+        self.last_login_at = _latest(self.last_login_at, other.last_login_at)
+        self.last_seen_at = _latest(self.last_seen_at, other.last_seen_at)
+
+
+def _latest(current: Optional[datetime], candidate: Optional[datetime]) -> Optional[datetime]:
+    if current is None or (candidate is not None and candidate > current):
+        return candidate
+    return current
+
+
+class ActivityTracker:
+    """Coalesce user activity timestamps in memory and flush them in batches.
+
+    Recording is synchronous and never waits on the database.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Database],
+        flush_interval: float = 5.0,
+        max_pending: int = 100_000,
+        batch_size: int = 5_000,
+        clock: Callable[[], float] = time.monotonic,
+        stats: Optional[ActivityStats] = None,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            database: Database the flusher writes to
+            flush_interval: Seconds between flushes
+            max_pending: Users buffered before activity of further users is dropped
+            batch_size: Maximum users updated per statement
+            clock: Monotonic time source of the staleness measurement
+            stats: Metrics sink
+
+        Raises:
+            ValueError: If sizes are invalid
+        """
+        if batch_size < 1 or max_pending < 1:
+            raise ValueError("batch_size and max_pending must be at least 1")
+        self._database = database
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._clock = clock
+        self._stats = stats or ActivityStats()
+        self._pending: Dict[UUID, _Activity] = {}
+        # When the oldest pending entry was recorded; None while nothing is pending
+        self._pending_since: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(
+        cls, database: Database, settings: Optional[ActivitySettings] = None
+    ) -> Optional["ActivityTracker"]:
+        """Build a tracker from settings.
+
+        Returns:
+            Optional[ActivityTracker]: None when activity tracking is disabled
+        """
+        settings = settings or get_activity_settings()
+        if not settings.enabled:
+            return None
+        return cls(
+            database,
+            flush_interval=settings.flush_interval,
+            max_pending=settings.max_pending,
+            batch_size=settings.batch_size,
+        )
+
+    @property
+    def stats(self) -> ActivityStats:
+        return self._stats
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def staleness_seconds(self) -> float:
+        """Age of the oldest activity not yet written; 0 when nothing is pending."""
+        if self._pending_since is None:
+            return 0.0
+        return self._clock() - self._pending_since
+
+    def record_login(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        """Record a successful login, which also counts as being seen."""
+        activity = self._entry(user_id)
+        if activity is not None:
+            at = at or datetime.now(timezone.utc)
+            activity.last_login_at = _latest(activity.last_login_at, at)
+            activity.last_seen_at = _latest(activity.last_seen_at, at)
+
+    def record_seen(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        """Record an authenticated request."""
+        activity = self._entry(user_id)
+        if activity is not None:
+            activity.last_seen_at = _latest(
+                activity.last_seen_at, at or datetime.now(timezone.utc)
+            )
+
+    def register_metrics(self, registry: MetricsRegistry) -> None:
+        """Expose the stats, pending count and staleness as gauges."""
+        registry.register_stats("user_activity", self._stats)
+        registry.gauge(
+            "user_activity_pending", "Users with activity not yet written", lambda: self.pending
+        )
+        registry.gauge(
+            "user_activity_staleness_seconds",
+            "Age of the oldest activity not yet written",
+            lambda: self.staleness_seconds,
+        )
+
+    async def flush(self) -> None:
+        """Write all pending activity now.
+
+        Entries of a failed flush are put back for the next one.
+
+        Raises:
+            Exception: Whatever the database raised
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, pending_since = self._pending, self._pending_since
+            self._pending, self._pending_since = {}, None
+            try:
+                rows = sorted(
+                    (user_id, activity.last_login_at, activity.last_seen_at)
+                    for user_id, activity in batch.items()
+                )
+                for start in range(0, len(rows), self._batch_size):
+                    await self._write(rows[start:start + self._batch_size])
+            except BaseException:
+                self._stats.failed_flushes += 1
+                self._restore(batch, pending_since)
+                raise
+            self._stats.flushes += 1
+            self._stats.written += len(batch)
+
+    async def start(self) -> None:
+        """Start the periodic flusher."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flusher and write what is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final activity flush failed, %d users not written", self.pending)
+
+    async def __aenter__(self) -> "ActivityTracker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    def _entry(self, user_id: UUID) -> Optional[_Activity]:
+        self._stats.recorded += 1
+        activity = self._pending.get(user_id)
+        if activity is not None:
+            self._stats.coalesced += 1
+            return activity
+        if len(self._pending) >= self._max_pending:
+            self._stats.dropped += 1
+            return None
+        if self._pending_since is None:
+            self._pending_since = self._clock()
+        activity = self._pending[user_id] = _Activity()
+        if len(self._pending) > self._stats.max_pending:
+            self._stats.max_pending = len(self._pending)
+        return activity
+
+    def _restore(self, batch: Dict[UUID, _Activity], pending_since: Optional[float]) -> None:
+        # Activity recorded during the failed flush is newer; merge it into the batch
+        for user_id, activity in self._pending.items():
+            previous = batch.get(user_id)
+            if previous is None:
+                batch[user_id] = activity
+            else:
+                previous.merge(activity)
+        self._pending = batch
+        if pending_since is not None:
+            self._pending_since = pending_since
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.warning(
+                    "Activity flush failed, retrying in %.1fs", self._flush_interval,
+                    exc_info=True,
+                )
+
+    async def _write(
+        self, rows: List[Tuple[UUID, Optional[datetime], Optional[datetime]]]
+    ) -> None:
+        if self._database is None:
+            raise RuntimeError("Activity tracker has no database")
+        ids, logins, seen = zip(*rows)
+        async with self._database.get_session() as session:
+            await session.execute(_LOCK_USERS, {"ids": list(ids)})
+            await session.execute(
+                _UPDATE_ACTIVITY, {"ids": list(ids), "logins": list(logins), "seen": list(seen)}
+            )
+            await session.commit()
@@ -0,0 +1,375 @@
+"""Audit trail of entity changes.
+
+Repositories capture every write as an ``AuditEvent`` holding the changed
+fields with their values before and after. An ``AuditWriter`` persists the
+events into ``audit_log`` in one of two durability modes:
+
+- ``AuditMode.IN_TRANSACTION`` adds the audit row to the writing session, so it
+  commits (or rolls back) atomically with the change. Costs one extra row in
+  every write transaction.
+- ``AuditMode.ASYNC`` queues the event after the change has committed. A
+  background task flushes the queue in batches, with ``COPY`` or one multi-row
+  ``INSERT``. Writes stay as fast as without auditing, but events still queued
+  when the process dies are lost.
+
+The async queue is bounded. When it is full, ``publish`` waits for room up to
+``block_timeout`` seconds and then drops the event. ``AuditStats`` reports
+queue depth, blocked and dropped publishes so that a flusher that cannot keep
+up is visible before events are lost.
+
+Usage:
+    writer = AuditWriter(database, mode=AuditMode.ASYNC)
+    await writer.start()
+    async with database.get_session() as session:
+        repository = PostgresUserRepository(session, audit=writer)
+        await repository.update(user)
+    await writer.stop()
+"""
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.helpers.identifiers import uuid7
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.models.audit import AuditLogModel
+from app.repository.models.base import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_table = AuditLogModel.__table__
+_columns = [column.name for column in _table.columns]
+
+# Fields whose values must never be copied into the audit log; a change is
+# still recorded, with both values replaced by this marker
+REDACTED = "<redacted>"
+REDACTED_FIELDS: FrozenSet[str] = frozenset({"hashed_password"})
+
+# Bookkeeping fields that change on every write, recorded on the event itself,
+# and activity timestamps, which are not changed through versioned writes
+_IGNORED_FIELDS: FrozenSet[str] = frozenset(
+    {"version", "updated_at", "last_login_at", "last_seen_at"}
+)
+
+
+class AuditAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class AuditMode(str, Enum):
+    IN_TRANSACTION = "in_transaction"
+    ASYNC = "async"
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def diff_entities(
+    before: Optional[BaseModel], after: Optional[BaseModel]
+) -> Dict[str, List[Any]]:
+    """Compute the changed fields between two states of a domain entity.
+
+    Args:
+        before: State before the change, None for a creation
+        after: State after the change, None for a deletion
+
+    Returns:
+        dict: ``{field: [old, new]}`` with JSON-compatible values
+    """
+    old = vars(before) if before is not None else {}
+    new = vars(after) if after is not None else {}
+    changes: Dict[str, List[Any]] = {}
+    for name in sorted(old.keys() | new.keys()):
+        if name.startswith("_") or name in _IGNORED_FIELDS:
+            continue
+        old_value, new_value = old.get(name), new.get(name)
+        if old_value == new_value:
+            continue
+        if name in REDACTED_FIELDS:
+            changes[name] = [
+                REDACTED if old_value is not None else None,
+                REDACTED if new_value is not None else None,
+            ]
+        else:
+            changes[name] = [_to_json(old_value), _to_json(new_value)]
+    return changes
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    """One captured entity change."""
+    entity_type: str
+    entity_id: UUID
+    action: AuditAction
+    changes: Dict[str, List[Any]]
+    version: Optional[UUID] = None
+    id: UUID = field(default_factory=uuid7)
+    occurred_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def capture(
+        cls, action: AuditAction, before: Optional[BaseModel], after: Optional[BaseModel]
+    ) -> "AuditEvent":
+        """Capture a change from the entity states around it.
+
+        Raises:
+            ValueError: If both states are None
+        """
+        entity = after if after is not None else before
+        if entity is None:
+            raise ValueError("Either the state before or after the change is required")
+        return cls(
+            entity_type=type(entity).__name__.lower(),
+            entity_id=entity.id,
+            action=action,
+            changes=diff_entities(before, after),
+            version=after.version if after is not None else None,
+        )
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "action": self.action.value,
+            "version": self.version,
+            "changes": self.changes,
+            "occurred_at": self.occurred_at,
+        }
+
+
+class AuditStats:
+    """Audit pipeline and backpressure metrics."""
+
+    __slots__ = (
+        "staged", "enqueued", "written", "flushes", "failed_flushes", "dropped", "lost",
+        "blocked_publishes", "blocked_seconds", "max_queue_depth",
+    )
+
+    def __init__(self) -> None:
+        self.staged = 0             # Rows added to write transactions
+        self.enqueued = 0           # Events accepted by the async queue
+        self.written = 0            # Events flushed by the async writer
+        self.flushes = 0
+        self.failed_flushes = 0     # Flush attempts that raised, including retried ones
+        self.dropped = 0            # Events rejected because the queue stayed full
+        self.lost = 0               # Events discarded after exhausting flush retries
+        self.blocked_publishes = 0  # Publishes that found the queue full
+        self.blocked_seconds = 0.0  # Total time publishers waited for room
+        self.max_queue_depth = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.written / self.flushes if self.flushes else 0.0
+
+
+class AuditWriter:
+    """Persist audit events in the configured durability mode.
+
+    Repositories call ``stage`` before committing a change and ``publish``
+    after the commit succeeded; each is a no-op in the other mode.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Database] = None,
+        mode: AuditMode = AuditMode.ASYNC,
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.1,
+        block_timeout: Optional[float] = 1.0,
+        use_copy: bool = True,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        stats: Optional[AuditStats] = None,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            database: Database the async flusher writes to; unused in-transaction
+            mode: Durability mode
+            max_queue_size: Events buffered before publishers are throttled
+            batch_size: Maximum events written per flush
+            flush_interval: Seconds to wait for a batch to fill up
+            block_timeout: Seconds a publisher waits for room before the event is
+                dropped; None waits indefinitely, 0 drops immediately
+            use_copy: Flush with ``COPY`` instead of a multi-row ``INSERT``
+            max_retries: Retries of a failed flush before its events are discarded
+            retry_delay: Delay before the first retry, doubled on every further one
+            stats: Metrics sink
+
+        Raises:
+            ValueError: If async mode is requested without a database, or sizes are invalid
+        """
+        if mode is AuditMode.ASYNC and database is None:
+            raise ValueError("Async audit mode requires a database")
+        if batch_size < 1 or max_queue_size < batch_size:
+            raise ValueError("batch_size must be at least 1 and at most max_queue_size")
+        self._database = database
+        self._mode = mode
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._block_timeout = block_timeout
+        self._use_copy = use_copy
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._stats = stats or AuditStats()
+        self._queue: "asyncio.Queue[AuditEvent]" = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def mode(self) -> AuditMode:
+        return self._mode
+
+    @property
+    def stats(self) -> AuditStats:
+        return self._stats
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stage(self, session: AsyncSession, event: AuditEvent) -> None:
+        """Add the audit row to the session's pending transaction (in-transaction mode)."""
+        if self._mode is not AuditMode.IN_TRANSACTION:
+            return
+        session.add(AuditLogModel(**event.to_row()))
+        self._stats.staged += 1
+
+    async def publish(self, event: AuditEvent) -> None:
+        """Queue a committed change for the background flusher (async mode).
+
+        Waits while the queue is full, up to ``block_timeout``; the event is
+        dropped and counted in ``stats.dropped`` after that.
+        """
+        if self._mode is not AuditMode.ASYNC:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if not await self._put_blocking(event):
+                return
+        self._stats.enqueued += 1
+        depth = self._queue.qsize()
+        if depth > self._stats.max_queue_depth:
+            self._stats.max_queue_depth = depth
+
+    async def start(self) -> None:
+        """Start the background flusher (async mode)."""
+        if self._mode is AuditMode.ASYNC and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush every queued event and stop the background flusher."""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def __aenter__(self) -> "AuditWriter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def _put_blocking(self, event: AuditEvent) -> bool:
+        self._stats.blocked_publishes += 1
+        started = time.perf_counter()
+        try:
+            if self._block_timeout == 0:
+                raise asyncio.TimeoutError
+            await asyncio.wait_for(self._queue.put(event), self._block_timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._stats.dropped += 1
+            logger.warning(
+                "Audit queue full, dropped %s event for %s %s",
+                event.action.value, event.entity_type, event.entity_id,
+            )
+            return False
+        finally:
+            self._stats.blocked_seconds += time.perf_counter() - started
+
+    def _drain_into(self, batch: List[AuditEvent]) -> None:
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            self._drain_into(batch)
+            if len(batch) < self._batch_size and self._flush_interval > 0:
+                await asyncio.sleep(self._flush_interval)
+                self._drain_into(batch)
+            try:
+                await self._flush_with_retries(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush_with_retries(self, batch: List[AuditEvent]) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._flush(batch)
+            except Exception:
+                self._stats.failed_flushes += 1
+                if attempt == self._max_retries:
+                    self._stats.lost += len(batch)
+                    logger.exception("Discarding %d audit events after failed flushes", len(batch))
+                    return
+                logger.warning("Audit flush failed, retrying", exc_info=True)
+                await asyncio.sleep(self._retry_delay * 2 ** attempt)
+            else:
+                self._stats.flushes += 1
+                self._stats.written += len(batch)
+                return
+
+    async def _flush(self, batch: List[AuditEvent]) -> None:
+        database = self._database
+        if database is None:
+            raise RuntimeError("Async audit mode requires a database")
+        async with database.get_session() as session:
+            if self._use_copy:
+                connection = await (await session.connection()).get_raw_connection()
+                await connection.driver_connection.copy_records_to_table(
+                    _table.name, records=_to_records(batch), columns=_columns
+                )
+            else:
+                await session.execute(insert(_table), [event.to_row() for event in batch])
+            await session.commit()
+
+
+def _to_records(batch: List[AuditEvent]) -> List[Tuple[Any, ...]]:
+    # asyncpg's binary COPY encodes jsonb from text
+    records = []
+    for event in batch:
+        row = event.to_row()
+        row["changes"] = json.dumps(row["changes"])
+        records.append(tuple(row[name] for name in _columns))
+    return records
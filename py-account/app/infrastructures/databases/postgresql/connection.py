@@ -1,33 +1,163 @@
-from typing import AsyncGenerator, Any
+from functools import lru_cache
+from typing import AsyncGenerator, Any, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import MetaData
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
+
+from app.exceptions.base import AppException
+from app.exceptions.infrastructure import DatabaseConnectionError
+from app.infrastructures.databases.postgresql.instrumentation import QueryInstrumentation
+from app.infrastructures.databases.postgresql.resilience import (
+    GUARD_KEY,
+    DatabaseGuard,
+    is_transient_error,
+)
 
 class Base(DeclarativeBase):
     pass
 
+class DatabaseSettings(BaseSettings):
+    """PostgreSQL connection settings."""
+
+    model_config = SettingsConfigDict(env_prefix="DATABASE_")
+
+    url: str = "postgresql+asyncpg://localhost:5432/account"
+    # Connections all worker processes of one host may hold together; keep it
+    # below the server's max_connections minus what other clients need
+    max_connections: int = 40
+    pool_timeout: float = 5.0
+    pool_recycle: int = 1800
+
+
+@lru_cache
+def get_database_settings() -> DatabaseSettings:
+    """Get database settings singleton."""
+    return DatabaseSettings()
+
+
+def pool_size_per_worker(max_connections: int, workers: int) -> int:
+    """Split a host's connection budget evenly over its worker processes.
+
+    Args:
+        max_connections: Connections all workers may hold together
+        workers: Number of worker processes
+
+    Returns:
+        int: Pool size of one worker, at least 1
+    """
+    return max(1, max_connections // max(1, workers))
+
 class Database:
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        instrumentation: Optional[QueryInstrumentation] = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        guard: Optional[DatabaseGuard] = None,
+    ):
         self._engine = create_async_engine(
             url,
             echo=False,  # Set to True for SQL logging
-            future=True
+            future=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
         )
+        self._instrumentation = instrumentation
+        self._guard = guard
+        self._session_info = {GUARD_KEY: guard} if guard else {}
+        if instrumentation:
+            instrumentation.attach(self._engine)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[DatabaseSettings] = None, workers: int = 1
+    ) -> "Database":
+        """Build a worker's database from settings.
 
-    async def create_database(self) -> None:
+        The pool is fixed-size with no overflow, so that ``workers`` processes
+        together never open more than ``settings.max_connections``. Create it
+        inside the worker process, after forking: pooled connections must not
+        be shared between processes.
+
+        Args:
+            settings: Connection settings; read from the environment when omitted
+            workers: Number of worker processes sharing the connection budget
+        """
+        settings = settings or get_database_settings()
+        return cls(
+            settings.url,
+            instrumentation=QueryInstrumentation.from_settings(),
+            pool_size=pool_size_per_worker(settings.max_connections, workers),
+            max_overflow=0,
+            pool_timeout=settings.pool_timeout,
+            pool_recycle=settings.pool_recycle,
+            guard=DatabaseGuard.from_settings(),
+        )
+
+    @property
+    def guard(self) -> Optional[DatabaseGuard]:
+        """Circuit breaker and retry policy of the database, if any."""
+        return self._guard
+
+    @property
+    def instrumentation(self) -> Optional[QueryInstrumentation]:
+        """SQL statement instrumentation attached to the engine, if any."""
+        return self._instrumentation
+
+    async def create_database(self, metadata: Optional[MetaData] = None) -> None:
+        """Create missing tables, by default those of the ORM models on ``Base``."""
         async with self._engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)  # type: ignore
+            await conn.run_sync((metadata or Base.metadata).create_all)  # type: ignore
+
+    async def dispose(self) -> None:
+        """Close all pooled connections."""
+        if self._instrumentation:
+            await self._instrumentation.close()
+        await self._engine.dispose()
 
     @asynccontextmanager
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """Get a database session.
         
+        Each session is one unit of work for the attached instrumentation.
+        With a guard, no session is opened while the circuit is open, and
+        transient errors escaping the session count as breaker failures.
+        
+        Raises:
+            DatabaseConnectionError: If the circuit is open, or the database
+                became unreachable while the session was in use
+        
         Usage:
             async with database.get_session() as session:
                 # use session here
         """
-        session = AsyncSession(self._engine, expire_on_commit=False)
-        try:
-            yield session
-        finally:
-            await session.close()
+        unit_of_work = (
+            self._instrumentation.unit_of_work() if self._instrumentation else nullcontext()
+        )
+        if self._guard is not None:
+            self._guard.breaker.check()
+        with unit_of_work:
+            session = AsyncSession(
+                self._engine, expire_on_commit=False, info=dict(self._session_info)
+            )
+            try:
+                yield session
+            except Exception as error:
+                if (
+                    self._guard is None
+                    or isinstance(error, AppException)
+                    or not is_transient_error(error)
+                ):
+                    raise
+                # Raised outside of guarded repository calls, e.g. by a commit
+                self._guard.breaker.record_failure()
+                raise DatabaseConnectionError() from error
+            finally:
+                await session.close()
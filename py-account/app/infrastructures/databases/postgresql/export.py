@@ -0,0 +1,393 @@
+"""Streaming columnar export of tables for analytics.
+
+Rows are read through a server-side cursor in chunks of ``chunk_size`` and
+each chunk is written as one Parquet row group (or Arrow IPC record batch)
+before the next one is fetched. Client memory therefore depends on the chunk
+size, not on the table size. Files are compressed (zstd by default), written
+under a temporary name and renamed into place once complete.
+
+Incremental exports select rows whose change timestamp, the first non-null
+of the table's watermark columns (``updated_at``, then ``created_at`` for
+users), lies after the previous export's cutoff. The cutoff trails the clock
+by ``lag`` seconds so that rows stamped just before it, but committed after
+the export read them, are picked up by the next run instead of being missed.
+It is stored per table in a JSON state file after the file is in place; a run
+that fails leaves the state as it was, and the next run repeats the range.
+
+Secrets are never exported: ``users.hashed_password`` is excluded. Activity
+timestamps (``last_login_at``, ``last_seen_at``) do not bump ``updated_at``,
+so only full exports carry their latest values.
+
+pyarrow is an optional dependency of this tool (the ``export`` extra). Point ``--url`` at a replica
+rather than the primary.
+
+Usage:
+    # Nightly: rows changed since the previous run, one Parquet file per table
+    python -m app.infrastructures.databases.postgresql.export \\
+        --url postgresql+asyncpg://replica:5432/account \\
+        --output /var/exports --state /var/exports/state.json
+
+    # Everything, as Arrow IPC
+    python -m app.infrastructures.databases.postgresql.export --full --format arrow \\
+        --output /var/exports --state /var/exports/state.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric, String, Table, func, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PgUUID
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.infrastructures.databases.postgresql.connection import Database, get_database_settings
+from app.infrastructures.databases.postgresql.models.user import UserModel
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_LAG_SECONDS = 300.0
+
+_PYARROW_MISSING = "Columnar export requires pyarrow: pip install 'py-account[export]'"
+
+
+class ExportFormat(str, Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """A table that can be exported, and how."""
+    name: str
+    table: Table
+    # Columns never exported, e.g. secrets
+    exclude: FrozenSet[str] = frozenset()
+    # Change timestamp columns, most specific first; empty for full exports only
+    watermark: Tuple[str, ...] = ()
+
+    @property
+    def columns(self) -> List[Column]:
+        return [column for column in self.table.columns if column.name not in self.exclude]
+
+    def changed_at(self) -> ColumnElement:
+        """Expression of a row's change timestamp.
+
+        Raises:
+            ValueError: If the table has no watermark columns
+        """
+        if not self.watermark:
+            raise ValueError(f"Table {self.name} has no watermark columns")
+        columns = [self.table.c[name] for name in self.watermark]
+        return columns[0] if len(columns) == 1 else func.coalesce(*columns)
+
+
+# Exportable tables by name; further tables (e.g. a ledger) register here
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    "users": ExportTable(
+        name="users",
+        table=UserModel.__table__,
+        exclude=frozenset({"hashed_password"}),
+        watermark=("updated_at", "created_at"),
+    ),
+}
+
+
+@dataclass
+class ExportResult:
+    """Outcome of exporting one table."""
+    table: str
+    path: Optional[str]
+    rows: int
+    chunks: int
+    since: Optional[datetime]
+    until: datetime
+
+
+class WatermarkState:
+    """Per-table export cutoffs, persisted as JSON."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._cutoffs: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._cutoffs = json.load(file)
+
+    def get(self, table: str) -> Optional[datetime]:
+        value = self._cutoffs.get(table)
+        return datetime.fromisoformat(value) if value else None
+
+    def set(self, table: str, cutoff: datetime) -> None:
+        """Record a table's cutoff and write the state file atomically."""
+        self._cutoffs[table] = cutoff.isoformat()
+        temporary = f"{self._path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self._cutoffs, file, indent=2, sort_keys=True)
+        os.replace(temporary, self._path)
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise RuntimeError(_PYARROW_MISSING)
+
+
+def _arrow_type(column: Column) -> Any:
+    column_type = column.type
+    if isinstance(column_type, PgUUID):
+        return pyarrow.string()
+    if isinstance(column_type, Boolean):
+        return pyarrow.bool_()
+    if isinstance(column_type, DateTime):
+        return pyarrow.timestamp("us", tz="UTC" if column_type.timezone else None)
+    if isinstance(column_type, Integer):
+        return pyarrow.int64()
+    if isinstance(column_type, Numeric) and column_type.precision is not None:
+        return pyarrow.decimal128(column_type.precision, column_type.scale or 0)
+    if isinstance(column_type, (String, JSONB, Numeric)):
+        return pyarrow.string()
+    raise ValueError(f"No Arrow type for column {column.name} of type {column_type}")
+
+
+def _converter(column: Column) -> Optional[Callable[[Any], Any]]:
+    column_type = column.type
+    if isinstance(column_type, PgUUID):
+        return str
+    if isinstance(column_type, JSONB):
+        return json.dumps
+    if isinstance(column_type, Numeric) and column_type.precision is None:
+        return str
+    return None
+
+
+def arrow_schema(definition: ExportTable) -> Any:
+    """Arrow schema of a table's exported columns.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+        ValueError: If a column type has no Arrow equivalent
+    """
+    _require_pyarrow()
+    return pyarrow.schema([
+        pyarrow.field(column.name, _arrow_type(column), nullable=column.nullable)
+        for column in definition.columns
+    ])
+
+
+def build_query(
+    definition: ExportTable, since: Optional[datetime], until: Optional[datetime]
+) -> Select:
+    """Select the exported columns of rows changed in ``(since, until]``.
+
+    Without bounds, every row is selected.
+    """
+    stmt = select(*definition.columns)
+    if since is not None or until is not None:
+        changed_at = definition.changed_at()
+        if since is not None:
+            stmt = stmt.where(changed_at > since)
+        if until is not None:
+            stmt = stmt.where(changed_at <= until)
+    return stmt
+
+
+class _ChunkWriter:
+    """Writes chunks of rows to a Parquet or Arrow IPC file."""
+
+    def __init__(
+        self, path: str, definition: ExportTable, export_format: ExportFormat, compression: str
+    ) -> None:
+        self._schema = arrow_schema(definition)
+        self._converters = [_converter(column) for column in definition.columns]
+        self._sink = None
+        if export_format is ExportFormat.PARQUET:
+            self._writer = pyarrow.parquet.ParquetWriter(
+                path, self._schema, compression=compression
+            )
+        else:
+            self._sink = pyarrow.OSFile(path, "wb")
+            self._writer = pyarrow.ipc.new_file(
+                self._sink,
+                self._schema,
+                options=pyarrow.ipc.IpcWriteOptions(compression=compression),
+            )
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> None:
+        arrays = []
+        for index, (converter, arrow_field) in enumerate(zip(self._converters, self._schema)):
+            values = [row[index] for row in rows]
+            if converter is not None:
+                values = [None if value is None else converter(value) for value in values]
+            arrays.append(pyarrow.array(values, type=arrow_field.type))
+        self._writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+async def export_table(
+    database: Database,
+    definition: ExportTable,
+    output_dir: str,
+    export_format: ExportFormat = ExportFormat.PARQUET,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compression: str = "zstd",
+) -> ExportResult:
+    """Stream a table's rows changed in ``(since, until]`` into one columnar file.
+
+    No file is left behind when no row matches.
+
+    Args:
+        database: Database to read from, preferably a replica
+        definition: Table to export
+        output_dir: Directory receiving ``<table>/<table>-<cutoff>.<format>``
+        export_format: Parquet or Arrow IPC
+        since: Exclusive lower bound of the change timestamp; None for all rows
+        until: Inclusive upper bound of the change timestamp; None for no bound
+        chunk_size: Rows fetched from the cursor and written per row group
+        compression: Codec, e.g. zstd, lz4 or snappy (Parquet only)
+
+    Returns:
+        ExportResult: Written file and row count
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    _require_pyarrow()
+    cutoff = until or datetime.now(timezone.utc)
+    directory = os.path.join(output_dir, definition.name)
+    os.makedirs(directory, exist_ok=True)
+    stamp = cutoff.strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(directory, f"{definition.name}-{stamp}.{export_format.value}")
+    temporary = f"{path}.tmp"
+
+    rows = chunks = 0
+    writer = _ChunkWriter(temporary, definition, export_format, compression)
+    try:
+        stmt = build_query(definition, since, until).execution_options(yield_per=chunk_size)
+        async with database.get_session() as session:
+            result = await session.stream(stmt)
+            async for partition in result.partitions(chunk_size):
+                writer.write(partition)
+                rows += len(partition)
+                chunks += 1
+                logger.debug("Exported %d %s rows", rows, definition.name)
+    except BaseException:
+        writer.close()
+        os.remove(temporary)
+        raise
+    writer.close()
+
+    if not rows:
+        os.remove(temporary)
+        return ExportResult(definition.name, None, 0, 0, since, cutoff)
+    os.replace(temporary, path)
+    return ExportResult(definition.name, path, rows, chunks, since, cutoff)
+
+
+async def run_export(
+    database: Database,
+    tables: Sequence[str],
+    output_dir: str,
+    state: WatermarkState,
+    export_format: ExportFormat = ExportFormat.PARQUET,
+    full: bool = False,
+    lag: float = DEFAULT_LAG_SECONDS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compression: str = "zstd",
+) -> List[ExportResult]:
+    """Export tables incrementally from their stored watermarks, or fully.
+
+    Each table's cutoff is stored once its file is complete.
+
+    Raises:
+        KeyError: If a table is not exportable
+    """
+    until = datetime.now(timezone.utc) - timedelta(seconds=lag)
+    results: List[ExportResult] = []
+    for name in tables:
+        definition = EXPORT_TABLES[name]
+        since = None if full or not definition.watermark else state.get(name)
+        result = await export_table(
+            database,
+            definition,
+            output_dir,
+            export_format=export_format,
+            since=since,
+            until=until if definition.watermark else None,
+            chunk_size=chunk_size,
+            compression=compression,
+        )
+        state.set(name, until)
+        results.append(result)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export tables as compressed columnar files")
+    parser.add_argument("--url", help="Database URL; defaults to DATABASE_URL")
+    parser.add_argument("--output", required=True, help="Directory receiving the files")
+    parser.add_argument("--state", required=True, help="JSON file keeping per-table watermarks")
+    parser.add_argument(
+        "--table", action="append", choices=sorted(EXPORT_TABLES),
+        help="Table to export (repeatable); defaults to all"
+    )
+    parser.add_argument(
+        "--format", choices=[item.value for item in ExportFormat], default="parquet"
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore watermarks, export all rows")
+    parser.add_argument(
+        "--lag", type=float, default=DEFAULT_LAG_SECONDS,
+        help="Seconds the cutoff trails the clock, covering in-flight transactions"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--compression", default="zstd")
+    args = parser.parse_args(argv)
+
+    if pyarrow is None:
+        print(_PYARROW_MISSING, file=sys.stderr)
+        return 2
+
+    async def export() -> List[ExportResult]:
+        database = Database(args.url or get_database_settings().url)
+        try:
+            return await run_export(
+                database,
+                args.table or sorted(EXPORT_TABLES),
+                args.output,
+                WatermarkState(args.state),
+                export_format=ExportFormat(args.format),
+                full=args.full,
+                lag=args.lag,
+                chunk_size=args.chunk_size,
+                compression=args.compression,
+            )
+        finally:
+            await database.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    for result in asyncio.run(export()):
+        target = result.path or "no changed rows"
+        print(f"{result.table}: {result.rows} rows in {result.chunks} chunks -> {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
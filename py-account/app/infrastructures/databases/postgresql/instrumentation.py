@@ -0,0 +1,431 @@
+"""SQL statement instrumentation for the PostgreSQL engine.
+
+Hooks into SQLAlchemy cursor events to record per-statement latency histograms,
+tagged with the repository method that issued the statement. The histograms
+live in the metrics registry, so they are exported with every other metric.
+Statements slower than a threshold are logged when they finish, and statements
+are counted per unit of work (one ``Database.get_session`` scope) to surface
+N+1 query patterns.
+
+EXPLAIN plans of slow statements are collected after the fact: the cursor hook
+only queues the statement, and a background task explains the queue on a
+separate pooled connection. At most ``max_pending_explains`` distinct
+statements wait at a time; further slow statements are logged without a plan.
+
+The hot path only takes two ``perf_counter`` readings, a context variable
+lookup and a histogram observation per statement, so it is cheap enough to leave
+enabled in production.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+)
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.infrastructures.metrics import MetricsRegistry, get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+UNTAGGED_OPERATION = "untagged"
+
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0
+)
+
+# Upper bounds of the statements-per-unit-of-work histogram buckets
+QUERY_COUNT_BUCKETS: Tuple[float, ...] = (1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+# Statement prefixes PostgreSQL can EXPLAIN without executing them
+_EXPLAINABLE_PREFIXES = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+_START_TIMES_KEY = "instrumentation_start_times"
+_EXPLAINING_KEY = "instrumentation_explaining"
+
+_REPOSITORY_CALL_SECONDS = get_metrics_registry().histogram(
+    "repository_call_seconds", "Repository method latency", labels=("operation",)
+)
+_REPOSITORY_CALL_ERRORS = get_metrics_registry().counter(
+    "repository_call_errors_total", "Repository method calls that raised", labels=("operation",)
+)
+
+_current_operation: ContextVar[str] = ContextVar("db_operation", default=UNTAGGED_OPERATION)
+# Set by the first QueryInstrumentation.attach(); stays on for the process
+_operation_tags_enabled = False
+_current_unit_of_work: ContextVar[Optional["UnitOfWorkStats"]] = ContextVar(
+    "db_unit_of_work", default=None
+)
+
+
+class InstrumentationSettings(BaseSettings):
+    """Settings for SQL statement instrumentation."""
+
+    model_config = SettingsConfigDict(env_prefix="DB_INSTRUMENTATION_")
+
+    enabled: bool = False
+    slow_query_threshold_ms: float = 200.0
+    explain_slow_queries: bool = True
+    max_pending_explains: int = 16
+    n_plus_one_threshold: int = 10
+
+
+@lru_cache
+def get_instrumentation_settings() -> InstrumentationSettings:
+    """Get SQL instrumentation settings singleton."""
+    return InstrumentationSettings()
+
+
+class UnitOfWorkStats:
+    """Statement counters for a single unit of work."""
+
+    __slots__ = ("query_count", "statement_counts")
+
+    def __init__(self) -> None:
+        self.query_count = 0
+        self.statement_counts: Dict[Tuple[str, str], int] = {}
+
+    async def explain_pending(self) -> Dict[str, Optional[str]]:
+        """EXPLAIN the queued slow statements on a separate connection and log the plans.
+
+        Returns:
+            Dict[str, Optional[str]]: Plan per statement, None where EXPLAIN failed
+        """
+        plans: Dict[str, Optional[str]] = {}
+        try:
+            # Statements queued while the connection closes get another round
+            while self._pending_explains:
+                async with self._connect() as conn:
+                    while self._pending_explains:
+                        statement = next(iter(self._pending_explains))
+                        operation, parameters = self._pending_explains.pop(statement)
+                        plan = plans[statement] = await self._explain(conn, statement, parameters)
+                        if plan:
+                            logger.warning(
+                                "EXPLAIN of slow query in %s: %s\n%s", operation, statement, plan
+                            )
+        except Exception:
+            logger.debug("Failed to EXPLAIN slow queries", exc_info=True)
+            self._pending_explains.clear()
+        return plans
+
+    async def close(self) -> None:
+        """Cancel the background EXPLAIN task, dropping statements still queued."""
+        self._pending_explains.clear()
+        if self._explain_task is not None:
+            self._explain_task.cancel()
+            try:
+                await self._explain_task
+            except asyncio.CancelledError:
+                pass
+            self._explain_task = None
+
+    def record(self, operation: str, statement: str) -> None:
+        """Count one executed statement."""
+        self.query_count += 1
+        key = (operation, statement)
+        self.statement_counts[key] = self.statement_counts.get(key, 0) + 1
+
+
+def tag_queries(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Tag every statement issued by an async method with its qualified name.
+
+    Also records the call latency and errors in the process metrics registry.
+    The operation tag is only set once a ``QueryInstrumentation`` is attached
+    to an engine, since nothing reads it before that; an untagged call costs a
+    histogram observation on top of the method itself.
+
+    Usage:
+        class PostgresUserRepository(UserRepository):
+            @tag_queries
+            async def get_by_id(self, user_id: str) -> Optional[User]:
+                ...
+    """
+    operation = func.__qualname__
+    # Label children and their bound methods are resolved once per method
+    observe = _REPOSITORY_CALL_SECONDS.labels(operation).observe
+    count_error = _REPOSITORY_CALL_ERRORS.labels(operation).inc
+    perf_counter = time.perf_counter
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _current_operation.set(operation) if _operation_tags_enabled else None
+        started = perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            count_error()
+            raise
+        finally:
+            observe(perf_counter() - started)
+            if token is not None:
+                _current_operation.reset(token)
+
+    return wrapper
+
+
+def _enable_operation_tags() -> None:
+    global _operation_tags_enabled
+    _operation_tags_enabled = True
+
+
+def current_operation() -> str:
+    """Get the operation tag of the currently executing repository call."""
+    return _current_operation.get()
+
+
+class QueryInstrumentation:
+    """Per-statement latency, slow-query and N+1 instrumentation for an engine.
+
+    Usage:
+        instrumentation = QueryInstrumentation(slow_query_threshold_ms=100)
+        database = Database(url, instrumentation=instrumentation)
+        ...
+        instrumentation.snapshot()
+        await instrumentation.close()
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold_ms: float = 200.0,
+        explain_slow_queries: bool = True,
+        n_plus_one_threshold: int = 10,
+        registry: Optional[MetricsRegistry] = None,
+        max_pending_explains: int = 16,
+    ) -> None:
+        """Initialize the instrumentation.
+
+        Args:
+            slow_query_threshold_ms: Statements at or above this latency are logged
+            explain_slow_queries: Whether to log the EXPLAIN plan of slow queries
+            n_plus_one_threshold: Repetitions of one statement within a unit of work
+                that are reported as a likely N+1 pattern
+            registry: Registry holding the histograms, the process registry by default
+            max_pending_explains: Distinct slow statements waiting for their EXPLAIN
+        """
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.explain_slow_queries = explain_slow_queries
+        self.max_pending_explains = max_pending_explains
+        self.n_plus_one_threshold = n_plus_one_threshold
+        registry = registry or get_metrics_registry()
+        self._statements = registry.histogram(
+            "db_statement_milliseconds",
+            "SQL statement latency by repository operation",
+            labels=("operation",),
+            buckets=LATENCY_BUCKETS_MS,
+        )
+        self._queries_per_unit_of_work = registry.histogram(
+            "db_unit_of_work_statements",
+            "SQL statements per unit of work",
+            buckets=QUERY_COUNT_BUCKETS,
+        ).labels()
+        self._engine: Optional[AsyncEngine] = None
+        # Slow statement -> (operation, parameters), in the order they were seen
+        self._pending_explains: Dict[str, Tuple[str, Any]] = {}
+        self._explain_task: Optional["asyncio.Task[Dict[str, Optional[str]]]"] = None
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[InstrumentationSettings] = None
+    ) -> Optional["QueryInstrumentation"]:
+        """Build instrumentation from settings.
+
+        Returns:
+            QueryInstrumentation if enabled in settings, None otherwise
+        """
+        settings = settings or get_instrumentation_settings()
+        if not settings.enabled:
+            return None
+        return cls(
+            slow_query_threshold_ms=settings.slow_query_threshold_ms,
+            explain_slow_queries=settings.explain_slow_queries,
+            n_plus_one_threshold=settings.n_plus_one_threshold,
+            max_pending_explains=settings.max_pending_explains,
+        )
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Register the cursor event listeners on an async engine."""
+        _enable_operation_tags()
+        self._engine = engine
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    async def explain_pending(self) -> Dict[str, Optional[str]]:
+        """EXPLAIN the queued slow statements on a separate connection and log the plans.
+
+        Returns:
+            Dict[str, Optional[str]]: Plan per statement, None where EXPLAIN failed
+        """
+        plans: Dict[str, Optional[str]] = {}
+        try:
+            # Statements queued while the connection closes get another round
+            while self._pending_explains:
+                async with self._connect() as conn:
+                    while self._pending_explains:
+                        statement = next(iter(self._pending_explains))
+                        operation, parameters = self._pending_explains.pop(statement)
+                        plan = plans[statement] = await self._explain(conn, statement, parameters)
+                        if plan:
+                            logger.warning(
+                                "EXPLAIN of slow query in %s: %s\n%s", operation, statement, plan
+                            )
+        except Exception:
+            logger.debug("Failed to EXPLAIN slow queries", exc_info=True)
+            self._pending_explains.clear()
+        return plans
+
+    async def close(self) -> None:
+        """Cancel the background EXPLAIN task, dropping statements still queued."""
+        self._pending_explains.clear()
+        if self._explain_task is not None:
+            self._explain_task.cancel()
+            try:
+                await self._explain_task
+            except asyncio.CancelledError:
+                pass
+            self._explain_task = None
+
+    def record(self, operation: str, statement: str, elapsed_ms: float) -> None:
+        """Record one executed statement.
+
+        Args:
+            operation: Repository method that issued the statement
+            statement: SQL statement text
+            elapsed_ms: Statement latency in milliseconds
+        """
+        self._statements.labels(operation).observe(elapsed_ms)
+
+        unit_of_work = _current_unit_of_work.get()
+        if unit_of_work is not None:
+            unit_of_work.record(operation, statement)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[UnitOfWorkStats]:
+        """Count statements executed within the block as one unit of work.
+
+        Reports statements repeated at least ``n_plus_one_threshold`` times when
+        the block exits.
+        """
+        stats = UnitOfWorkStats()
+        token = _current_unit_of_work.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_unit_of_work.reset(token)
+            self._queries_per_unit_of_work.observe(stats.query_count)
+            self._report_repeated_statements(stats)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return latency histograms (ms) per operation and statements per unit of work."""
+        return {
+            "statements": {
+                operation: histogram.snapshot()
+                for (operation,), histogram in self._statements.children()
+            },
+            "queries_per_unit_of_work": self._queries_per_unit_of_work.snapshot(),
+        }
+
+    def _before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - conn.info[_START_TIMES_KEY].pop()) * 1000
+        if conn.info.get(_EXPLAINING_KEY):
+            return
+
+        operation = _current_operation.get()
+        self.record(operation, statement, elapsed_ms)
+
+        if elapsed_ms >= self.slow_query_threshold_ms:
+            logger.warning(
+                "Slow query in %s took %.1f ms: %s", operation, elapsed_ms, statement
+            )
+            if self.explain_slow_queries and not executemany:
+                self._queue_explain(operation, statement, parameters)
+
+    def _handle_error(self, exception_context: Any) -> None:
+        conn = exception_context.connection
+        if conn is not None:
+            start_times = conn.info.get(_START_TIMES_KEY)
+            if start_times:
+                start_times.pop()
+
+    def _queue_explain(self, operation: str, statement: str, parameters: Any) -> None:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE_PREFIXES):
+            return
+        pending = self._pending_explains
+        if statement in pending or len(pending) >= self.max_pending_explains:
+            return
+        pending[statement] = (operation, parameters)
+        if self._engine is None or (self._explain_task and not self._explain_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to run on; explain_pending() picks the queue up later
+            return
+        self._explain_task = loop.create_task(self.explain_pending())
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[AsyncConnection]:
+        if self._engine is None:
+            raise RuntimeError("Instrumentation is not attached to an engine")
+        async with self._engine.connect() as conn:
+            yield conn
+
+    async def _explain(
+        self, conn: AsyncConnection, statement: str, parameters: Any
+    ) -> Optional[str]:
+        # The info dict belongs to the pooled DBAPI connection, so always reset the flag
+        conn.info[_EXPLAINING_KEY] = True
+        try:
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            return "\n".join(row[0] for row in result)
+        except Exception:
+            logger.debug("Failed to EXPLAIN slow query", exc_info=True)
+            # Leave the aborted transaction so the next statement can be explained
+            await conn.rollback()
+            return None
+        finally:
+            conn.info[_EXPLAINING_KEY] = False
+
+    def _report_repeated_statements(self, stats: UnitOfWorkStats) -> None:
+        if stats.query_count < self.n_plus_one_threshold:
+            return
+        for (operation, statement), count in stats.statement_counts.items():
+            if count >= self.n_plus_one_threshold:
+                logger.warning(
+                    "Possible N+1 pattern: %s executed the same statement %d times "
+                    "in one unit of work: %s",
+                    operation,
+                    count,
+                    statement,
+                )
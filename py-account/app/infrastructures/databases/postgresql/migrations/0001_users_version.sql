@@ -0,0 +1,16 @@
+-- Persist the optimistic locking version of users.
+--
+-- New databases get the column from Database.create_database(). Existing ones
+-- must be upgraded before deploying code that maps UserModel.version:
+--
+--     psql "$DATABASE_URL" -f 0001_users_version.sql
+--
+-- The script is idempotent. Existing rows get a random version; the next
+-- update replaces it with a UUIDv7.
+BEGIN;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS version uuid;
+UPDATE users SET version = gen_random_uuid() WHERE version IS NULL;
+ALTER TABLE users ALTER COLUMN version SET NOT NULL;
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- Add the write-coalesced activity timestamps of users.
+--
+-- New databases get the columns from Database.create_database(). Existing ones
+-- must be upgraded before deploying code that maps UserModel.last_login_at and
+-- UserModel.last_seen_at:
+--
+--     psql "$DATABASE_URL" -f 0002_users_activity.sql
+--
+-- The script is idempotent. Both columns are nullable and existing rows keep
+-- NULL until their user logs in or is seen again, so the ALTER does not
+-- rewrite the table.
+BEGIN;
+
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS last_login_at timestamptz,
+    ADD COLUMN IF NOT EXISTS last_seen_at timestamptz;
+
+COMMIT;
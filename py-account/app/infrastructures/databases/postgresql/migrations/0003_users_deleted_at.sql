@@ -0,0 +1,14 @@
+-- Add soft deletes of users.
+--
+-- New databases get the column from Database.create_database(). Existing ones
+-- must be upgraded before deploying code that maps UserModel.deleted_at:
+--
+--     psql "$DATABASE_URL" -f 0003_users_deleted_at.sql
+--
+-- The script is idempotent. The column is nullable, so the ALTER does not
+-- rewrite the table. Users hard-deleted before the upgrade stay gone.
+BEGIN;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS deleted_at timestamptz;
+
+COMMIT;
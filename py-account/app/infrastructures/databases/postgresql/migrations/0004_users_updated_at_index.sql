@@ -0,0 +1,10 @@
+-- Index users.updated_at for the token version feed, which polls recent changes.
+--
+-- New databases get the index from Database.create_database(). Existing ones
+-- should build it before deploying code that enables UserVersionFeed:
+--
+--     psql "$DATABASE_URL" -f 0004_users_updated_at_index.sql
+--
+-- The script is idempotent. CONCURRENTLY keeps the table writable while the
+-- index is built, and cannot run inside a transaction block.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_updated_at ON users (updated_at);
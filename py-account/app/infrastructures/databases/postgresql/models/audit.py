@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import String, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PgUUID
+from app.helpers.identifiers import uuid7
+from app.infrastructures.databases.postgresql.connection import Base
+
+class AuditLogModel(Base):
+    """Append-only change history of domain entities.
+
+    ``id`` is a UUIDv7 taken when the change was captured, so ordering by id
+    orders entries by capture time.
+    """
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity_type", "entity_id"),
+    )
+
+    id: Mapped[UUID] = mapped_column(PgUUID(as_uuid=True), primary_key=True, default=uuid7)  # type: ignore
+    entity_type: Mapped[str] = mapped_column(String(64), nullable=False)  # type: ignore
+    entity_id: Mapped[UUID] = mapped_column(PgUUID(as_uuid=True), nullable=False)  # type: ignore
+    action: Mapped[str] = mapped_column(String(16), nullable=False)  # type: ignore
+    version: Mapped[Optional[UUID]] = mapped_column(PgUUID(as_uuid=True), nullable=True)  # type: ignore
+    changes: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)  # type: ignore
+    occurred_at: Mapped[datetime] = mapped_column(  # type: ignore
+        DateTime(timezone=True),
+        nullable=False
+    )
@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 from sqlalchemy import String, Boolean, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import UUID as PgUUID
+from app.helpers.identifiers import uuid7
 from app.infrastructures.databases.postgresql.connection import Base
 
 if TYPE_CHECKING:
@@ -12,17 +13,34 @@ if TYPE_CHECKING:
 class UserModel(Base):
     __tablename__ = "users"
 
-    id: Mapped[UUID] = mapped_column(PgUUID(as_uuid=True), primary_key=True, default=uuid4)  # type: ignore
+    id: Mapped[UUID] = mapped_column(PgUUID(as_uuid=True), primary_key=True, default=uuid7)  # type: ignore
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)  # type: ignore
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)  # type: ignore
+    version: Mapped[UUID] = mapped_column(PgUUID(as_uuid=True), default=uuid7, nullable=False)  # type: ignore
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)  # type: ignore
     created_at: Mapped[datetime] = mapped_column(  # type: ignore
         DateTime(timezone=True), 
         default=datetime.utcnow,
         nullable=False
     )
+    # Indexed for the polling of recent changes (UserVersionFeed)
     updated_at: Mapped[Optional[datetime]] = mapped_column(  # type: ignore
         DateTime(timezone=True), 
+        nullable=True,
+        index=True
+    )
+    # Set by soft deletes; deleted rows are hidden from reads but keep their email
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(  # type: ignore
+        DateTime(timezone=True),
+        nullable=True
+    )
+    # Written only by the activity tracker, outside of versioning
+    last_login_at: Mapped[Optional[datetime]] = mapped_column(  # type: ignore
+        DateTime(timezone=True),
+        nullable=True
+    )
+    last_seen_at: Mapped[Optional[datetime]] = mapped_column(  # type: ignore
+        DateTime(timezone=True),
         nullable=True
     )
 
@@ -33,17 +51,25 @@ class UserModel(Base):
             email=self.email,
             hashed_password=self.hashed_password,
             is_active=self.is_active,
+            version=self.version,
             created_at=self.created_at,
-            updated_at=self.updated_at
+            updated_at=self.updated_at,
+            deleted_at=self.deleted_at,
+            last_login_at=self.last_login_at,
+            last_seen_at=self.last_seen_at
         )
 
     @classmethod
     def from_domain(cls, user: "User") -> "UserModel":
+        # Activity timestamps are left unset, so that merging an updated user
+        # never overwrites newer values flushed by the activity tracker
         return cls(
-            id=user.id or uuid4(),
+            id=user.id or uuid7(),
             email=user.email,
             hashed_password=user.hashed_password,
             is_active=user.is_active,
+            version=user.version or uuid7(),
             created_at=user.created_at or datetime.utcnow(),
-            updated_at=user.updated_at
+            updated_at=user.updated_at,
+            deleted_at=user.deleted_at
         )
@@ -0,0 +1,112 @@
+"""Driver-level SQL fast path for hot user lookups.
+
+``get_by_id`` and ``get_by_email`` run on every authenticated request. Through
+the ORM each call builds a ``select()`` construct, compiles it (from cache),
+loads a ``UserModel`` into the identity map and copies it into a ``User``.
+This repository answers point lookups with plain SQL through the session's
+connection (``AsyncConnection.exec_driver_sql``) instead, skipping statement
+compilation and ORM loading, and maps rows straight to ``User``. The asyncpg
+dialect prepares each statement once per connection and reuses it afterwards.
+
+The statements run on the session's connection and inside its transaction,
+through SQLAlchemy's public execution API, so they begin the transaction
+like any other statement and pass through the engine events (instrumentation
+included). Pending ORM changes are flushed first when the session
+autoflushes, so a lookup sees the uncommitted writes of its unit of work.
+
+Writes still go through the ORM.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from app.infrastructures.databases.postgresql.instrumentation import tag_queries
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.databases.postgresql.resilience import resilient
+from app.infrastructures.databases.postgresql.repositories.user import PostgresUserRepository
+from app.repository.models.user import User
+
+_table = UserModel.__table__
+_columns = ", ".join(column.name for column in _table.columns)
+
+# Soft-deleted users are hidden, as in PostgresUserRepository
+_SELECT = f"SELECT {_columns} FROM {_table.name} WHERE deleted_at IS NULL AND "
+_GET_BY_ID = _SELECT + "id = $1"
+_GET_BY_EMAIL = _SELECT + "email = $1"
+_GET_MANY_BY_IDS = _SELECT + "id = ANY($1::uuid[])"
+_GET_MANY_BY_EMAILS = _SELECT + "email = ANY($1::varchar[])"
+
+
+def _to_domain(record: Any) -> User:
+    return User(
+        id=record["id"],
+        email=record["email"],
+        hashed_password=record["hashed_password"],
+        is_active=record["is_active"],
+        version=record["version"],
+        created_at=record["created_at"],
+        updated_at=record["updated_at"],
+        last_login_at=record["last_login_at"],
+        last_seen_at=record["last_seen_at"]
+    )
+
+
+class FastPathUserRepository(PostgresUserRepository):
+    """PostgresUserRepository with point lookups as driver-level SQL.
+
+    Usage:
+        async with database.get_session() as session:
+            repository = FastPathUserRepository(session)
+            user = await repository.get_by_id(user_id)
+    """
+
+    @tag_queries
+    @resilient(retry=True)
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            uuid_id = UUID(user_id)
+        except ValueError:
+            return None
+        record = await self._fetchrow(_GET_BY_ID, uuid_id)
+        return _to_domain(record) if record else None
+
+    @tag_queries
+    @resilient(retry=True)
+    async def get_by_email(self, email: str) -> Optional[User]:
+        record = await self._fetchrow(_GET_BY_EMAIL, email)
+        return _to_domain(record) if record else None
+
+    @tag_queries
+    @resilient(retry=True)
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        uuid_ids: List[UUID] = []
+        for user_id in user_ids:
+            try:
+                uuid_ids.append(UUID(user_id))
+            except ValueError:
+                continue
+        if not uuid_ids:
+            return {}
+        records = await self._fetch(_GET_MANY_BY_IDS, uuid_ids)
+        return {str(record["id"]): _to_domain(record) for record in records}
+
+    @tag_queries
+    @resilient(retry=True)
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        if not emails:
+            return {}
+        records = await self._fetch(_GET_MANY_BY_EMAILS, list(emails))
+        return {record["email"]: _to_domain(record) for record in records}
+
+    async def _execute(self, statement: str, argument: Any) -> Any:
+        session = self._session
+        if session.autoflush and (session.new or session.dirty or session.deleted):
+            await session.flush()
+        connection = await session.connection()
+        result = await connection.exec_driver_sql(statement, (argument,))
+        return result.mappings()
+
+    async def _fetchrow(self, statement: str, argument: Any) -> Any:
+        return (await self._execute(statement, argument)).first()
+
+    async def _fetch(self, statement: str, argument: Any) -> List[Any]:
+        return list(await self._execute(statement, argument))
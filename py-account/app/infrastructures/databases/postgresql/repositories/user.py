@@ -1,47 +1,102 @@
-from typing import Optional
+from copy import copy
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PgUUID
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.exceptions.repository import DuplicateEmailError
 from app.repository.interfaces.user import UserRepository
 from app.repository.models.user import User
+from app.infrastructures.databases.postgresql.audit import AuditAction, AuditEvent, AuditWriter
 from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.databases.postgresql.instrumentation import tag_queries
+from app.infrastructures.databases.postgresql.resilience import resilient
+
+# Batch lookups bind the whole key list as one array parameter, so every batch
+# size shares a single prepared statement
+_IDS_PARAM = bindparam("user_ids", type_=ARRAY(PgUUID(as_uuid=True)))
+_EMAILS_PARAM = bindparam("emails", type_=ARRAY(String))
+
+# Soft-deleted users keep their row, and with it their email, but are never read
+_NOT_DELETED = UserModel.deleted_at.is_(None)
 
 class PostgresUserRepository(UserRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, audit: Optional[AuditWriter] = None):
         self._session = session
+        self._audit = audit
 
+    @tag_queries
+    @resilient()
     async def create(self, user: User) -> User:
         db_user = UserModel.from_domain(user)
         self._session.add(db_user)
-        await self._session.flush()
-        await self._session.commit()
-        return db_user.to_domain()
+        try:
+            await self._session.flush()
+        except IntegrityError:
+            await self._session.rollback()
+            raise DuplicateEmailError(details={"email": user.email})
+        created = db_user.to_domain()
+        await self._commit(AuditAction.CREATE, None, created)
+        return created
 
+    @tag_queries
+    @resilient(retry=True)
     async def get_by_id(self, user_id: str) -> Optional[User]:
         try:
             uuid_id = UUID(user_id)
-            stmt = select(UserModel).where(UserModel.id == uuid_id)
+            stmt = select(UserModel).where(UserModel.id == uuid_id, _NOT_DELETED)
             result = await self._session.execute(stmt)
             db_user = result.scalar_one_or_none()
             return db_user.to_domain() if db_user else None
         except ValueError:
             return None
 
+    @tag_queries
+    @resilient(retry=True)
     async def get_by_email(self, email: str) -> Optional[User]:
-        stmt = select(UserModel).where(UserModel.email == email)
+        stmt = select(UserModel).where(UserModel.email == email, _NOT_DELETED)
         result = await self._session.execute(stmt)
         db_user = result.scalar_one_or_none()
         return db_user.to_domain() if db_user else None
 
+    @tag_queries
+    @resilient(retry=True)
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        uuid_ids: List[UUID] = []
+        for user_id in user_ids:
+            try:
+                uuid_ids.append(UUID(user_id))
+            except ValueError:
+                continue
+        if not uuid_ids:
+            return {}
+        stmt = select(UserModel).where(UserModel.id == any_(_IDS_PARAM), _NOT_DELETED)
+        result = await self._session.execute(stmt, {"user_ids": uuid_ids})
+        return {str(db_user.id): db_user.to_domain() for db_user in result.scalars()}
+
+    @tag_queries
+    @resilient(retry=True)
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        if not emails:
+            return {}
+        stmt = select(UserModel).where(UserModel.email == any_(_EMAILS_PARAM), _NOT_DELETED)
+        result = await self._session.execute(stmt, {"emails": list(emails)})
+        return {db_user.email: db_user.to_domain() for db_user in result.scalars()}
+
+    @tag_queries
+    @resilient()
     async def update(self, user: User) -> User:
         if not user.id:
             raise ValueError("User ID is required for update")
             
-        # Fetch current state from database
-        db_user = await self.get_by_id(str(user.id))
-        if not db_user:
+        # Fetch current state, locking the row until commit: concurrent writers
+        # (including the resharder moving the user) wait instead of racing us
+        db_model = await self._load_for_update(user.id)
+        if not db_model:
             raise ValueError(f"User with id {user.id} not found")
+        db_user = db_model.to_domain()
         
         # Verify version to detect concurrent modifications
         user.verify_version(db_user.version)
@@ -49,22 +104,43 @@ class PostgresUserRepository(UserRepository):
         # Update version before saving
         user.update_version()
         
-        updated_db_user = UserModel.from_domain(user)
-        self._session.add(updated_db_user)
-        await self._session.commit()
-        return updated_db_user.to_domain()
+        # Merge onto the instance loaded above instead of inserting a duplicate identity
+        updated_db_user = await self._session.merge(UserModel.from_domain(user))
+        updated = updated_db_user.to_domain()
+        await self._commit(AuditAction.UPDATE, db_user, updated)
+        return updated
 
+    @tag_queries
+    @resilient()
     async def delete(self, user_id: str) -> bool:
         try:
-            uuid_id = UUID(user_id)
-            stmt = select(UserModel).where(UserModel.id == uuid_id)
-            result = await self._session.execute(stmt)
-            user_to_delete = result.scalar_one_or_none()
-            
-            if user_to_delete:
-                await self._session.delete(user_to_delete)
-                await self._session.commit()
-                return True
-            return False
+            db_model = await self._load_for_update(UUID(user_id))
         except ValueError:
             return False
+        if not db_model:
+            return False
+        # Soft delete: the row stays, hidden from reads, and keeps its email
+        before = db_model.to_domain()
+        deleted = copy(before)
+        deleted.soft_delete()
+        deleted.update_version()
+        await self._session.merge(UserModel.from_domain(deleted))
+        await self._commit(AuditAction.DELETE, before, deleted)
+        return True
+
+    async def _load_for_update(self, user_id: UUID) -> Optional[UserModel]:
+        stmt = select(UserModel).where(UserModel.id == user_id, _NOT_DELETED).with_for_update()
+        result = await self._session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def _commit(
+        self, action: AuditAction, before: Optional[User], after: Optional[User]
+    ) -> None:
+        """Commit the session, recording the change in the audit trail if enabled."""
+        if self._audit is None:
+            await self._session.commit()
+            return
+        event = AuditEvent.capture(action, before, after)
+        self._audit.stage(self._session, event)
+        await self._session.commit()
+        await self._audit.publish(event)
@@ -0,0 +1,410 @@
+"""Circuit breaker and retries for database access.
+
+When PostgreSQL degrades, every request otherwise waits out its pool or
+connect timeout, and the waiting coroutines pile up. A ``CircuitBreaker``
+counts consecutive connection-level failures. After ``failure_threshold`` of
+them it opens, and calls fail immediately with ``DatabaseConnectionError``
+(HTTP 503) instead of queueing for the pool. After ``reset_timeout`` seconds
+it half-opens and lets ``half_open_max_calls`` trial calls through: one
+success closes it again, one failure opens it for another ``reset_timeout``.
+
+Only transient errors count as failures: lost connections, connection
+refusals, pool timeouts and server shutdowns. A constraint violation or any
+other error the server answered with proves the database is up.
+
+Read-only repository methods are retried on transient errors with
+exponential backoff and full jitter. Writes are not retried, since a lost
+connection leaves unknown whether the commit happened. Neither is a read
+whose transaction already wrote, by a flush or a non-SELECT statement: the
+rollback before the retry would silently drop those writes.
+
+Usage:
+    database = Database.from_settings()   # guarded when DATABASE_RESILIENCE_ENABLED
+
+    class PostgresUserRepository(UserRepository):
+        @tag_queries
+        @resilient(retry=True)
+        async def get_by_id(self, user_id: str) -> Optional[User]:
+            ...
+"""
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from enum import Enum
+from functools import lru_cache, wraps
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from asyncpg import PostgresError
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+from sqlalchemy.orm.unitofwork import UOWTransaction
+
+from app.exceptions.base import AppException
+from app.exceptions.infrastructure import DatabaseConnectionError, DatabaseQueryError
+from app.infrastructures.metrics import get_metrics_registry
+
+T = TypeVar("T")
+
+# Key of the guard in ``AsyncSession.info``
+GUARD_KEY = "database_guard"
+
+# Set in ``AsyncSession.info`` of guarded sessions while the open transaction
+# has written
+_WROTE_KEY = "database_guard_wrote"
+
+# SQLSTATE classes and codes of errors that say nothing about the statement:
+# 08 connection exception, 53 insufficient resources (e.g. too many
+# connections), 57P01-57P03 administrator shutdown, crash, cannot connect now
+_TRANSIENT_SQLSTATE_CLASSES = frozenset({"08", "53"})
+_TRANSIENT_SQLSTATES = frozenset({"57P01", "57P02", "57P03"})
+
+_BREAKER_TRANSITIONS = get_metrics_registry().counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes",
+    labels=("breaker", "state")
+)
+_BREAKER_REJECTIONS = get_metrics_registry().counter(
+    "circuit_breaker_rejections_total", "Calls failed fast by an open circuit", labels=("breaker",)
+)
+_DATABASE_RETRIES = get_metrics_registry().counter(
+    "database_retries_total", "Repository calls retried after a transient error",
+    labels=("operation",)
+)
+
+# Set while a guarded call runs, so that nested repository calls (update
+# loading the current row) are neither counted nor retried twice
+_in_guarded_call: ContextVar[bool] = ContextVar("in_guarded_call", default=False)
+
+
+class ResilienceSettings(BaseSettings):
+    """Circuit breaker and retry settings for database access."""
+
+    model_config = SettingsConfigDict(env_prefix="DATABASE_RESILIENCE_")
+
+    enabled: bool = True
+    failure_threshold: int = 5
+    # Seconds the circuit stays open before letting trial calls through
+    reset_timeout: float = 5.0
+    half_open_max_calls: int = 1
+    # Attempts of a read-only call, including the first one
+    retry_attempts: int = 3
+    retry_base_delay: float = 0.02
+    retry_max_delay: float = 0.5
+
+
+@lru_cache
+def get_resilience_settings() -> ResilienceSettings:
+    """Get database resilience settings singleton."""
+    return ResilienceSettings()
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an error means the database is unreachable rather than that a statement failed.
+
+    Args:
+        error: Error raised by SQLAlchemy, asyncpg or the network stack
+
+    Returns:
+        bool: True for lost or refused connections, pool timeouts and server shutdowns
+    """
+    # OSError covers refused and reset connections and asyncio timeouts
+    if isinstance(error, (OSError, PoolTimeoutError)):
+        return True
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    for candidate in (error, getattr(error, "orig", None), error.__cause__):
+        sqlstate = getattr(candidate, "sqlstate", None)
+        if isinstance(sqlstate, str) and (
+            sqlstate[:2] in _TRANSIENT_SQLSTATE_CLASSES or sqlstate in _TRANSIENT_SQLSTATES
+        ):
+            return True
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Not thread-safe: each worker process runs one event loop and owns its
+    breaker, like its connection pool.
+    """
+
+    def __init__(
+        self,
+        name: str = "database",
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the breaker.
+
+        Args:
+            name: Label of the breaker's metrics
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before trial calls
+            half_open_max_calls: Concurrent trial calls while half-open
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._rejections = _BREAKER_REJECTIONS.labels(name)
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self._state is BreakerState.OPEN
+            and self._clock() - self._opened_at >= self._reset_timeout
+        ):
+            self._transition(BreakerState.HALF_OPEN)
+        return self._state
+
+    def check(self) -> None:
+        """Fail fast if a call would be rejected now, without admitting one.
+
+        Raises:
+            DatabaseConnectionError: If the circuit is open, or half-open with
+                all trial calls in flight
+        """
+        state = self.state
+        if state is BreakerState.CLOSED:
+            return
+        if state is BreakerState.HALF_OPEN and self._trials < self._half_open_max_calls:
+            return
+        self._rejections.inc()
+        retry_after = max(0.0, self._opened_at + self._reset_timeout - self._clock())
+        raise DatabaseConnectionError(details={
+            "circuit": state.value,
+            "retry_after": round(retry_after, 3),
+        })
+
+    def acquire(self) -> None:
+        """Admit a call, which must end in ``record_success``, ``record_failure`` or ``release``.
+
+        Raises:
+            DatabaseConnectionError: If the circuit rejects the call
+        """
+        self.check()
+        if self._state is BreakerState.HALF_OPEN:
+            self._trials += 1
+
+    def record_success(self) -> None:
+        """Record a call the database answered, successfully or with a statement error."""
+        self._failures = 0
+        if self._state is BreakerState.HALF_OPEN:
+            self._transition(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a call that failed with a transient error."""
+        if self._state is BreakerState.HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self._state is BreakerState.CLOSED and self._failures >= self._failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed, e.g. a cancelled one."""
+        if self._state is BreakerState.HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._transition(BreakerState.OPEN)
+
+    def _transition(self, state: BreakerState) -> None:
+        self._state = state
+        self._trials = 0
+        if state is not BreakerState.OPEN:
+            self._failures = 0
+        _BREAKER_TRANSITIONS.labels(self.name, state.value).inc()
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter.
+
+    Full jitter draws each delay uniformly from zero to the exponential bound,
+    so that callers failing together do not retry together.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.02,
+        max_delay: float = 0.5,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            attempts: Attempts including the first one; 1 disables retries
+            base_delay: Bound of the first backoff, in seconds
+            max_delay: Cap of the backoff bound, in seconds
+            rng: Random source, replaceable in tests
+        """
+        self.attempts = max(1, attempts)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, retry: int) -> float:
+        """Backoff before retry number ``retry`` (0 for the first retry)."""
+        return self._rng.uniform(0.0, min(self._max_delay, self._base_delay * 2 ** retry))
+
+
+class DatabaseGuard:
+    """Circuit breaker and retry policy of one database."""
+
+    def __init__(
+        self, breaker: CircuitBreaker, retry_policy: Optional[RetryPolicy] = None
+    ) -> None:
+        self.breaker = breaker
+        self.retry_policy = retry_policy or RetryPolicy(attempts=1)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Optional[ResilienceSettings] = None, name: str = "database"
+    ) -> Optional["DatabaseGuard"]:
+        """Build a guard from settings.
+
+        Returns:
+            Optional[DatabaseGuard]: None when resilience is disabled
+        """
+        settings = settings or get_resilience_settings()
+        if not settings.enabled:
+            return None
+        return cls(
+            CircuitBreaker(
+                name,
+                failure_threshold=settings.failure_threshold,
+                reset_timeout=settings.reset_timeout,
+                half_open_max_calls=settings.half_open_max_calls,
+            ),
+            RetryPolicy(
+                attempts=settings.retry_attempts,
+                base_delay=settings.retry_base_delay,
+                max_delay=settings.retry_max_delay,
+            ),
+        )
+
+
+def session_guard(session: AsyncSession) -> Optional[DatabaseGuard]:
+    """The guard of the database a session was opened on, if any."""
+    return session.info.get(GUARD_KEY)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed(session: Session, flush_context: UOWTransaction) -> None:
+    if GUARD_KEY in session.info:
+        session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_written(orm_execute_state: ORMExecuteState) -> None:
+    info = orm_execute_state.session.info
+    if GUARD_KEY in info and not orm_execute_state.is_select:
+        info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_written(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WROTE_KEY, None)
+
+
+def _can_retry(session: AsyncSession) -> bool:
+    # The rollback before the retry would drop pending ORM changes and any
+    # write the transaction already sent
+    return not (
+        session.info.get(_WROTE_KEY) or session.new or session.dirty or session.deleted
+    )
+
+
+def resilient(
+    retry: bool = False,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Run a repository method through its session's circuit breaker.
+
+    The repository must keep its session in ``self._session``. Methods of
+    repositories on unguarded sessions run unchanged.
+
+    Args:
+        retry: Retry transient errors; only for methods that do not write
+
+    Raises:
+        DatabaseConnectionError: If the circuit is open or the database stayed
+            unreachable for all attempts
+        DatabaseQueryError: If the database rejected a statement for another reason
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        operation = func.__qualname__
+        retries = _DATABASE_RETRIES.labels(operation)
+
+        @wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            session: AsyncSession = self._session
+            guard = session_guard(session)
+            if guard is None or _in_guarded_call.get():
+                return await func(self, *args, **kwargs)
+
+            breaker = guard.breaker
+            attempts = guard.retry_policy.attempts if retry else 1
+            attempt = 0
+            token = _in_guarded_call.set(True)
+            try:
+                while True:
+                    attempt += 1
+                    breaker.acquire()
+                    try:
+                        result = await func(self, *args, **kwargs)
+                    except (AppException, ValueError):
+                        # Domain outcomes: the database answered
+                        breaker.record_success()
+                        raise
+                    except Exception as error:
+                        if not is_transient_error(error):
+                            breaker.record_success()
+                            if isinstance(error, (DBAPIError, PostgresError)):
+                                raise DatabaseQueryError(
+                                    details={"operation": operation}
+                                ) from error
+                            raise
+                        breaker.record_failure()
+                        if attempt >= attempts or not _can_retry(session):
+                            raise DatabaseConnectionError(
+                                details={"operation": operation, "attempts": attempt}
+                            ) from error
+                    except BaseException:
+                        breaker.release()
+                        raise
+                    else:
+                        breaker.record_success()
+                        return result
+
+                    try:
+                        await session.rollback()
+                    except Exception:
+                        pass  # The connection is gone; the session reconnects on next use
+                    retries.inc()
+                    await asyncio.sleep(guard.retry_policy.delay(attempt - 1))
+            finally:
+                _in_guarded_call.reset(token)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,111 @@
+"""Global email directory for sharded user storage.
+
+Maps every email to the user id and shard that hold it, so ``get_by_email``
+reaches exactly one shard instead of scattering over all of them. The
+directory also enforces email uniqueness across shards, which per-shard
+unique constraints cannot do.
+
+The directory lives in its own database and has its own declarative base, so
+creating shard schemas never creates it.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import String, delete, select, update
+from sqlalchemy.dialects.postgresql import UUID as PgUUID, insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app.exceptions.repository import DuplicateEmailError
+from app.infrastructures.databases.postgresql.connection import Database
+
+
+class DirectoryBase(DeclarativeBase):
+    pass
+
+
+class UserDirectoryModel(DirectoryBase):
+    __tablename__ = "user_directory"
+
+    email: Mapped[str] = mapped_column(String(255), primary_key=True)  # type: ignore
+    user_id: Mapped[UUID] = mapped_column(PgUUID(as_uuid=True), index=True, nullable=False)  # type: ignore
+    shard: Mapped[str] = mapped_column(String(64), nullable=False)  # type: ignore
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    """Location of one user."""
+    email: str
+    user_id: UUID
+    shard: str
+
+
+class EmailDirectory:
+    """Email to shard lookup index."""
+
+    def __init__(self, database: Database) -> None:
+        self._database = database
+
+    async def create_schema(self) -> None:
+        """Create the directory table if missing."""
+        await self._database.create_database(DirectoryBase.metadata)
+
+    async def reserve(self, email: str, user_id: UUID, shard: str) -> None:
+        """Claim an email for a user.
+
+        Reserving an email the same user already holds is a no-op.
+
+        Raises:
+            DuplicateEmailError: If another user holds the email
+        """
+        stmt = (
+            insert(UserDirectoryModel)
+            .values(email=email, user_id=user_id, shard=shard)
+            .on_conflict_do_nothing(index_elements=[UserDirectoryModel.email])
+            .returning(UserDirectoryModel.email)
+        )
+        async with self._database.get_session() as session:
+            inserted = (await session.execute(stmt)).scalar_one_or_none()
+            await session.commit()
+        if inserted is None:
+            existing = await self.lookup(email)
+            if existing is None or existing.user_id != user_id:
+                raise DuplicateEmailError(details={"email": email})
+
+    async def lookup(self, email: str) -> Optional[DirectoryEntry]:
+        """Get the location of the user holding an email."""
+        stmt = select(UserDirectoryModel).where(UserDirectoryModel.email == email)
+        async with self._database.get_session() as session:
+            row = (await session.execute(stmt)).scalar_one_or_none()
+        return DirectoryEntry(row.email, row.user_id, row.shard) if row else None
+
+    async def lookup_many(self, emails: Sequence[str]) -> Dict[str, DirectoryEntry]:
+        """Get the locations of many users, keyed by email; unknown emails are omitted."""
+        if not emails:
+            return {}
+        stmt = select(UserDirectoryModel).where(UserDirectoryModel.email.in_(emails))
+        async with self._database.get_session() as session:
+            rows = (await session.execute(stmt)).scalars().all()
+        return {row.email: DirectoryEntry(row.email, row.user_id, row.shard) for row in rows}
+
+    async def release(self, email: str, user_id: UUID) -> None:
+        """Free an email held by a user."""
+        stmt = delete(UserDirectoryModel).where(
+            UserDirectoryModel.email == email, UserDirectoryModel.user_id == user_id
+        )
+        async with self._database.get_session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def move(self, user_ids: Sequence[UUID], shard: str) -> None:
+        """Record that users now live on another shard."""
+        if not user_ids:
+            return
+        stmt = (
+            update(UserDirectoryModel)
+            .where(UserDirectoryModel.user_id.in_(user_ids))
+            .values(shard=shard)
+        )
+        async with self._database.get_session() as session:
+            await session.execute(stmt)
+            await session.commit()
@@ -0,0 +1,184 @@
+"""UserRepository over hash-sharded PostgreSQL databases."""
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.infrastructures.databases.postgresql.repositories.user import PostgresUserRepository
+from app.infrastructures.databases.postgresql.sharding.directory import EmailDirectory
+from app.infrastructures.databases.postgresql.sharding.router import ShardRouter
+from app.repository.interfaces.user import UserRepository
+from app.repository.models.user import User
+
+
+class ShardedUserRepository(UserRepository):
+    """UserRepository routing each call to the shard that owns the user.
+
+    Users are placed by id through the router's consistent hash ring. The
+    email directory is written before the shard on create and email changes,
+    so a failure between the two leaves at worst an orphaned reservation,
+    never a user whose email is not unique. Reservations are released again
+    when the shard write fails. Deletes are soft, so a deleted user keeps
+    its email reservation like the row keeps its email on the shard.
+
+    Every call opens its own session per shard it touches.
+    """
+
+    def __init__(
+        self,
+        router: ShardRouter,
+        directory: EmailDirectory,
+        repository_factory: Callable[[AsyncSession], UserRepository] = PostgresUserRepository,
+    ) -> None:
+        """Initialize the repository.
+
+        Args:
+            router: Maps user ids to shard databases
+            directory: Global email to shard index
+            repository_factory: Builds the per-shard repository for a session
+        """
+        self._router = router
+        self._directory = directory
+        self._repository_factory = repository_factory
+
+    async def create(self, user: User) -> User:
+        shard = self._router.shard_for(user.id)
+        await self._directory.reserve(user.email, user.id, shard)
+        try:
+            async with self._shard(shard) as repository:
+                return await repository.create(user)
+        except BaseException:
+            await self._directory.release(user.email, user.id)
+            raise
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            uuid_id = UUID(user_id)
+        except ValueError:
+            return None
+        located = await self._locate(uuid_id)
+        return located[1] if located else None
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        entry = await self._directory.lookup(email)
+        if entry is None:
+            return None
+        async with self._shard(entry.shard) as repository:
+            user = await repository.get_by_id(str(entry.user_id))
+        if user is None:
+            # The resharder moved the user after the directory lookup
+            return await self.get_by_id(str(entry.user_id))
+        return user
+
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        by_shard: Dict[str, List[UUID]] = defaultdict(list)
+        for user_id in user_ids:
+            try:
+                uuid_id = UUID(user_id)
+            except ValueError:
+                continue
+            by_shard[self._router.shard_for(uuid_id)].append(uuid_id)
+
+        users = await self._get_many_on_shards(by_shard)
+        if self._router.is_resharding:
+            fallback: Dict[str, List[UUID]] = defaultdict(list)
+            for ids in by_shard.values():
+                for uuid_id in ids:
+                    candidates = self._router.candidates(uuid_id)
+                    if str(uuid_id) not in users and len(candidates) > 1:
+                        fallback[candidates[1]].append(uuid_id)
+            users.update(await self._get_many_on_shards(fallback))
+        return users
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        entries = await self._directory.lookup_many(emails)
+        users = await self.get_many_by_ids([str(entry.user_id) for entry in entries.values()])
+        return {
+            email: users[str(entry.user_id)]
+            for email, entry in entries.items()
+            if str(entry.user_id) in users
+        }
+
+    async def update(self, user: User) -> User:
+        if not user.id:
+            raise ValueError("User ID is required for update")
+
+        # Shard repositories bump the version of the given user before they flush
+        version, updated_at = user.version, user.updated_at
+        try:
+            return await self._update_once(user)
+        except (ValueError, StaleDataError):
+            if not self._router.is_resharding:
+                raise
+            # The resharder moved the user between locating and updating it: the
+            # locked load found no row, or a shard repository that does not lock
+            # matched none on flush. Look the user up again, with the version the
+            # caller read.
+            user.version, user.updated_at = version, updated_at
+            return await self._update_once(user)
+
+    async def _update_once(self, user: User) -> User:
+        located = await self._locate(user.id)
+        if not located:
+            raise ValueError(f"User with id {user.id} not found")
+        shard, current = located
+
+        email_changed = current.email != user.email
+        if email_changed:
+            await self._directory.reserve(user.email, user.id, shard)
+        try:
+            async with self._shard(shard) as repository:
+                updated = await repository.update(user)
+        except BaseException:
+            if email_changed:
+                await self._directory.release(user.email, user.id)
+            raise
+        if email_changed:
+            await self._directory.release(current.email, user.id)
+        return updated
+
+    async def delete(self, user_id: str) -> bool:
+        try:
+            uuid_id = UUID(user_id)
+        except ValueError:
+            return False
+        deleted = await self._delete_once(uuid_id)
+        if not deleted and self._router.is_resharding:
+            # The resharder may have moved the user between locating and deleting it
+            deleted = await self._delete_once(uuid_id)
+        return deleted
+
+    async def _delete_once(self, uuid_id: UUID) -> bool:
+        located = await self._locate(uuid_id)
+        if not located:
+            return False
+        async with self._shard(located[0]) as repository:
+            return await repository.delete(str(uuid_id))
+
+    @asynccontextmanager
+    async def _shard(self, shard: str) -> AsyncIterator[UserRepository]:
+        async with self._router.database(shard).get_session() as session:
+            yield self._repository_factory(session)
+
+    async def _locate(self, user_id: UUID) -> Optional[tuple[str, User]]:
+        for shard in self._router.candidates(user_id):
+            async with self._shard(shard) as repository:
+                user = await repository.get_by_id(str(user_id))
+            if user:
+                return shard, user
+        return None
+
+    async def _get_many_on_shards(self, by_shard: Dict[str, List[UUID]]) -> Dict[str, User]:
+        async def fetch(shard: str, ids: List[UUID]) -> Dict[str, User]:
+            async with self._shard(shard) as repository:
+                return await repository.get_many_by_ids([str(user_id) for user_id in ids])
+
+        results = await asyncio.gather(*(fetch(shard, ids) for shard, ids in by_shard.items()))
+        users: Dict[str, User] = {}
+        for result in results:
+            users.update(result)
+        return users
@@ -0,0 +1,213 @@
+"""Online resharding of user storage.
+
+Moves users whose owner differs between the previous and the target ring of a
+resharding ``ShardRouter``. Each batch:
+
+1. locks the next ``batch_size`` rows of a source shard (keyset by id),
+2. inserts the misplaced ones on their target shard (``ON CONFLICT DO NOTHING``),
+3. points their email directory entries at the target shard,
+4. deletes them from the source and commits, releasing the row locks.
+
+Concurrent updates of a user in a batch wait on its row lock, and the
+application keeps serving reads through the router's fallback to the
+previous owner. A crash between steps leaves a user on both shards; running
+the tool again finishes the move, since every step is idempotent.
+
+Usage:
+    python -m app.infrastructures.databases.postgresql.sharding.reshard \\
+        --directory postgresql+asyncpg://localhost:5432/directory \\
+        --from a=postgresql+asyncpg://localhost:5433/users \\
+        --from b=postgresql+asyncpg://localhost:5434/users \\
+        --to a=postgresql+asyncpg://localhost:5433/users \\
+        --to b=postgresql+asyncpg://localhost:5434/users \\
+        --to c=postgresql+asyncpg://localhost:5435/users
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.databases.postgresql.sharding.directory import EmailDirectory
+from app.infrastructures.databases.postgresql.sharding.ring import ConsistentHashRing
+from app.infrastructures.databases.postgresql.sharding.router import ShardRouter
+
+logger = logging.getLogger(__name__)
+
+_users = UserModel.__table__
+
+
+@dataclass
+class ReshardProgress:
+    """Counters of a resharding run."""
+    scanned: int = 0
+    moved: int = 0
+    batches: int = 0
+    moved_by_target: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class Resharder:
+    """Move users from their previous shard to their target shard in batches."""
+
+    def __init__(
+        self,
+        router: ShardRouter,
+        directory: EmailDirectory,
+        batch_size: int = 1_000,
+        pause: float = 0.0,
+    ) -> None:
+        """Initialize the resharder.
+
+        Args:
+            router: Router carrying both the previous and the target ring
+            directory: Email directory to repoint
+            batch_size: Rows locked and scanned per batch
+            pause: Seconds to sleep between batches, to limit load on live shards
+
+        Raises:
+            ValueError: If the router is not resharding
+        """
+        if router.previous_ring is None:
+            raise ValueError("Router has no previous ring to migrate from")
+        self._previous_ring = router.previous_ring
+        self._router = router
+        self._directory = directory
+        self._batch_size = batch_size
+        self._pause = pause
+
+    async def run(self) -> ReshardProgress:
+        """Drain every shard of the previous ring."""
+        progress = ReshardProgress()
+        for shard in self._previous_ring.shards:
+            await self.drain(shard, progress)
+        return progress
+
+    async def drain(
+        self, shard: str, progress: Optional[ReshardProgress] = None
+    ) -> ReshardProgress:
+        """Move every misplaced user off one shard."""
+        progress = progress or ReshardProgress()
+        last_id: Optional[UUID] = None
+        while True:
+            scanned, last_id = await self._move_batch(shard, last_id, progress)
+            if not scanned:
+                break
+            logger.info(
+                "Resharding %s: scanned %d, moved %d", shard, progress.scanned, progress.moved
+            )
+            if self._pause:
+                await asyncio.sleep(self._pause)
+        return progress
+
+    async def _move_batch(
+        self, source: str, after: Optional[UUID], progress: ReshardProgress
+    ) -> Tuple[int, Optional[UUID]]:
+        stmt = select(_users).order_by(_users.c.id).limit(self._batch_size).with_for_update()
+        if after is not None:
+            stmt = stmt.where(_users.c.id > after)
+
+        async with self._router.database(source).get_session() as session:
+            rows = [dict(row) for row in (await session.execute(stmt)).mappings()]
+            if not rows:
+                return 0, after
+
+            by_target: Dict[str, List[dict]] = defaultdict(list)
+            for row in rows:
+                target = self._router.shard_for(row["id"])
+                if target != source:
+                    by_target[target].append(row)
+
+            moved_ids: List[UUID] = []
+            for target, moving in by_target.items():
+                async with self._router.database(target).get_session() as target_session:
+                    await target_session.execute(
+                        insert(_users).values(moving).on_conflict_do_nothing(
+                            index_elements=[_users.c.id]
+                        )
+                    )
+                    await target_session.commit()
+                ids = [row["id"] for row in moving]
+                await self._directory.move(ids, target)
+                moved_ids.extend(ids)
+                progress.moved_by_target[target] += len(ids)
+
+            if moved_ids:
+                await session.execute(delete(_users).where(_users.c.id.in_(moved_ids)))
+            await session.commit()
+
+        progress.scanned += len(rows)
+        progress.moved += len(moved_ids)
+        progress.batches += 1
+        return len(rows), rows[-1]["id"]
+
+
+def _parse_shards(values: List[str]) -> Dict[str, str]:
+    shards: Dict[str, str] = {}
+    for value in values:
+        name, separator, url = value.partition("=")
+        if not separator or not name or not url:
+            raise argparse.ArgumentTypeError(f"Expected NAME=URL, got {value!r}")
+        shards[name] = url
+    return shards
+
+
+async def _main(args: argparse.Namespace) -> ReshardProgress:
+    previous = _parse_shards(args.from_shards)
+    target = _parse_shards(args.to_shards)
+    conflicting = [
+        name for name in previous.keys() & target.keys() if previous[name] != target[name]
+    ]
+    if conflicting:
+        raise ValueError(f"Shards with different URLs before and after: {conflicting}")
+
+    databases = {name: Database(url) for name, url in {**previous, **target}.items()}
+    directory_database = Database(args.directory)
+    try:
+        for name in target:
+            await databases[name].create_database()
+        router = ShardRouter(
+            databases,
+            ring=ConsistentHashRing(target, vnodes=args.vnodes),
+            previous_ring=ConsistentHashRing(previous, vnodes=args.vnodes),
+        )
+        resharder = Resharder(
+            router, EmailDirectory(directory_database), batch_size=args.batch_size, pause=args.pause
+        )
+        return await resharder.run()
+    finally:
+        for database in [*databases.values(), directory_database]:
+            await database.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Move users between shards after a ring change")
+    parser.add_argument("--directory", required=True, help="Email directory database URL")
+    parser.add_argument(
+        "--from", dest="from_shards", action="append", required=True, help="Previous shard NAME=URL"
+    )
+    parser.add_argument(
+        "--to", dest="to_shards", action="append", required=True, help="Target shard NAME=URL"
+    )
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds between batches")
+    parser.add_argument("--vnodes", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    progress = asyncio.run(_main(args))
+    print(f"Scanned {progress.scanned} users, moved {progress.moved} in {progress.batches} batches")
+    for shard, moved in sorted(progress.moved_by_target.items()):
+        print(f"  -> {shard}: {moved}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
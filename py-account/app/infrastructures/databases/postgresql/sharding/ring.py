@@ -0,0 +1,63 @@
+"""Consistent hash ring mapping user ids to shard names."""
+from bisect import bisect_right
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+
+def _hash(data: bytes) -> int:
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Each shard owns ``vnodes`` points on a 64-bit ring and a key belongs to the
+    first point at or after its hash. Adding or removing a shard only moves the
+    keys adjacent to that shard's points, roughly ``1 / shard_count`` of them.
+
+    Usage:
+        ring = ConsistentHashRing(["shard-a", "shard-b", "shard-c"])
+        ring.shard_for(user.id)
+    """
+
+    def __init__(self, shards: Iterable[str], vnodes: int = 256) -> None:
+        """Initialize the ring.
+
+        Args:
+            shards: Shard names; each must be unique
+            vnodes: Virtual nodes per shard; more nodes spread keys more evenly
+
+        Raises:
+            ValueError: If no shards are given or names repeat
+        """
+        names = list(shards)
+        if not names:
+            raise ValueError("At least one shard is required")
+        if len(set(names)) != len(names):
+            raise ValueError("Shard names must be unique")
+
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{name}#{vnode}".encode()), name)
+            for name in names
+            for vnode in range(vnodes)
+        )
+        self._shards = tuple(sorted(names))
+        self._hashes = [point for point, _ in points]
+        self._owners = [name for _, name in points]
+
+    @property
+    def shards(self) -> Tuple[str, ...]:
+        return self._shards
+
+    def shard_for(self, user_id: UUID) -> str:
+        """Get the shard owning a user id."""
+        index = bisect_right(self._hashes, _hash(user_id.bytes))
+        return self._owners[index % len(self._owners)]
+
+    def distribution(self, user_ids: Iterable[UUID]) -> Dict[str, int]:
+        """Count how many of the given ids each shard owns."""
+        counts = dict.fromkeys(self._shards, 0)
+        for user_id in user_ids:
+            counts[self.shard_for(user_id)] += 1
+        return counts
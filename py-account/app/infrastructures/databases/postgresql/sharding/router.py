@@ -0,0 +1,67 @@
+"""Routing of user ids to shard databases."""
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.sharding.ring import ConsistentHashRing
+
+
+class ShardRouter:
+    """Map user ids to shard ``Database`` instances.
+
+    While resharding, the router carries both the target ring and the ring the
+    data is moving away from. Lookups try the target shard first and fall back
+    to the previous owner until the resharder has moved the user.
+    """
+
+    def __init__(
+        self,
+        databases: Dict[str, Database],
+        ring: ConsistentHashRing,
+        previous_ring: Optional[ConsistentHashRing] = None,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            databases: Shard name to database, covering every shard of both rings
+            ring: Ring that owns new writes
+            previous_ring: Ring being migrated away from, while resharding
+
+        Raises:
+            ValueError: If a ring references a shard without a database
+        """
+        rings = [ring] + ([previous_ring] if previous_ring else [])
+        missing = {name for r in rings for name in r.shards} - set(databases)
+        if missing:
+            raise ValueError(f"No database configured for shards: {sorted(missing)}")
+        self._databases = databases
+        self._ring = ring
+        self._previous_ring = previous_ring
+
+    @property
+    def ring(self) -> ConsistentHashRing:
+        return self._ring
+
+    @property
+    def previous_ring(self) -> Optional[ConsistentHashRing]:
+        return self._previous_ring
+
+    @property
+    def is_resharding(self) -> bool:
+        return self._previous_ring is not None
+
+    def shard_for(self, user_id: UUID) -> str:
+        """Get the shard that owns writes for a user id."""
+        return self._ring.shard_for(user_id)
+
+    def candidates(self, user_id: UUID) -> List[str]:
+        """Get the shards that may hold a user, most likely first."""
+        shard = self._ring.shard_for(user_id)
+        if self._previous_ring is None:
+            return [shard]
+        previous = self._previous_ring.shard_for(user_id)
+        return [shard] if previous == shard else [shard, previous]
+
+    def database(self, shard: str) -> Database:
+        """Get the database of a shard."""
+        return self._databases[shard]
@@ -0,0 +1,193 @@
+"""Cross-process feed of user changes into the token version map.
+
+Every worker process keeps its own ``UserVersionMap``. Writes made through a
+worker's ``VersionTrackingUserRepository`` only reach that worker's map, so a
+``UserVersionFeed`` polls the users table for rows changed by anyone else:
+
+    SELECT id, version, is_active, deleted_at, updated_at FROM users
+    WHERE updated_at > :since ORDER BY updated_at LIMIT :batch_size
+
+``updated_at`` is set by the writer before its commit, so a row can become
+visible after a poll has already moved past its timestamp. Each poll therefore
+starts ``lag`` seconds before the newest timestamp seen so far and re-applies
+the overlap, which the map ignores unless the version is newer. A change is
+missed only if its transaction commits more than ``lag`` seconds after it was
+stamped, or if the writers' clocks are skewed by more than that.
+
+A new worker starts polling one token lifetime back, so tokens of users
+changed before it started are rejected as well. Soft deletes bump the version
+and set ``deleted_at``, so deleted users are rejected like deactivated ones.
+
+Revocation reaches other workers within ``poll_interval`` seconds. With the
+feed disabled (``USER_VERSION_FEED_ENABLED=false``) it only works with a
+single worker process.
+
+Usage:
+    feed = UserVersionFeed(database, get_user_version_map())
+    async with feed:
+        ...
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy import select
+
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.security.claims import UserVersionMap
+
+logger = logging.getLogger(__name__)
+
+
+class UserVersionFeedSettings(BaseSettings):
+    """User version feed settings."""
+
+    model_config = SettingsConfigDict(env_prefix="USER_VERSION_FEED_")
+
+    enabled: bool = True
+    # Seconds between polls; the delay before other workers reject a token
+    poll_interval: float = 1.0
+    # Seconds each poll reaches back before the newest change it has seen
+    lag: float = 5.0
+    batch_size: int = 1_000
+
+
+@lru_cache
+def get_user_version_feed_settings() -> UserVersionFeedSettings:
+    """Get user version feed settings singleton."""
+    return UserVersionFeedSettings()
+
+
+class UserVersionFeed:
+    """Poll changed users and apply them to a version map."""
+
+    def __init__(
+        self,
+        database: Optional[Database],
+        versions: UserVersionMap,
+        poll_interval: float = 1.0,
+        lag: float = 5.0,
+        batch_size: int = 1_000,
+    ) -> None:
+        """Initialize the feed.
+
+        Args:
+            database: Database holding the users table
+            versions: Map the changes are applied to
+            poll_interval: Seconds between polls
+            lag: Seconds each poll reaches back before the newest change seen
+            batch_size: Maximum rows read per query
+
+        Raises:
+            ValueError: If batch_size is less than 1
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._database = database
+        self._versions = versions
+        self._poll_interval = poll_interval
+        self._lag = timedelta(seconds=lag)
+        self._batch_size = batch_size
+        # Changes older than the token lifetime can no longer reject a token
+        self._newest = datetime.now(timezone.utc) - versions.retention
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        database: Database,
+        versions: UserVersionMap,
+        settings: Optional[UserVersionFeedSettings] = None,
+    ) -> Optional["UserVersionFeed"]:
+        """Build a feed from settings.
+
+        Returns:
+            Optional[UserVersionFeed]: None when the feed is disabled
+        """
+        settings = settings or get_user_version_feed_settings()
+        if not settings.enabled:
+            return None
+        return cls(
+            database,
+            versions,
+            poll_interval=settings.poll_interval,
+            lag=settings.lag,
+            batch_size=settings.batch_size,
+        )
+
+    async def poll(self) -> int:
+        """Apply every user change since the previous poll.
+
+        Returns:
+            int: Number of rows read, including the re-read overlap
+        """
+        since = self._newest - self._lag
+        total = 0
+        while True:
+            rows = await self._fetch(since)
+            for user_id, version, is_active, deleted_at, _ in rows:
+                self._versions.apply(user_id, version, is_active and deleted_at is None)
+            total += len(rows)
+            if rows:
+                since = rows[-1][4]
+                if since > self._newest:
+                    self._newest = since
+            if len(rows) < self._batch_size:
+                return total
+
+    async def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self) -> "UserVersionFeed":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception:
+                logger.warning(
+                    "User version poll failed, retrying in %.1fs", self._poll_interval,
+                    exc_info=True,
+                )
+            await asyncio.sleep(self._poll_interval)
+
+    async def _fetch(self, since: datetime) -> Sequence[Any]:
+        if self._database is None:
+            raise RuntimeError("User version feed has no database")
+        stmt = (
+            select(
+                UserModel.id,
+                UserModel.version,
+                UserModel.is_active,
+                UserModel.deleted_at,
+                UserModel.updated_at,
+            )
+            .where(UserModel.updated_at > since)
+            .order_by(UserModel.updated_at)
+            .limit(self._batch_size)
+        )
+        async with self._database.get_session() as session:
+            result = await session.execute(stmt)
+            rows: List[Any] = list(result.all())
+        return rows
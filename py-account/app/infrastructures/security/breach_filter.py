@@ -0,0 +1,359 @@
+"""Memory-mapped Bloom filter of breached passwords.
+
+Breach corpora hold hundreds of millions of passwords. They are far too large
+to load into every worker, and we cannot query an online service from the
+service. Instead a Bloom filter is built offline and shipped as a file. At
+0.1% false positives it takes about 2 bytes per password. Workers map the
+file read-only, so all processes on a host share the same page-cache pages.
+
+The filter is blocked: each password selects one 64-byte block (one cache
+line) and sets all of its ``num_hashes`` bits inside that block. A lookup
+therefore touches one page of the file at most. Passwords are keyed by their
+SHA-1 digest, the format breach corpora are distributed in (e.g. "Have I Been
+Pwned" ``HASH:COUNT`` lines). The digest is already uniformly distributed, so
+bit positions are sliced from it directly.
+
+File layout (little endian):
+- 64-byte header: magic, format version, hashes per item, block count, item count
+- ``block count`` blocks of 64 bytes
+
+Usage:
+    python -m app.infrastructures.security.breach_filter build \\
+        --input pwned-passwords-sha1.txt --output breached.bloom --fp-rate 0.001
+    python -m app.infrastructures.security.breach_filter stats --filter breached.bloom
+"""
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from typing import IO, Iterable, Iterator, List, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+_MAGIC = b"BRCHBLM1"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_HEADER_SIZE = 64
+_BLOCK_BYTES = 64
+_BLOCK_BITS = _BLOCK_BYTES * 8
+_MAX_HASHES = 32
+_MAX_BLOCKS = 1 << 32
+_DIGEST_POSITIONS = 128 // 9
+
+
+class BreachFilterSettings(BaseSettings):
+    """Breached password filter settings."""
+
+    model_config = SettingsConfigDict(env_prefix="BREACH_FILTER_")
+
+    # Filter file built with this module's ``build`` command; screening is off when unset
+    path: Optional[str] = None
+
+
+@lru_cache
+def get_breach_filter_settings() -> BreachFilterSettings:
+    """Get breached password filter settings singleton."""
+    return BreachFilterSettings()
+
+
+def password_digest(password: str) -> bytes:
+    """Key a password the way breach corpora do (SHA-1 of the UTF-8 bytes)."""
+    return hashlib.sha1(password.encode()).digest()
+
+
+def _positions(digest: bytes, num_blocks: int, num_hashes: int) -> Iterator[int]:
+    """Yield the absolute bit positions of a digest, all within one block.
+
+    The first 32 digest bits pick the block, the remaining 128 bits are cut
+    into 9-bit positions inside it. Filters with more hashes than that draw
+    further positions from a BLAKE2b hash of the digest.
+    """
+    block_start = (int.from_bytes(digest[:4], "little") % num_blocks) * _BLOCK_BITS
+    bits = int.from_bytes(digest[4:], "little")
+    if num_hashes > _DIGEST_POSITIONS:
+        bits |= int.from_bytes(hashlib.blake2b(digest).digest(), "little") << 128
+    for _ in range(num_hashes):
+        yield block_start + (bits & (_BLOCK_BITS - 1))
+        bits >>= 9
+
+
+def estimated_fp_rate(num_blocks: int, num_hashes: int, num_items: int) -> float:
+    """Expected false-positive rate of a blocked filter.
+
+    Items per block follow a Poisson distribution; crowded blocks answer
+    false positives more often than the average load suggests, which is what
+    makes a blocked filter need more bits than a classic one.
+    """
+    load = num_items / num_blocks
+    if load == 0:
+        return 0.0
+    spread = math.ceil(10 * math.sqrt(load) + 10)
+    rate = 0.0
+    for items in range(max(0, math.floor(load) - spread), math.ceil(load) + spread):
+        probability = math.exp(items * math.log(load) - load - math.lgamma(items + 1))
+        rate += probability * (1 - (1 - 1 / _BLOCK_BITS) ** (num_hashes * items)) ** num_hashes
+    return rate
+
+
+def optimal_parameters(capacity: int, fp_rate: float) -> tuple[int, int]:
+    """Size a filter for an expected item count and false-positive rate.
+
+    Starts from the classic Bloom filter size and grows it until the blocked
+    filter meets the target.
+
+    Args:
+        capacity: Number of items that will be added
+        fp_rate: Target false-positive rate, e.g. 0.001
+
+    Returns:
+        tuple: (block count, hashes per item)
+
+    Raises:
+        ValueError: If capacity or fp_rate are out of range or the filter gets too large
+    """
+    if capacity < 1:
+        raise ValueError("capacity must be at least 1")
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+    bits_per_item = -math.log(fp_rate) / math.log(2) ** 2
+    while True:
+        num_hashes = min(max(1, round(bits_per_item * math.log(2))), _MAX_HASHES)
+        num_blocks = max(1, math.ceil(capacity * bits_per_item / _BLOCK_BITS))
+        if num_blocks > _MAX_BLOCKS:
+            raise ValueError("Filter would exceed the maximum of 2**32 blocks")
+        if estimated_fp_rate(num_blocks, num_hashes, capacity) <= fp_rate:
+            return num_blocks, num_hashes
+        bits_per_item *= 1.05
+
+
+def _write_header(buffer: mmap.mmap, num_hashes: int, num_blocks: int, num_items: int) -> None:
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, num_hashes, num_blocks, num_items)
+    buffer[:_HEADER_SIZE] = header.ljust(_HEADER_SIZE, b"\0")
+
+
+class BreachFilterBuilder:
+    """Build a filter file in place, through a writable memory map.
+
+    Usage:
+        with BreachFilterBuilder("breached.bloom", capacity=n, fp_rate=0.001) as builder:
+            for digest in digests:
+                builder.add_digest(digest)
+    """
+
+    def __init__(self, path: str, capacity: int, fp_rate: float = 0.001) -> None:
+        self._num_blocks, self._num_hashes = optimal_parameters(capacity, fp_rate)
+        self._num_items = 0
+        self._file = open(path, "w+b")
+        self._file.truncate(_HEADER_SIZE + self._num_blocks * _BLOCK_BYTES)
+        self._buffer = mmap.mmap(self._file.fileno(), 0)
+
+    @property
+    def num_items(self) -> int:
+        return self._num_items
+
+    def add_digest(self, digest: bytes) -> None:
+        """Add a password by its SHA-1 digest."""
+        buffer = self._buffer
+        for position in _positions(digest, self._num_blocks, self._num_hashes):
+            index = _HEADER_SIZE + (position >> 3)
+            buffer[index] |= 1 << (position & 7)
+        self._num_items += 1
+
+    def add(self, password: str) -> None:
+        """Add a plain-text password."""
+        self.add_digest(password_digest(password))
+
+    def close(self) -> None:
+        """Write the header and flush the filter to disk."""
+        if self._buffer.closed:
+            return
+        _write_header(self._buffer, self._num_hashes, self._num_blocks, self._num_items)
+        self._buffer.flush()
+        self._buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> "BreachFilterBuilder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class BreachFilter:
+    """Read-only view of a filter file.
+
+    Membership answers are "possibly breached" (with the filter's
+    false-positive rate) or "definitely not in the corpus".
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map a filter file.
+
+        Raises:
+            ValueError: If the file is not a filter file or is truncated
+        """
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, num_hashes, num_blocks, num_items = _HEADER.unpack_from(self._buffer)
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError(f"{path} is not a breached password filter")
+            if len(self._buffer) != _HEADER_SIZE + num_blocks * _BLOCK_BYTES:
+                raise ValueError(f"{path} is truncated")
+        except (ValueError, struct.error):
+            self._buffer.close()
+            raise ValueError(f"{path} is not a valid breached password filter")
+        self._num_hashes = num_hashes
+        self._num_blocks = num_blocks
+        self._num_items = num_items
+
+    @property
+    def num_items(self) -> int:
+        return self._num_items
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def estimated_fp_rate(self) -> float:
+        return estimated_fp_rate(self._num_blocks, self._num_hashes, self._num_items)
+
+    def contains_digest(self, digest: bytes) -> bool:
+        """Check a password by its SHA-1 digest."""
+        buffer = self._buffer
+        for position in _positions(digest, self._num_blocks, self._num_hashes):
+            if not buffer[_HEADER_SIZE + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(password_digest(password))
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self) -> "BreachFilter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@lru_cache
+def get_breach_filter() -> Optional[BreachFilter]:
+    """Get the process-wide breached password filter, None if not configured.
+
+    The file is mapped on first use, so forked workers each map it after the
+    fork and share the page cache.
+    """
+    path = get_breach_filter_settings().path
+    return BreachFilter(path) if path else None
+
+
+def measure_fp_rate(breach_filter: BreachFilter, samples: int = 100_000) -> float:
+    """Measure the false-positive rate with random digests.
+
+    Random 160-bit digests are not in any corpus, so every hit is a false positive.
+    """
+    hits = sum(breach_filter.contains_digest(os.urandom(20)) for _ in range(samples))
+    return hits / samples
+
+
+def measure_lookups_per_second(breach_filter: BreachFilter, samples: int = 100_000) -> float:
+    """Measure plain-text password lookups per second, hashing included."""
+    passwords = [os.urandom(12).hex() for _ in range(samples)]
+    started = time.perf_counter()
+    for password in passwords:
+        password in breach_filter
+    return samples / (time.perf_counter() - started)
+
+
+def read_digests(lines: Iterable[str], input_format: str) -> Iterator[bytes]:
+    """Parse corpus lines into SHA-1 digests.
+
+    Args:
+        lines: Corpus lines
+        input_format: "sha1" for ``HEX[:COUNT]`` lines, "plain" for one password per line
+
+    Raises:
+        ValueError: If a sha1 line is not a hex digest
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if input_format == "plain":
+            yield password_digest(line)
+        else:
+            digest = bytes.fromhex(line.split(":", 1)[0])
+            if len(digest) != 20:
+                raise ValueError(f"Not a SHA-1 digest: {line!r}")
+            yield digest
+
+
+def _count_lines(file: IO[str]) -> int:
+    count = sum(1 for line in file if line.strip())
+    file.seek(0)
+    return count
+
+
+def _build(args: argparse.Namespace) -> None:
+    with open(args.input, encoding="utf-8", errors="surrogateescape") as corpus:
+        capacity = args.capacity or _count_lines(corpus)
+        started = time.perf_counter()
+        with BreachFilterBuilder(args.output, capacity, args.fp_rate) as builder:
+            for digest in read_digests(corpus, args.format):
+                builder.add_digest(digest)
+        elapsed = time.perf_counter() - started
+    print(f"Added {builder.num_items} passwords in {elapsed:.1f}s "
+          f"({builder.num_items / elapsed:,.0f}/s)")
+    if builder.num_items > capacity:
+        print(f"Warning: {builder.num_items} passwords exceed the capacity of {capacity}")
+    _print_stats(args.output, args.samples)
+
+
+def _print_stats(path: str, samples: int) -> None:
+    with BreachFilter(path) as breach_filter:
+        print(f"Filter: {breach_filter.size_bytes / 2**20:,.1f} MiB, "
+              f"{breach_filter.num_items} passwords, "
+              f"{breach_filter.size_bytes * 8 / max(breach_filter.num_items, 1):.1f} bits each")
+        print(f"False-positive rate: {measure_fp_rate(breach_filter, samples):.5f} measured, "
+              f"{breach_filter.estimated_fp_rate:.5f} estimated")
+        print(f"Lookups: {measure_lookups_per_second(breach_filter, samples):,.0f}/s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build and inspect breached password filters")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Build a filter file from a password corpus")
+    build.add_argument("--input", required=True, help="Corpus file, one entry per line")
+    build.add_argument("--output", required=True, help="Filter file to write")
+    build.add_argument("--format", choices=["sha1", "plain"], default="sha1",
+                       help="sha1: HEX[:COUNT] lines (default); plain: one password per line")
+    build.add_argument("--fp-rate", type=float, default=0.001)
+    build.add_argument("--capacity", type=int,
+                       help="Expected number of passwords; counted from the input if omitted")
+    build.add_argument("--samples", type=int, default=100_000,
+                       help="Probes used to measure the false-positive rate and throughput")
+
+    stats = commands.add_parser("stats", help="Report size, false-positive rate and throughput")
+    stats.add_argument("--filter", required=True, help="Filter file")
+    stats.add_argument("--samples", type=int, default=100_000)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        _build(args)
+    else:
+        _print_stats(args.filter, args.samples)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Versioned user snapshot claims for access tokens.
+
+Access tokens carry the user id, the ``is_active`` flag and the entity
+``version`` the token was issued against. ``UserVersionMap`` keeps, per
+recently changed user, the minimum version a token must carry to be accepted.
+``decode_token`` checks tokens against it, so deactivated or modified users are
+locked out without loading the user from the database.
+
+Versions are UUIDv7 values, which order by creation time. The map only needs
+to remember a change for as long as tokens issued before it can still be
+valid, i.e. the access token lifetime; older entries are pruned.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Dict, Optional, Sequence
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+
+from app.helpers.identifiers import uuid7
+from app.repository.interfaces.user import UserRepository
+from app.repository.models.user import User
+from .jwt import create_access_token, get_token_settings
+
+logger = logging.getLogger(__name__)
+
+# Set above the 128 version bits to mark a user deactivated at that version
+_INACTIVE_FLAG = 1 << 128
+_VERSION_MASK = _INACTIVE_FLAG - 1
+
+
+class AccessTokenClaims(BaseModel):
+    """Claims describing the user snapshot an access token was issued for."""
+    sub: str   # User id
+    ver: str   # Entity version at issue time
+    act: bool  # Whether the user was active at issue time
+
+    @classmethod
+    def from_user(cls, user: User) -> "AccessTokenClaims":
+        return cls(sub=str(user.id), ver=str(user.version), act=user.is_active)
+
+
+def create_user_access_token(user: User) -> str:
+    """Generate an access token carrying the user's snapshot claims.
+
+    Args:
+        user: User the token is issued to
+
+    Returns:
+        str: Generated JWT token
+    """
+    return create_access_token(AccessTokenClaims.from_user(user).model_dump())
+
+
+def _is_uuid7(value: int) -> bool:
+    return (value >> 76) & 0xF == 7
+
+
+def _timestamp_ms(value: int) -> int:
+    return value >> 80
+
+
+class UserVersionMap:
+    """Minimum accepted token version per recently changed user.
+
+    Entries are packed into a single int per user: the 128-bit version plus a
+    flag bit for deactivation. Feed it every user change (``observe`` or
+    ``apply``); ``VersionTrackingUserRepository`` does so for writes made
+    through it, and ``UserVersionFeed`` (PostgreSQL) for changes made by
+    other worker processes.
+
+    Usage:
+        versions = get_user_version_map()
+        repository = VersionTrackingUserRepository(repository, versions)
+        await repository.update(user)
+        claims = decode_token(token, version_map=versions)
+    """
+
+    def __init__(self, retention: Optional[timedelta] = None) -> None:
+        """Initialize the map.
+
+        Args:
+            retention: How long a change is remembered; defaults to the access token lifetime
+        """
+        if retention is None:
+            retention = timedelta(minutes=get_token_settings().access_token_expire_minutes)
+        self._retention_ms = int(retention.total_seconds() * 1000)
+        self._entries: Dict[int, int] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def retention(self) -> timedelta:
+        """How long a change is remembered."""
+        return timedelta(milliseconds=self._retention_ms)
+
+    def apply(self, user_id: UUID, version: UUID, is_active: bool) -> None:
+        """Record a user change.
+
+        Out-of-order events are harmless: the newest version wins.
+
+        Args:
+            user_id: Changed user
+            version: Version after the change
+            is_active: Whether the user is active after the change
+        """
+        entry = version.int | (0 if is_active else _INACTIVE_FLAG)
+        with self._lock:
+            current = self._entries.get(user_id.int)
+            if current is None or (entry & _VERSION_MASK) >= (current & _VERSION_MASK):
+                self._entries[user_id.int] = entry
+
+    def observe(self, user: User) -> None:
+        """Record the current state of a changed user."""
+        self.apply(user.id, user.version, user.is_active)
+
+    def forget_deleted(self, user_id: UUID) -> None:
+        """Reject every token of a deleted user for the retention period."""
+        self.apply(user_id, uuid7(), is_active=False)
+
+    def is_accepted(self, claims: AccessTokenClaims) -> bool:
+        """Check whether a token issued for the given snapshot is still acceptable.
+
+        Returns:
+            bool: False if the user was deactivated or changed after the token was issued
+        """
+        if not claims.act:
+            return False
+        try:
+            user_id = UUID(claims.sub).int
+            version = UUID(claims.ver).int
+        except ValueError:
+            return False
+
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return True
+        if entry & _INACTIVE_FLAG:
+            return False
+        minimum = entry & _VERSION_MASK
+        if _is_uuid7(minimum) and _is_uuid7(version):
+            return version >= minimum
+        # Versions created before UUIDv7 do not order; only the exact version is current
+        return version == minimum
+
+    def accepts_payload(self, payload: Dict[str, Any]) -> bool:
+        """Check a decoded token payload; tokens without snapshot claims are rejected."""
+        try:
+            claims = AccessTokenClaims.model_validate(payload)
+        except ValidationError:
+            return False
+        return self.is_accepted(claims)
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Forget changes older than the retention period.
+
+        Tokens issued before such a change have expired, so the entry can no
+        longer reject anything.
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff_ms = int(now.timestamp() * 1000) - self._retention_ms
+        with self._lock:
+            expired = [
+                user_id for user_id, entry in self._entries.items()
+                if _is_uuid7(entry & _VERSION_MASK)
+                and _timestamp_ms(entry & _VERSION_MASK) < cutoff_ms
+            ]
+            for user_id in expired:
+                del self._entries[user_id]
+        return len(expired)
+
+    async def prune_periodically(self, interval: float) -> None:
+        """Prune every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.prune()
+            if removed:
+                logger.debug("Pruned %d user versions, %d left", removed, len(self))
+
+
+class VersionTrackingUserRepository(UserRepository):
+    """UserRepository wrapper feeding every update and delete into a version map.
+
+    Tokens issued before a password change, deactivation or deletion made
+    through it are rejected by ``decode_token`` from then on.
+    """
+
+    def __init__(self, repository: UserRepository, versions: UserVersionMap) -> None:
+        self._repository = repository
+        self._versions = versions
+
+    async def create(self, user: User) -> User:
+        return await self._repository.create(user)
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return await self._repository.get_by_id(user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self._repository.get_by_email(email)
+
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        return await self._repository.get_many_by_ids(user_ids)
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        return await self._repository.get_many_by_emails(emails)
+
+    async def update(self, user: User) -> User:
+        updated = await self._repository.update(user)
+        self._versions.observe(updated)
+        return updated
+
+    async def delete(self, user_id: str) -> bool:
+        deleted = await self._repository.delete(user_id)
+        if deleted:
+            self._versions.forget_deleted(UUID(user_id))
+        return deleted
+
+
+@lru_cache
+def get_user_version_map() -> UserVersionMap:
+    """Get the process-wide user version map singleton."""
+    return UserVersionMap()
@@ -11,3 +11,8 @@ class TokenExpiredError(TokenError):
 class TokenInvalidError(TokenError):
     """Exception raised when token is invalid."""
     pass
+
+
+class TokenRevokedError(TokenInvalidError):
+    """Exception raised when token was issued for a deactivated or since modified user."""
+    pass
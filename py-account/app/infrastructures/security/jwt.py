@@ -1,9 +1,28 @@
+import time
 from datetime import datetime, timedelta, UTC
 from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 from jose import jwt
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.infrastructures.metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from .claims import UserVersionMap
+
+_JWT_SECONDS = get_metrics_registry().histogram(
+    "jwt_seconds", "JWT encoding and decoding time", labels=("operation",)
+)
+_ENCODE_SECONDS = _JWT_SECONDS.labels("encode")
+_DECODE_SECONDS = _JWT_SECONDS.labels("decode")
+_JWT_REJECTED = get_metrics_registry().counter(
+    "jwt_rejected_total", "Tokens rejected on decode", labels=("reason",)
+)
+_EXPIRED = _JWT_REJECTED.labels("expired")
+_INVALID = _JWT_REJECTED.labels("invalid")
+_REVOKED = _JWT_REJECTED.labels("revoked")
+
 
 class TokenSettings(BaseSettings):
     """JWT settings for token generation and verification."""
@@ -31,6 +50,7 @@ def create_access_token(data: dict) -> str:
     Returns:
         str: Generated JWT token
     """
+    started = time.perf_counter()
     settings = get_token_settings()
     
     # Copy data to avoid modifying original
@@ -48,25 +68,30 @@ def create_access_token(data: dict) -> str:
         algorithm=settings.algorithm
     )
 
+    _ENCODE_SECONDS.observe(time.perf_counter() - started)
     return encoded_jwt
 
 
 from jose import JWTError, ExpiredSignatureError
-from .exceptions import TokenError, TokenExpiredError, TokenInvalidError
+from .exceptions import TokenError, TokenExpiredError, TokenInvalidError, TokenRevokedError
 
-def decode_token(token: str) -> dict:
+def decode_token(token: str, version_map: Optional["UserVersionMap"] = None) -> dict:
     """Decode and verify a JWT token.
     
     Args:
         token (str): JWT token to decode
+        version_map (UserVersionMap, optional): When given, tokens must carry user
+            snapshot claims that the map still accepts
         
     Returns:
         dict: Decoded token data
         
     Raises:
         TokenExpiredError: If token has expired
+        TokenRevokedError: If the user was deactivated or modified after issue
         TokenInvalidError: If token is invalid
     """
+    started = time.perf_counter()
     settings = get_token_settings()
     
     try:
@@ -75,10 +100,20 @@ def decode_token(token: str) -> dict:
             settings.secret_key,
             algorithms=[settings.algorithm]
         )
-        return decoded_token
         
     except ExpiredSignatureError:
+        _EXPIRED.inc()
         raise TokenExpiredError("Token has expired")
         
     except JWTError:
+        _INVALID.inc()
         raise TokenInvalidError("Invalid token")
+
+    finally:
+        _DECODE_SECONDS.observe(time.perf_counter() - started)
+
+    if version_map is not None and not version_map.accepts_payload(decoded_token):
+        _REVOKED.inc()
+        raise TokenRevokedError("Token was issued for an outdated user state")
+
+    return decoded_token
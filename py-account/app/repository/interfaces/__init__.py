@@ -1,3 +1,4 @@
+from .activity import ActivityRecorder
 from .user import UserRepository
 
-__all__ = ['UserRepository']
+__all__ = ['ActivityRecorder', 'UserRepository']
@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Optional, Protocol
+from uuid import UUID
+
+class ActivityRecorder(Protocol):
+    def record_login(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        """Record a successful login, which also counts as being seen"""
+        ...
+
+    def record_seen(self, user_id: UUID, at: Optional[datetime] = None) -> None:
+        """Record an authenticated request"""
+        ...
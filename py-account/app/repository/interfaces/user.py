@@ -1,4 +1,4 @@
-from typing import Protocol, Optional
+from typing import Dict, Protocol, Optional, Sequence
 from ..models.user import User
 
 class UserRepository(Protocol):
@@ -14,6 +14,14 @@ class UserRepository(Protocol):
         """Get user by email"""
         ...
 
+    async def get_many_by_ids(self, user_ids: Sequence[str]) -> Dict[str, User]:
+        """Get users by IDs, keyed by canonical string ID; missing users are omitted"""
+        ...
+
+    async def get_many_by_emails(self, emails: Sequence[str]) -> Dict[str, User]:
+        """Get users by emails, keyed by email; missing users are omitted"""
+        ...
+
     async def update(self, user: User) -> User:
         """Update user"""
         ...
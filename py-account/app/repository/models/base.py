@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from app.helpers.identifiers import uuid7
 
 class OptimisticLockException(Exception):
     """Raised when a concurrent modification is detected."""
@@ -16,8 +18,8 @@ class BaseModel:
         updated_at: Optional[datetime] = None,
         deleted_at: Optional[datetime] = None
     ) -> None:
-        self.id = id or uuid4()
-        self.version = version or uuid4()
+        self.id = id or uuid7()
+        self.version = version or uuid7()
         self.created_at = created_at or datetime.now(timezone.utc)
         self.updated_at = updated_at
         self.deleted_at = deleted_at
@@ -32,7 +34,7 @@ class BaseModel:
 
     def update_version(self) -> None:
         """Update the version for optimistic locking."""
-        self.version = uuid4()
+        self.version = uuid7()
         self.updated_at = datetime.now(timezone.utc)
 
     def verify_version(self, stored_version: UUID) -> None:
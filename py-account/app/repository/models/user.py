@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from app.helpers.identifiers import uuid7
 from .base import BaseModel
 
 class User(BaseModel):
@@ -10,6 +12,8 @@ class User(BaseModel):
         email: User's email address
         hashed_password: Pre-hashed password
         is_active: Whether the user account is active
+        last_login_at: Latest successful login, maintained by the activity tracker
+        last_seen_at: Latest authenticated request, maintained by the activity tracker
     """
     def __init__(
         self,
@@ -20,7 +24,9 @@ class User(BaseModel):
         version: Optional[UUID] = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
-        deleted_at: Optional[datetime] = None
+        deleted_at: Optional[datetime] = None,
+        last_login_at: Optional[datetime] = None,
+        last_seen_at: Optional[datetime] = None
     ) -> None:
         super().__init__(
             id=id,
@@ -34,6 +40,8 @@ class User(BaseModel):
         self.email = email
         self.hashed_password = hashed_password
         self.is_active = is_active
+        self.last_login_at = last_login_at
+        self.last_seen_at = last_seen_at
 
     @classmethod
     def create(cls, *, email: str, hashed_password: str) -> "User":
@@ -52,5 +60,5 @@ class User(BaseModel):
         return cls(
             email=email,
             hashed_password=hashed_password,
-            version=uuid4()
+            version=uuid7()
         )
@@ -1,8 +1,9 @@
 """Authentication related schemas."""
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, EmailStr, field_validator
 
-from app.helpers.password import validate_password_complexity
+from app.helpers.password import validate_password_complexity, validate_password_not_breached
 from app.helpers.email import validate_email_format
 
 class RegisterRequest(BaseModel):
@@ -14,6 +15,9 @@ class RegisterRequest(BaseModel):
     @classmethod
     def validate_password(cls, password: str) -> str:
         is_valid, error = validate_password_complexity(password)
+        if not is_valid:
+            raise ValueError(error)
+        is_valid, error = validate_password_not_breached(password)
         if not is_valid:
             raise ValueError(error)
         return password
@@ -26,6 +30,15 @@ class RegisterRequest(BaseModel):
             raise ValueError(error)
         return email
 
+class LoginRequest(BaseModel):
+    """Login request schema.
+    
+    Passwords are not validated for complexity here: accounts created under
+    older rules must still be able to log in.
+    """
+    email: EmailStr
+    password: str
+
 class TokenResponse(BaseModel):
     """Token response schema."""
     access_token: str
@@ -37,3 +50,15 @@ class RegisterResponse(BaseModel):
     email: str
     is_active: bool
     token: TokenResponse
+
+class UserResponse(BaseModel):
+    """Authenticated user schema."""
+    id: str
+    email: str
+    is_active: bool
+
+class TokenInfoResponse(BaseModel):
+    """Verified access token schema."""
+    user_id: str
+    version: str
+    expires_at: datetime
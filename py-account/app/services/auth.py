@@ -0,0 +1,136 @@
+"""Auth service implementation."""
+import asyncio
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.exceptions.repository import DuplicateEmailError
+from app.exceptions.service import (
+    InvalidCredentialsError, InvalidTokenError, UserAlreadyExistsError
+)
+from app.helpers.password import hash_password, verify_password
+from app.infrastructures.security.claims import UserVersionMap, create_user_access_token
+from app.infrastructures.security.exceptions import (
+    TokenExpiredError, TokenInvalidError, TokenRevokedError
+)
+from app.infrastructures.security.jwt import decode_token
+from app.repository.interfaces.activity import ActivityRecorder
+from app.repository.interfaces.user import UserRepository
+from app.repository.models.user import User
+from app.schemas.auth import (
+    LoginRequest, RegisterRequest, RegisterResponse, TokenInfoResponse, TokenResponse,
+    UserResponse
+)
+
+
+@lru_cache
+def _unknown_user_hash() -> str:
+    # Verified against when the email is unknown, so that a login attempt takes
+    # as long as for an existing user and does not reveal registered emails
+    return hash_password("unknown-user-placeholder")
+
+
+class DefaultAuthService:
+    """Auth service backed by a user repository.
+
+    bcrypt hashing and verification run in the default thread pool: bcrypt
+    releases the GIL, so the event loop keeps serving other requests while a
+    hash is computed.
+
+    Usage:
+        async with database.get_session() as session:
+            service = DefaultAuthService(PostgresUserRepository(session))
+            response = await service.register(request)
+    """
+
+    def __init__(
+        self,
+        repository: Optional[UserRepository],
+        version_map: Optional[UserVersionMap] = None,
+        activity: Optional[ActivityRecorder] = None,
+    ) -> None:
+        """Initialize the service.
+
+        Args:
+            repository: User storage; None for a service that only verifies tokens
+            version_map: Rejects tokens of deactivated or modified users when given
+            activity: Records logins and authenticated requests when given
+        """
+        self._repository = repository
+        self._version_map = version_map
+        self._activity = activity
+
+    @property
+    def _users(self) -> UserRepository:
+        if self._repository is None:
+            raise RuntimeError("This auth service has no user repository")
+        return self._repository
+
+    async def register(self, request: RegisterRequest) -> RegisterResponse:
+        if await self._users.get_by_email(request.email):
+            raise UserAlreadyExistsError()
+
+        hashed_password = await asyncio.to_thread(hash_password, request.password)
+        try:
+            user = await self._users.create(
+                User.create(email=request.email, hashed_password=hashed_password)
+            )
+        except DuplicateEmailError:
+            # Registered concurrently after the lookup above
+            raise UserAlreadyExistsError()
+
+        return RegisterResponse(
+            id=str(user.id),
+            email=user.email,
+            is_active=user.is_active,
+            token=TokenResponse(access_token=create_user_access_token(user)),
+        )
+
+    async def login(self, request: LoginRequest) -> TokenResponse:
+        user = await self._users.get_by_email(request.email)
+        hashed_password = user.hashed_password if user else _unknown_user_hash()
+
+        matches = await asyncio.to_thread(verify_password, request.password, hashed_password)
+        if user is None or not matches or not user.is_active:
+            raise InvalidCredentialsError()
+
+        if self._activity is not None:
+            self._activity.record_login(user.id)
+        return TokenResponse(access_token=create_user_access_token(user))
+
+    async def verify_token(self, token: str) -> TokenInfoResponse:
+        claims = self._decode(token)
+        try:
+            response = TokenInfoResponse(
+                user_id=claims["sub"],
+                version=claims["ver"],
+                expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+            )
+            user_id = UUID(response.user_id)
+        except (KeyError, TypeError, ValueError):
+            # Signed by us, but not a user access token
+            raise InvalidTokenError("invalid")
+
+        if self._activity is not None:
+            self._activity.record_seen(user_id)
+        return response
+
+    async def get_current_user(self, token: str) -> UserResponse:
+        claims = self._decode(token)
+        user = await self._users.get_by_id(str(claims.get("sub", "")))
+        if user is None or not user.is_active:
+            raise InvalidTokenError("revoked")
+        if self._activity is not None:
+            self._activity.record_seen(user.id)
+        return UserResponse(id=str(user.id), email=user.email, is_active=user.is_active)
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return decode_token(token, version_map=self._version_map)
+        except TokenExpiredError:
+            raise InvalidTokenError("expired")
+        except TokenRevokedError:
+            raise InvalidTokenError("revoked")
+        except TokenInvalidError:
+            raise InvalidTokenError("invalid")
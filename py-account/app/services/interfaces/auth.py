@@ -1,7 +1,10 @@
 """Auth service interface."""
 from typing import Protocol
 
-from app.schemas.auth import RegisterRequest, RegisterResponse
+from app.schemas.auth import (
+    LoginRequest, RegisterRequest, RegisterResponse, TokenInfoResponse, TokenResponse,
+    UserResponse
+)
 
 class AuthService(Protocol):
     """Interface for authentication service."""
@@ -16,6 +19,50 @@ class AuthService(Protocol):
             RegisterResponse with user info and access token
             
         Raises:
-            ValueError: If email already exists
+            UserAlreadyExistsError: If email already exists
+        """
+        ...
+
+    async def login(self, request: LoginRequest) -> TokenResponse:
+        """Authenticate a user by email and password.
+        
+        Args:
+            request: Login request containing email and password
+            
+        Returns:
+            TokenResponse with a new access token
+            
+        Raises:
+            InvalidCredentialsError: If the user does not exist, is inactive or
+                the password does not match
+        """
+        ...
+
+    async def verify_token(self, token: str) -> TokenInfoResponse:
+        """Verify an access token without loading the user.
+        
+        Args:
+            token: Encoded access token
+            
+        Returns:
+            TokenInfoResponse describing the token's user snapshot
+            
+        Raises:
+            InvalidTokenError: If the token is expired, invalid or revoked
+        """
+        ...
+
+    async def get_current_user(self, token: str) -> UserResponse:
+        """Load the user an access token was issued to.
+        
+        Args:
+            token: Encoded access token
+            
+        Returns:
+            UserResponse of the token's user
+            
+        Raises:
+            InvalidTokenError: If the token is expired, invalid or revoked, or
+                its user no longer exists or is inactive
         """
         ...
@@ -0,0 +1,45 @@
+"""Fast-path lookups against PostgreSQL.
+
+Set POSTGRES_TEST_DATABASE_URL to the URL of a disposable database.
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.databases.postgresql.repositories.fast_user import (
+    FastPathUserRepository,
+)
+from app.repository.models.user import User
+
+POSTGRES_URL = os.environ.get("POSTGRES_TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="POSTGRES_TEST_DATABASE_URL is not set")
+
+@pytest.mark.asyncio
+async def test_lookup_sees_uncommitted_orm_writes_of_its_session():
+    database = Database(POSTGRES_URL)
+    try:
+        await database.create_database()
+        async with database.get_session() as session:
+            await session.execute(text("DELETE FROM users"))
+            await session.commit()
+
+            repository = FastPathUserRepository(session)
+            # Before any ORM statement, so the lookup begins the transaction
+            assert await repository.get_by_email("test@example.com") is None
+
+            user = User.create(email="test@example.com", hashed_password="hashed")
+            session.add(UserModel.from_domain(user))
+            found = await repository.get_by_email("test@example.com")
+            by_id = await repository.get_by_id(str(user.id))
+            await session.rollback()
+
+        assert found is not None and found.id == user.id
+        assert by_id is not None
+        async with database.get_session() as session:
+            assert await FastPathUserRepository(session).get_by_id(str(user.id)) is None
+    finally:
+        await database.dispose()
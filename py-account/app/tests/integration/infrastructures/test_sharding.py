@@ -0,0 +1,68 @@
+"""Sharded storage against local PostgreSQL instances.
+
+Set SHARDING_TEST_DATABASE_URLS to four comma-separated URLs of disposable
+databases: the email directory followed by three shards.
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.exceptions.repository import DuplicateEmailError
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.sharding.directory import EmailDirectory
+from app.infrastructures.databases.postgresql.sharding.repository import ShardedUserRepository
+from app.infrastructures.databases.postgresql.sharding.reshard import Resharder
+from app.infrastructures.databases.postgresql.sharding.ring import ConsistentHashRing
+from app.infrastructures.databases.postgresql.sharding.router import ShardRouter
+from app.repository.models.user import User
+
+URLS = [url for url in os.environ.get("SHARDING_TEST_DATABASE_URLS", "").split(",") if url]
+
+pytestmark = pytest.mark.skipif(
+    len(URLS) < 4, reason="SHARDING_TEST_DATABASE_URLS needs a directory and three shard URLs"
+)
+
+@pytest.mark.asyncio
+async def test_create_lookup_and_reshard():
+    directory_database = Database(URLS[0])
+    databases = {name: Database(url) for name, url in zip("abc", URLS[1:])}
+    directory = EmailDirectory(directory_database)
+    try:
+        await directory.create_schema()
+        for database in databases.values():
+            await database.create_database()
+            async with database.get_session() as session:
+                await session.execute(text("DELETE FROM users"))
+                await session.commit()
+        async with directory_database.get_session() as session:
+            await session.execute(text("DELETE FROM user_directory"))
+            await session.commit()
+
+        two_shards = ConsistentHashRing(["a", "b"])
+        repository = ShardedUserRepository(ShardRouter(databases, ring=two_shards), directory)
+        users = [
+            await repository.create(User.create(email=f"user{n}@example.com", hashed_password="hashed"))
+            for n in range(200)
+        ]
+        with pytest.raises(DuplicateEmailError):
+            await repository.create(User.create(email="user0@example.com", hashed_password="hashed"))
+
+        three_shards = ConsistentHashRing(["a", "b", "c"])
+        router = ShardRouter(databases, ring=three_shards, previous_ring=two_shards)
+        progress = await Resharder(router, directory, batch_size=50).run()
+
+        expected_moves = sum(
+            two_shards.shard_for(user.id) != three_shards.shard_for(user.id) for user in users
+        )
+        assert progress.moved == expected_moves
+
+        repository = ShardedUserRepository(ShardRouter(databases, ring=three_shards), directory)
+        for user in users:
+            assert (await repository.get_by_id(str(user.id))).email == user.email
+            assert (await repository.get_by_email(user.email)).id == user.id
+            entry = await directory.lookup(user.email)
+            assert entry.shard == three_shards.shard_for(user.id)
+    finally:
+        for database in [directory_database, *databases.values()]:
+            await database.dispose()
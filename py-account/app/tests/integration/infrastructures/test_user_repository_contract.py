@@ -0,0 +1,86 @@
+"""Behaviour every ``UserRepository`` adapter must share.
+
+The in-memory adapter always runs. Set POSTGRES_TEST_DATABASE_URL to the URL
+of a disposable database to run the same tests against PostgreSQL.
+"""
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.exceptions.repository import DuplicateEmailError
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.repositories.user import PostgresUserRepository
+from app.repository.models.base import OptimisticLockException
+from app.repository.models.user import User
+
+POSTGRES_URL = os.environ.get("POSTGRES_TEST_DATABASE_URL")
+
+@pytest_asyncio.fixture(params=[
+    "memory",
+    pytest.param("postgres", marks=pytest.mark.skipif(
+        not POSTGRES_URL, reason="POSTGRES_TEST_DATABASE_URL is not set"
+    )),
+])
+async def repository(request):
+    if request.param == "memory":
+        yield InMemoryUserRepository()
+        return
+    database = Database(POSTGRES_URL)
+    try:
+        await database.create_database()
+        async with database.get_session() as session:
+            await session.execute(text("DELETE FROM users"))
+            await session.commit()
+            yield PostgresUserRepository(session)
+    finally:
+        await database.dispose()
+
+def make_user(email: str = "test@example.com") -> User:
+    return User.create(email=email, hashed_password="hashed123")
+
+@pytest.mark.asyncio
+async def test_create_and_lookup(repository):
+    user = await repository.create(make_user())
+
+    assert (await repository.get_by_id(str(user.id))).email == "test@example.com"
+    assert (await repository.get_by_email("test@example.com")).id == user.id
+    assert await repository.get_by_id("not-a-uuid") is None
+    assert await repository.get_by_email("missing@example.com") is None
+
+@pytest.mark.asyncio
+async def test_email_must_be_unique(repository):
+    await repository.create(make_user())
+
+    with pytest.raises(DuplicateEmailError):
+        await repository.create(make_user())
+
+@pytest.mark.asyncio
+async def test_update_rejects_stale_versions(repository):
+    user = await repository.create(make_user())
+    stale = await repository.get_by_id(str(user.id))
+    current = await repository.get_by_id(str(user.id))
+
+    current.email = "changed@example.com"
+    updated = await repository.update(current)
+
+    assert updated.version != user.version
+    with pytest.raises(OptimisticLockException):
+        await repository.update(stale)
+
+@pytest.mark.asyncio
+async def test_delete_is_soft_and_keeps_the_email_reserved(repository):
+    user = await repository.create(make_user())
+
+    assert await repository.delete(str(user.id)) is True
+    assert await repository.delete(str(user.id)) is False
+    assert await repository.get_by_id(str(user.id)) is None
+    assert await repository.get_by_email("test@example.com") is None
+    assert await repository.get_many_by_ids([str(user.id)]) == {}
+    with pytest.raises(ValueError):
+        await repository.update(user)
+
+    with pytest.raises(DuplicateEmailError):
+        await repository.create(make_user())
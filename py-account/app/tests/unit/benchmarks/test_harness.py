@@ -0,0 +1,77 @@
+from typing import Dict, Optional
+
+import pytest
+
+from benchmarks.__main__ import _check_regressions
+from benchmarks.harness import BenchmarkReport, BenchmarkResult, Comparison, compare
+
+def _result(
+    name: str, median_ns: float, tolerance: float = 0.10, budget_ns: Optional[float] = None
+) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        group="test",
+        loops=1,
+        rounds=1,
+        median_ns=median_ns,
+        mean_ns=median_ns,
+        min_ns=median_ns,
+        stdev_ns=0.0,
+        tolerance=tolerance,
+        budget_ns=budget_ns,
+    )
+
+def _report(medians: Dict[str, float], tolerance: float = 0.10) -> BenchmarkReport:
+    return BenchmarkReport(
+        results={name: _result(name, median, tolerance) for name, median in medians.items()},
+        environment={"platform": "test"},
+    )
+
+@pytest.mark.parametrize(
+    "baseline_ns, current_ns, tolerance, regression",
+    [
+        (1000, 900, 0.10, False),
+        (1000, 1000, 0.10, False),
+        (1000, 1100, 0.10, False),
+        (1000, 1101, 0.10, True),
+        (1000, 1400, 0.50, False),
+        (1000, 1600, 0.50, True),
+        (1000, 1001, 0.0, True),
+    ],
+)
+def test_regression_threshold(baseline_ns, current_ns, tolerance, regression):
+    comparison = Comparison("op", baseline_ns, current_ns, tolerance)
+
+    assert comparison.is_regression is regression
+
+@pytest.mark.parametrize(
+    "budget_ns, median_ns, over_budget",
+    [
+        (None, 1e9, False),
+        (1000, 999, False),
+        (1000, 1000, False),
+        (1000, 1001, True),
+    ],
+)
+def test_budget_is_checked_against_the_median(budget_ns, median_ns, over_budget):
+    assert _result("op", median_ns, budget_ns=budget_ns).over_budget is over_budget
+
+def test_compare_only_pairs_benchmarks_present_in_both_reports():
+    baseline = _report({"kept": 1000, "removed": 500})
+    current = _report({"kept": 1500, "added": 200}, tolerance=0.25)
+
+    assert compare(baseline, current) == [Comparison("kept", 1000, 1500, 0.25)]
+
+@pytest.mark.parametrize(
+    "baseline, current, status",
+    [
+        ({"a": 1000, "b": 1000}, {"a": 1050, "b": 900}, 0),
+        ({"a": 1000, "b": 1000}, {"a": 1050, "b": 1200}, 1),
+        ({"a": 1000}, {"b": 5000}, 0),
+        ({}, {"a": 1000}, 0),
+    ],
+)
+def test_check_regressions_exit_status(baseline, current, status, capsys):
+    assert _check_regressions(_report(baseline), _report(current)) == status
+    if status:
+        assert "b: 1.20x baseline (tolerance 10%)" in capsys.readouterr().out
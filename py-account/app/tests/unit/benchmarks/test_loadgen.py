@@ -0,0 +1,68 @@
+import math
+
+import pytest
+
+from app.infrastructures.metrics import MetricsRegistry
+from benchmarks.loadgen import histogram_quantile, parse_histograms, stage_quantiles
+
+INF = math.inf
+# 10 observations up to 1, 20 in (1, 2], 10 in (2, 4]
+BUCKETS = [(1.0, 10.0), (2.0, 30.0), (4.0, 40.0), (INF, 40.0)]
+
+@pytest.mark.parametrize(
+    "q, buckets, expected",
+    [
+        (0.1, BUCKETS, 0.4),
+        (0.25, BUCKETS, 1.0),
+        (0.5, BUCKETS, 1.5),
+        (0.9, BUCKETS, 3.2),
+        (1.0, BUCKETS, 4.0),
+        # Observations above the highest finite bound are reported at that bound
+        (0.99, [(1.0, 5.0), (INF, 10.0)], 1.0),
+        # An empty leading bucket reports its upper bound
+        (0.0, [(1.0, 0.0), (2.0, 5.0), (INF, 5.0)], 1.0),
+    ],
+)
+def test_histogram_quantile_interpolates_within_the_bucket(q, buckets, expected):
+    assert histogram_quantile(q, buckets) == pytest.approx(expected)
+
+@pytest.mark.parametrize("buckets", [[], [(1.0, 0.0), (INF, 0.0)]])
+def test_histogram_quantile_of_no_observations_is_nan(buckets):
+    assert math.isnan(histogram_quantile(0.5, buckets))
+
+def test_parse_histograms_reads_cumulative_buckets_per_series():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("op",), buckets=(0.1, 1.0))
+    histogram.labels("get").observe(0.05)
+    histogram.labels("get").observe(0.5)
+    registry.counter("events_total", "Events").inc()
+
+    assert parse_histograms(registry.exposition()) == {
+        ("latency_seconds", (("op", "get"),)): [(0.1, 1.0), (1.0, 2.0), (INF, 2.0)],
+    }
+
+def test_stage_quantiles_cover_only_observations_made_during_the_run():
+    registry = MetricsRegistry()
+    repository = registry.histogram(
+        "repository_call_seconds", "Repository", ("operation",), buckets=(0.001, 0.01, 0.1)
+    )
+    bcrypt = registry.histogram("password_hash_seconds", "bcrypt", buckets=(0.1, 0.5))
+    for _ in range(4):
+        repository.labels("Repo.get_by_id").observe(0.05)
+    repository.labels("Repo.create").observe(0.05)
+    before = registry.exposition()
+    for _ in range(5):
+        repository.labels("Repo.get_by_id").observe(0.0005)
+        repository.labels("Repo.get_by_id").observe(0.005)
+    bcrypt.observe(0.3)
+    after = registry.exposition()
+
+    stages = stage_quantiles(before, after)
+
+    # Stage order, and Repo.create is left out: it saw no calls during the run
+    assert [(stage.stage, stage.series, stage.count) for stage in stages] == [
+        ("bcrypt", "", 1),
+        ("repository", "Repo.get_by_id", 10),
+    ]
+    assert stages[1].quantiles == pytest.approx({0.5: 0.001, 0.99: 0.00982, 0.999: 0.009982})
+    assert stages[0].quantiles[0.5] == pytest.approx(0.3)
@@ -0,0 +1,213 @@
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.controllers.http.app import HttpSettings, create_app
+from app.controllers.http.asgi import HttpApplication, Response, Router
+from app.controllers.http.testing import call_app, call_json, lifespan
+from app.exceptions.infrastructure import DatabaseConnectionError
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.infrastructures.databases.postgresql.user_versions import UserVersionFeed
+from app.infrastructures.security.claims import UserVersionMap
+
+PASSWORD = "C0mplex!Secret"
+
+@pytest.fixture
+def app():
+    repository = InMemoryUserRepository()
+
+    @asynccontextmanager
+    async def repository_scope():
+        yield repository
+
+    return create_app(repository_scope, UserVersionMap(), HttpSettings(max_body_bytes=1024))
+
+def error_code(response) -> int:
+    return json.loads(response.body)["code"]
+
+@pytest.mark.asyncio
+async def test_register_login_and_verify_token(app):
+    registered = await call_json(
+        app, "POST", "/v1/auth/register", {"email": "test@example.com", "password": PASSWORD}
+    )
+    assert registered.status == 201
+    user = json.loads(registered.body)
+    assert user["email"] == "test@example.com"
+
+    logged_in = await call_json(
+        app, "POST", "/v1/auth/login", {"email": "test@example.com", "password": PASSWORD}
+    )
+    assert logged_in.status == 200
+    token = json.loads(logged_in.body)["access_token"]
+
+    verified = await call_json(app, "GET", "/v1/auth/token", token=token)
+    assert verified.status == 200
+    assert json.loads(verified.body)["user_id"] == user["id"]
+
+    me = await call_json(app, "GET", "/v1/auth/me", token=token)
+    assert me.status == 200
+    assert json.loads(me.body) == {"id": user["id"], "email": "test@example.com", "is_active": True}
+
+class RepositoryFeed(UserVersionFeed):
+    """Feed reading the changed users of a shared in-memory repository."""
+
+    def __init__(self, repository: InMemoryUserRepository, versions: UserVersionMap) -> None:
+        super().__init__(None, versions)
+        self._repository = repository
+
+    async def _fetch(self, since):
+        rows = [
+            (user.id, user.version, user.is_active, user.deleted_at, user.updated_at)
+            for user in self._repository._users.values()
+            if user.updated_at is not None and user.updated_at > since
+        ]
+        return sorted(rows, key=lambda row: row[4])
+
+@pytest.mark.asyncio
+async def test_deactivation_by_another_worker_revokes_tokens():
+    repository = InMemoryUserRepository()
+
+    @asynccontextmanager
+    async def repository_scope():
+        yield repository
+
+    versions = UserVersionMap()
+    app = create_app(repository_scope, versions, HttpSettings())
+    registered = await call_json(
+        app, "POST", "/v1/auth/register", {"email": "test@example.com", "password": PASSWORD}
+    )
+    token = json.loads(registered.body)["token"]["access_token"]
+    assert (await call_json(app, "GET", "/v1/auth/token", token=token)).status == 200
+
+    # Another worker deactivates the user; this worker learns of it from the feed
+    user = await repository.get_by_email("test@example.com")
+    user.is_active = False
+    await repository.update(user)
+    await RepositoryFeed(repository, versions).poll()
+
+    rejected = await call_json(app, "GET", "/v1/auth/token", token=token)
+    assert rejected.status == 401
+    assert json.loads(rejected.body)["message"] == "Invalid access token: revoked"
+
+@pytest.mark.asyncio
+async def test_token_verification_does_not_need_the_database():
+    repository = InMemoryUserRepository()
+    database_up = True
+
+    @asynccontextmanager
+    async def repository_scope():
+        if not database_up:
+            raise DatabaseConnectionError(details={"circuit": "open", "retry_after": 5.0})
+        yield repository
+
+    app = create_app(repository_scope, UserVersionMap(), HttpSettings())
+    registered = await call_json(
+        app, "POST", "/v1/auth/register", {"email": "test@example.com", "password": PASSWORD}
+    )
+    token = json.loads(registered.body)["token"]["access_token"]
+
+    database_up = False
+    assert (await call_json(app, "GET", "/v1/auth/token", token=token)).status == 200
+    assert (await call_json(app, "GET", "/v1/auth/me", token=token)).status == 503
+
+@pytest.mark.asyncio
+async def test_register_duplicate_email_is_conflict(app):
+    payload = {"email": "test@example.com", "password": PASSWORD}
+    await call_json(app, "POST", "/v1/auth/register", payload)
+
+    response = await call_json(app, "POST", "/v1/auth/register", payload)
+
+    assert response.status == 409
+
+@pytest.mark.asyncio
+async def test_login_with_unknown_email_is_unauthorized(app):
+    response = await call_json(
+        app, "POST", "/v1/auth/login", {"email": "nobody@example.com", "password": PASSWORD}
+    )
+
+    assert response.status == 401
+    assert response.headers[b"www-authenticate"] == b"Bearer"
+
+@pytest.mark.asyncio
+async def test_malformed_json_is_bad_request(app):
+    response = await call_app(app, "POST", "/v1/auth/login", b"{not json")
+
+    assert response.status == 400
+
+@pytest.mark.asyncio
+async def test_invalid_payload_lists_field_errors(app):
+    response = await call_json(
+        app, "POST", "/v1/auth/register", {"email": "not-an-email", "password": PASSWORD}
+    )
+
+    assert response.status == 422
+    fields = [error["field"] for error in json.loads(response.body)["details"]["errors"]]
+    assert fields == ["email"]
+
+@pytest.mark.asyncio
+async def test_oversized_body_is_rejected(app):
+    response = await call_app(app, "POST", "/v1/auth/login", b"x" * 2048)
+
+    assert response.status == 413
+
+@pytest.mark.asyncio
+async def test_unknown_route_and_method(app):
+    assert (await call_app(app, "GET", "/missing")).status == 404
+    assert (await call_app(app, "DELETE", "/v1/auth/login")).status == 405
+
+@pytest.mark.asyncio
+async def test_token_endpoint_requires_valid_bearer_token(app):
+    missing = await call_json(app, "GET", "/v1/auth/token")
+    invalid = await call_json(app, "GET", "/v1/auth/token", token="not-a-token")
+
+    assert missing.status == 401
+    assert invalid.status == 401
+    assert error_code(missing) != error_code(invalid)
+
+@pytest.mark.asyncio
+async def test_unhandled_error_is_internal_server_error():
+    async def broken(request):
+        raise RuntimeError("boom")
+
+    router = Router()
+    router.add("GET", "/broken", broken)
+
+    response = await call_app(HttpApplication(router), "GET", "/broken")
+
+    assert response.status == 500
+    assert b"boom" not in response.body
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_startup_and_shutdown_hooks():
+    events = []
+
+    async def startup():
+        events.append("startup")
+
+    async def shutdown():
+        events.append("shutdown")
+
+    async def health(request):
+        return Response.json({"events": events})
+
+    router = Router()
+    router.add("GET", "/health", health)
+    app = HttpApplication(router, on_startup=[startup], on_shutdown=[shutdown])
+
+    async with lifespan(app):
+        response = await call_app(app, "GET", "/health")
+        assert json.loads(response.body) == {"events": ["startup"]}
+
+    assert events == ["startup", "shutdown"]
+
+@pytest.mark.asyncio
+async def test_failed_startup_is_reported():
+    async def startup():
+        raise ConnectionError("database unavailable")
+
+    app = HttpApplication(Router(), on_startup=[startup])
+
+    with pytest.raises(RuntimeError, match="database unavailable"):
+        async with lifespan(app):
+            pass
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from app.controllers.http.asgi import Response
+from app.exceptions.base import AppException, ErrorSeverity, registered_exceptions
+from app.exceptions.infrastructure import DatabaseConnectionError, InfrastructureException
+from app.exceptions.repository import DuplicateEmailError
+from app.exceptions.service import InvalidCredentialsError, InvalidTokenError
+
+def test_codes_are_derived_once_per_class():
+    assert DatabaseConnectionError.code == "5030001001"
+    assert DuplicateEmailError.code == "4099902001"
+    assert InvalidTokenError.code == "4019904003"
+    assert DatabaseConnectionError().code is DatabaseConnectionError.code
+    assert registered_exceptions()["4019904002"] is InvalidCredentialsError
+
+def test_duplicate_sequence_in_a_layer_fails_at_class_definition():
+    with pytest.raises(ValueError, match="already used by .*DatabaseConnectionError"):
+        class ShadowError(InfrastructureException):
+            _http_status = 500
+            _severity = ErrorSeverity.CRITICAL
+            _sequence = 1
+
+def test_incomplete_declaration_fails_at_class_definition():
+    with pytest.raises(ValueError, match="must declare"):
+        class LayerlessError(AppException):
+            _http_status = 500
+            _severity = ErrorSeverity.CRITICAL
+            _sequence = 1
+
+def test_subclasses_of_concrete_errors_share_their_code():
+    class Conflict(DuplicateEmailError):
+        pass
+
+    assert Conflict().code == DuplicateEmailError.code
+
+@pytest.mark.parametrize("make_error", [
+    InvalidCredentialsError,
+    lambda: InvalidTokenError("expired"),
+    DuplicateEmailError,
+])
+def test_expected_errors_reuse_prebuilt_bodies(make_error):
+    error = make_error()
+
+    assert error.prebuilt_body is not None
+    assert error.prebuilt_body is make_error().prebuilt_body
+    assert Response.error(error).body is error.prebuilt_body
+    assert json.loads(error.prebuilt_body) == error.to_dict()
+
+def test_errors_with_details_or_other_severities_are_serialized_per_instance():
+    assert DuplicateEmailError(details={"email": "a@example.com"}).prebuilt_body is None
+    assert InvalidTokenError("unknown").prebuilt_body is None
+    assert DatabaseConnectionError().prebuilt_body is None
+
+    response = Response.error(DuplicateEmailError(details={"email": "a@example.com"}))
+    assert json.loads(response.body)["details"] == {"email": "a@example.com"}
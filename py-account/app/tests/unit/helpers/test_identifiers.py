@@ -0,0 +1,46 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from app.helpers.identifiers import uuid7, uuid7_at, uuid7_range, uuid7_timestamp
+
+def test_uuid7_layout():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    # Behaves like any other UUID
+    assert UUID(str(value)) == value
+    assert hash(UUID(str(value))) == hash(value)
+
+def test_uuid7_is_strictly_increasing():
+    values = [uuid7() for _ in range(20000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+def test_uuid7_timestamp_round_trip():
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    created_at = uuid7_timestamp(uuid7())
+    after = datetime.now(timezone.utc) + timedelta(milliseconds=1)
+    assert before <= created_at <= after
+
+    moment = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+    assert uuid7_timestamp(uuid7_at(moment, 12345)) == moment
+
+def test_uuid7_timestamp_rejects_other_versions():
+    with pytest.raises(ValueError):
+        uuid7_timestamp(uuid4())
+
+def test_uuid7_range_bounds():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    lower, upper = uuid7_range(start, end)
+
+    assert lower <= uuid7_at(start, 0) <= upper
+    assert lower <= uuid7_at(end, (1 << 74) - 1) <= upper
+    assert uuid7_at(start - timedelta(milliseconds=1), (1 << 74) - 1) < lower
+    assert uuid7_at(end + timedelta(milliseconds=1), 0) > upper
+
+    with pytest.raises(ValueError):
+        uuid7_range(end, start)
+    with pytest.raises(ValueError):
+        uuid7_range(datetime(2024, 1, 1), end)
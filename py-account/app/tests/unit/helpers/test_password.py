@@ -0,0 +1,47 @@
+import pytest
+from pydantic import ValidationError
+
+from app.helpers.password import validate_password_not_breached
+from app.infrastructures.security.breach_filter import (
+    BreachFilterBuilder,
+    get_breach_filter,
+    get_breach_filter_settings,
+)
+from app.schemas.auth import RegisterRequest
+
+BREACHED_PASSWORD = "Passw0rd!"
+
+@pytest.fixture
+def breach_filter_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "breached.bloom")
+    with BreachFilterBuilder(path, capacity=100) as builder:
+        builder.add(BREACHED_PASSWORD)
+    monkeypatch.setenv("BREACH_FILTER_PATH", path)
+    get_breach_filter_settings.cache_clear()
+    get_breach_filter.cache_clear()
+    yield path
+    breach_filter = get_breach_filter()
+    if breach_filter is not None:
+        breach_filter.close()
+    get_breach_filter_settings.cache_clear()
+    get_breach_filter.cache_clear()
+
+def test_breached_password_is_rejected(breach_filter_path):
+    is_valid, error = validate_password_not_breached(BREACHED_PASSWORD)
+
+    assert not is_valid
+    assert "breach" in error
+
+def test_unknown_password_is_accepted(breach_filter_path):
+    assert validate_password_not_breached("C0mplex!Unbreached") == (True, None)
+
+def test_register_request_rejects_breached_password(breach_filter_path):
+    with pytest.raises(ValidationError, match="breach"):
+        RegisterRequest(email="test@example.com", password=BREACHED_PASSWORD)
+
+def test_screening_is_off_without_filter(monkeypatch):
+    monkeypatch.delenv("BREACH_FILTER_PATH", raising=False)
+    get_breach_filter_settings.cache_clear()
+    get_breach_filter.cache_clear()
+
+    assert validate_password_not_breached(BREACHED_PASSWORD) == (True, None)
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.exceptions.repository import DuplicateEmailError
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.repository.models.base import OptimisticLockException
+from app.repository.models.user import User
+
+def make_user(email: str = "test@example.com") -> User:
+    return User.create(email=email, hashed_password="hashed123")
+
+@pytest.mark.asyncio
+async def test_create_and_lookup():
+    repository = InMemoryUserRepository()
+    user = await repository.create(make_user())
+
+    by_id = await repository.get_by_id(str(user.id))
+    by_email = await repository.get_by_email("test@example.com")
+
+    assert by_id is not None and by_id.id == user.id
+    assert by_email is not None and by_email.id == user.id
+    assert await repository.get_by_id("not-a-uuid") is None
+    assert await repository.get_by_email("missing@example.com") is None
+
+@pytest.mark.asyncio
+async def test_returned_users_are_copies():
+    repository = InMemoryUserRepository()
+    user = await repository.create(make_user())
+
+    fetched = await repository.get_by_id(str(user.id))
+    fetched.is_active = False
+
+    stored = await repository.get_by_id(str(user.id))
+    assert stored.is_active is True
+
+@pytest.mark.asyncio
+async def test_email_must_be_unique():
+    repository = InMemoryUserRepository()
+    await repository.create(make_user())
+
+    with pytest.raises(DuplicateEmailError):
+        await repository.create(make_user())
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_with_same_email():
+    repository = InMemoryUserRepository()
+
+    results = await asyncio.gather(
+        *(repository.create(make_user()) for _ in range(10)),
+        return_exceptions=True
+    )
+
+    assert sum(isinstance(result, User) for result in results) == 1
+    assert sum(isinstance(result, DuplicateEmailError) for result in results) == 9
+
+@pytest.mark.asyncio
+async def test_update_verifies_and_bumps_version():
+    repository = InMemoryUserRepository()
+    user = await repository.create(make_user())
+
+    first = await repository.get_by_id(str(user.id))
+    second = await repository.get_by_id(str(user.id))
+
+    first.email = "changed@example.com"
+    updated = await repository.update(first)
+    assert updated.version != user.version
+    assert await repository.get_by_email("test@example.com") is None
+    assert (await repository.get_by_email("changed@example.com")).id == user.id
+
+    # Second copy still carries the old version
+    with pytest.raises(OptimisticLockException):
+        await repository.update(second)
+
+@pytest.mark.asyncio
+async def test_update_rejects_taken_email():
+    repository = InMemoryUserRepository()
+    await repository.create(make_user("taken@example.com"))
+    user = await repository.create(make_user())
+
+    user.email = "taken@example.com"
+    with pytest.raises(DuplicateEmailError):
+        await repository.update(user)
+
+@pytest.mark.asyncio
+async def test_delete_is_soft():
+    repository = InMemoryUserRepository()
+    user = await repository.create(make_user())
+
+    assert await repository.delete(str(user.id)) is True
+    assert await repository.delete(str(user.id)) is False
+    assert await repository.get_by_id(str(user.id)) is None
+    assert await repository.get_by_email("test@example.com") is None
+
+    # Soft-deleted users keep their email reserved
+    with pytest.raises(DuplicateEmailError):
+        await repository.create(make_user())
+
+    with pytest.raises(ValueError):
+        await repository.update(user)
@@ -0,0 +1,169 @@
+from contextlib import asynccontextmanager
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.infrastructures.databases.postgresql.repositories.user import PostgresUserRepository
+from app.infrastructures.databases.postgresql.sharding.repository import ShardedUserRepository
+from app.infrastructures.databases.postgresql.sharding.ring import ConsistentHashRing
+from app.infrastructures.databases.postgresql.sharding.router import ShardRouter
+from app.repository.models.user import User
+
+class FakeShardDatabase:
+    """Shard whose sessions are its name; the repository factory maps them to storage."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    @asynccontextmanager
+    async def get_session(self):
+        yield self.name
+
+class FakeDirectory:
+    def __init__(self) -> None:
+        self.released = []
+
+    async def release(self, email: str, user_id) -> None:
+        self.released.append(email)
+
+class ReshardingShard:
+    """Shard storage where a reshard batch moves the user right before an update or
+    delete reaches it, after the sharded repository has located the user there."""
+
+    def __init__(self, source, target, error) -> None:
+        self._source = source
+        self._target = target
+        self._error = error
+        self.moves = 0
+
+    def __getattr__(self, name):
+        return getattr(self._source, name)
+
+    async def _move(self, user_id) -> None:
+        user = await self._source.get_by_id(str(user_id))
+        if user is not None:
+            await self._target.create(user)
+            await self._source.delete(str(user_id))
+            self.moves += 1
+
+    async def update(self, user: User) -> User:
+        await self._move(user.id)
+        if self._error is StaleDataError:
+            # A shard repository without row locks fails on flush instead
+            raise StaleDataError("UPDATE statement on table 'users' expected to update 1 row")
+        return await self._source.update(user)
+
+    async def delete(self, user_id: str) -> bool:
+        await self._move(user_id)
+        return await self._source.delete(user_id)
+
+def _resharding_repository(error):
+    shards = {"a": InMemoryUserRepository(), "b": InMemoryUserRepository()}
+    moving = ReshardingShard(shards["a"], shards["b"], error)
+    router = ShardRouter(
+        {name: FakeShardDatabase(name) for name in shards},
+        ring=ConsistentHashRing(["b"]),
+        previous_ring=ConsistentHashRing(["a"]),
+    )
+    repository = ShardedUserRepository(
+        router, FakeDirectory(),
+        repository_factory=lambda shard: moving if shard == "a" else shards[shard],
+    )
+    return repository, shards, moving
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [ValueError, StaleDataError])
+async def test_update_follows_a_user_moved_by_a_reshard_batch(error):
+    repository, shards, moving = _resharding_repository(error)
+    user = await shards["a"].create(User.create(email="test@example.com", hashed_password="x"))
+
+    user.is_active = False
+    updated = await repository.update(user)
+
+    assert moving.moves == 1
+    assert updated.is_active is False
+    assert (await shards["b"].get_by_id(str(user.id))).is_active is False
+    assert await shards["a"].get_by_id(str(user.id)) is None
+
+@pytest.mark.asyncio
+async def test_update_of_a_missing_user_still_fails():
+    repository, _, _ = _resharding_repository(ValueError)
+
+    with pytest.raises(ValueError):
+        await repository.update(User.create(email="test@example.com", hashed_password="x"))
+
+@pytest.mark.asyncio
+async def test_delete_follows_a_user_moved_by_a_reshard_batch():
+    repository, shards, moving = _resharding_repository(ValueError)
+    user = await shards["a"].create(User.create(email="test@example.com", hashed_password="x"))
+
+    assert await repository.delete(str(user.id)) is True
+
+    assert moving.moves == 1
+    assert await shards["b"].get_by_id(str(user.id)) is None
+    # Soft-deleted users keep their email reserved
+    assert repository._directory.released == []
+
+class FakeShardSession:
+    """Session over a dict of rows; its first commit can run a reshard batch and fail."""
+
+    def __init__(self, rows) -> None:
+        self.rows = rows
+        self.info = {}
+        self.before_commit = None
+        self._merged = None
+
+    async def merge(self, model: UserModel) -> UserModel:
+        self._merged = model
+        return model
+
+    async def commit(self) -> None:
+        if self.before_commit is not None:
+            move, self.before_commit = self.before_commit, None
+            move()
+            raise StaleDataError("UPDATE statement on table 'users' expected to update 1 row")
+        self.rows[self._merged.id] = self._merged
+
+class DictShardRepository(PostgresUserRepository):
+    """The real update path, with the two row loads served from the session's dict."""
+
+    async def get_by_id(self, user_id: str):
+        row = self._session.rows.get(UUID(user_id))
+        return row.to_domain() if row else None
+
+    async def _load_for_update(self, user_id):
+        return self._session.rows.get(user_id)
+
+@pytest.mark.asyncio
+async def test_stale_update_is_retried_with_the_version_the_caller_read():
+    user = User.create(email="test@example.com", hashed_password="x")
+    sessions = {"a": FakeShardSession({user.id: UserModel.from_domain(user)}),
+                "b": FakeShardSession({})}
+
+    def reshard_batch() -> None:
+        sessions["b"].rows[user.id] = sessions["a"].rows.pop(user.id)
+
+    sessions["a"].before_commit = reshard_batch
+    router = ShardRouter(
+        {name: FakeShardDatabase(name) for name in sessions},
+        ring=ConsistentHashRing(["b"]),
+        previous_ring=ConsistentHashRing(["a"]),
+    )
+    repository = ShardedUserRepository(
+        router, FakeDirectory(), repository_factory=lambda shard: DictShardRepository(
+            sessions[shard]
+        ),
+    )
+
+    read_version = user.version
+    user.is_active = False
+    updated = await repository.update(user)
+
+    assert updated.is_active is False
+    assert updated.version != read_version
+    stored = sessions["b"].rows[user.id]
+    assert stored.is_active is False
+    assert stored.version == updated.version
@@ -0,0 +1,57 @@
+import pytest
+from uuid import uuid4
+
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.sharding.ring import ConsistentHashRing
+from app.infrastructures.databases.postgresql.sharding.router import ShardRouter
+
+USER_IDS = [uuid4() for _ in range(20000)]
+
+def test_ring_spreads_users_evenly():
+    ring = ConsistentHashRing(["a", "b", "c", "d"])
+    counts = ring.distribution(USER_IDS)
+
+    assert sum(counts.values()) == len(USER_IDS)
+    for count in counts.values():
+        assert count == pytest.approx(len(USER_IDS) / 4, rel=0.15)
+
+def test_ring_is_deterministic():
+    first = ConsistentHashRing(["a", "b", "c"])
+    second = ConsistentHashRing(["c", "a", "b"])
+    assert all(first.shard_for(user_id) == second.shard_for(user_id) for user_id in USER_IDS)
+
+def test_adding_a_shard_moves_only_its_share():
+    before = ConsistentHashRing(["a", "b", "c", "d"])
+    after = ConsistentHashRing(["a", "b", "c", "d", "e"])
+
+    moved = [user_id for user_id in USER_IDS if before.shard_for(user_id) != after.shard_for(user_id)]
+
+    assert len(moved) == pytest.approx(len(USER_IDS) / 5, rel=0.2)
+    assert all(after.shard_for(user_id) == "e" for user_id in moved)
+
+def test_ring_rejects_invalid_shards():
+    with pytest.raises(ValueError):
+        ConsistentHashRing([])
+    with pytest.raises(ValueError):
+        ConsistentHashRing(["a", "a"])
+
+def test_router_candidates_while_resharding():
+    databases = {name: Database(f"postgresql+asyncpg://localhost/{name}") for name in "abc"}
+    previous = ConsistentHashRing(["a", "b"])
+    ring = ConsistentHashRing(["a", "b", "c"])
+    router = ShardRouter(databases, ring=ring, previous_ring=previous)
+
+    for user_id in USER_IDS[:1000]:
+        candidates = router.candidates(user_id)
+        assert candidates[0] == ring.shard_for(user_id)
+        assert candidates[-1] == previous.shard_for(user_id)
+        assert len(candidates) == len(set(candidates))
+
+    assert ShardRouter(databases, ring=ring).candidates(USER_IDS[0]) == [ring.shard_for(USER_IDS[0])]
+
+def test_router_requires_database_for_every_shard():
+    with pytest.raises(ValueError):
+        ShardRouter(
+            {"a": Database("postgresql+asyncpg://localhost/a")},
+            ring=ConsistentHashRing(["a", "b"])
+        )
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+
+from app.helpers.identifiers import uuid7
+from app.infrastructures.databases.postgresql.activity import ActivityTracker
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.repository.models.user import User
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class RecordingTracker(ActivityTracker):
+    """Tracker that records written batches instead of writing them."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(None, **kwargs)
+        self.batches: List[list] = []
+        self.failures = 0
+
+    async def _write(self, rows) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(rows))
+
+def test_activity_is_coalesced_per_user():
+    tracker = RecordingTracker()
+    user_id = uuid7()
+
+    tracker.record_seen(user_id, at=T0 + timedelta(seconds=5))
+    tracker.record_login(user_id, at=T0)
+    tracker.record_seen(user_id, at=T0 + timedelta(seconds=2))
+
+    assert tracker.pending == 1
+    assert tracker.stats.recorded == 3
+    assert tracker.stats.coalesced == 2
+
+@pytest.mark.asyncio
+async def test_flush_writes_latest_timestamps_in_id_order_and_batches():
+    tracker = RecordingTracker(batch_size=2)
+    user_ids = [uuid7() for _ in range(3)]
+    for user_id in reversed(user_ids):
+        tracker.record_seen(user_id, at=T0)
+    tracker.record_login(user_ids[0], at=T0 + timedelta(seconds=1))
+
+    await tracker.flush()
+
+    rows = [row for batch in tracker.batches for row in batch]
+    assert [len(batch) for batch in tracker.batches] == [2, 1]
+    assert [row[0] for row in rows] == user_ids
+    assert rows[0] == (user_ids[0], T0 + timedelta(seconds=1), T0 + timedelta(seconds=1))
+    assert rows[1] == (user_ids[1], None, T0)
+    assert tracker.pending == 0
+    assert tracker.stats.written == 3
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_entries_and_staleness_grows():
+    clock = FakeClock()
+    tracker = RecordingTracker(clock=clock)
+    user_id = uuid7()
+    tracker.record_seen(user_id, at=T0)
+    tracker.failures = 1
+
+    clock.now += 3
+    with pytest.raises(ConnectionError):
+        await tracker.flush()
+
+    assert tracker.pending == 1
+    assert tracker.staleness_seconds == 3
+    tracker.record_seen(user_id, at=T0 + timedelta(seconds=9))
+    await tracker.flush()
+
+    assert tracker.batches == [[(user_id, None, T0 + timedelta(seconds=9))]]
+    assert tracker.staleness_seconds == 0
+    assert tracker.stats.failed_flushes == 1
+
+def test_activity_of_new_users_is_dropped_when_full():
+    tracker = RecordingTracker(max_pending=1)
+    known = uuid7()
+    tracker.record_seen(known)
+
+    tracker.record_seen(uuid7())
+    tracker.record_seen(known)
+
+    assert tracker.pending == 1
+    assert tracker.stats.dropped == 1
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_activity():
+    tracker = RecordingTracker(flush_interval=60)
+
+    async with tracker:
+        tracker.record_login(uuid7())
+        await asyncio.sleep(0)
+
+    assert len(tracker.batches) == 1
+
+def test_updates_never_write_activity_columns():
+    user = User.create(email="test@example.com", hashed_password="hashed")
+    user.last_login_at = T0
+
+    model = UserModel.from_domain(user)
+
+    assert "last_login_at" not in vars(model)
+    assert "last_seen_at" not in vars(model)
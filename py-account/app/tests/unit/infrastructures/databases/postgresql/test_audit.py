@@ -0,0 +1,145 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from app.infrastructures.databases.postgresql.audit import (
+    REDACTED,
+    AuditAction,
+    AuditEvent,
+    AuditMode,
+    AuditWriter,
+    diff_entities,
+)
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.models.audit import AuditLogModel
+from app.repository.models.user import User
+
+class RecordingWriter(AuditWriter):
+    """Async writer that records flushed batches instead of writing them."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(Database("postgresql+asyncpg://localhost/unused"), **kwargs)
+        self.batches: List[List[AuditEvent]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def _flush(self, batch: List[AuditEvent]) -> None:
+        await self.release.wait()
+        self.batches.append(list(batch))
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.added = []
+
+    def add(self, instance) -> None:
+        self.added.append(instance)
+
+def _event(user: User) -> AuditEvent:
+    return AuditEvent.capture(AuditAction.CREATE, None, user)
+
+def test_diff_records_changed_fields_and_redacts_secrets():
+    before = User.create(email="old@example.com", hashed_password="old-hash")
+    after = User(
+        id=before.id,
+        email="new@example.com",
+        hashed_password="new-hash",
+        is_active=False,
+        created_at=before.created_at,
+    )
+    after.update_version()
+
+    changes = diff_entities(before, after)
+
+    assert changes == {
+        "email": ["old@example.com", "new@example.com"],
+        "hashed_password": [REDACTED, REDACTED],
+        "is_active": [True, False],
+    }
+
+def test_capture_delete_keeps_previous_values():
+    user = User.create(email="test@example.com", hashed_password="hashed")
+
+    event = AuditEvent.capture(AuditAction.DELETE, user, None)
+
+    assert event.entity_type == "user"
+    assert event.entity_id == user.id
+    assert event.version is None
+    assert event.changes["email"] == ["test@example.com", None]
+    assert event.changes["id"] == [str(user.id), None]
+
+@pytest.mark.asyncio
+async def test_in_transaction_mode_stages_row_on_session():
+    writer = AuditWriter(mode=AuditMode.IN_TRANSACTION)
+    session = FakeSession()
+    event = _event(User.create(email="test@example.com", hashed_password="hashed"))
+
+    writer.stage(session, event)
+    await writer.publish(event)
+
+    assert len(session.added) == 1
+    assert isinstance(session.added[0], AuditLogModel)
+    assert session.added[0].entity_id == event.entity_id
+    assert writer.stats.staged == 1
+    assert writer.stats.enqueued == 0
+
+def test_async_mode_requires_database():
+    with pytest.raises(ValueError):
+        AuditWriter(mode=AuditMode.ASYNC)
+
+@pytest.mark.asyncio
+async def test_async_mode_flushes_in_batches():
+    writer = RecordingWriter(batch_size=2, max_queue_size=10, flush_interval=0)
+    events = [
+        _event(User.create(email=f"user{i}@example.com", hashed_password="hashed"))
+        for i in range(5)
+    ]
+
+    async with writer:
+        for event in events:
+            await writer.publish(event)
+
+    assert [len(batch) for batch in writer.batches] == [2, 2, 1]
+    assert [event for batch in writer.batches for event in batch] == events
+    assert writer.stats.written == 5
+    assert writer.stats.flushes == 3
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_after_block_timeout():
+    writer = RecordingWriter(batch_size=1, max_queue_size=1, block_timeout=0.01)
+    writer.release.clear()
+    user = User.create(email="test@example.com", hashed_password="hashed")
+
+    await writer.start()
+    await writer.publish(_event(user))  # Taken by the flusher, which is stalled
+    await asyncio.sleep(0)
+    await writer.publish(_event(user))  # Fills the queue
+    await writer.publish(_event(user))  # Dropped
+
+    assert writer.stats.enqueued == 2
+    assert writer.stats.blocked_publishes == 1
+    assert writer.stats.dropped == 1
+    assert writer.stats.blocked_seconds > 0
+
+    writer.release.set()
+    await writer.stop()
+    assert writer.stats.written == 2
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried():
+    class FlakyWriter(RecordingWriter):
+        failures = 1
+
+        async def _flush(self, batch: List[AuditEvent]) -> None:
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("database unavailable")
+            await super()._flush(batch)
+
+    writer = FlakyWriter(flush_interval=0, retry_delay=0)
+    async with writer:
+        await writer.publish(_event(User.create(email="test@example.com", hashed_password="h")))
+
+    assert writer.stats.failed_flushes == 1
+    assert writer.stats.written == 1
+    assert writer.stats.lost == 0
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructures.databases.postgresql.export import (
+    EXPORT_TABLES,
+    WatermarkState,
+    build_query,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+T1 = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+def test_secrets_are_never_exported():
+    users = EXPORT_TABLES["users"]
+
+    names = [column.name for column in users.columns]
+
+    assert "hashed_password" not in names
+    assert "hashed_password" not in _sql(build_query(users, None, None))
+    assert {"id", "email", "last_login_at"} <= set(names)
+
+def test_incremental_query_bounds_the_change_timestamp():
+    sql = _sql(build_query(EXPORT_TABLES["users"], T0, T1))
+
+    assert "coalesce(users.updated_at, users.created_at) >" in sql
+    assert "coalesce(users.updated_at, users.created_at) <=" in sql
+
+def test_full_query_has_no_bounds():
+    assert "WHERE" not in _sql(build_query(EXPORT_TABLES["users"], None, None))
+
+def test_watermarks_survive_a_reload(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = WatermarkState(path)
+    assert state.get("users") is None
+
+    state.set("users", T0)
+
+    assert WatermarkState(path).get("users") == T0
+    assert not (tmp_path / "state.json.tmp").exists()
+
+def test_arrow_schema_maps_every_exported_column():
+    pytest.importorskip("pyarrow")
+    from app.infrastructures.databases.postgresql.export import arrow_schema
+
+    schema = arrow_schema(EXPORT_TABLES["users"])
+
+    assert schema.names == [column.name for column in EXPORT_TABLES["users"].columns]
+    assert str(schema.field("created_at").type) == "timestamp[us, tz=UTC]"
@@ -0,0 +1,76 @@
+import pytest
+
+from app.infrastructures.databases.postgresql.repositories.fast_user import (
+    FastPathUserRepository,
+)
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.repository.models.user import User
+
+class FakeResult:
+    def __init__(self, rows) -> None:
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+class FakeConnection:
+    """Records the driver-level statements of the session's connection."""
+
+    def __init__(self, rows) -> None:
+        self.rows = rows
+        self.executed = []
+
+    async def exec_driver_sql(self, statement, parameters):
+        self.executed.append((statement, parameters))
+        return FakeResult(self.rows)
+
+class FakeSession:
+    def __init__(self, rows=()) -> None:
+        self.autoflush = True
+        self.info = {}
+        self.new, self.dirty, self.deleted = set(), (), ()
+        self.flushes = 0
+        self.bound = FakeConnection(list(rows))
+
+    async def flush(self) -> None:
+        self.flushes += 1
+        self.new = set()
+
+    async def connection(self) -> FakeConnection:
+        return self.bound
+
+def _row(user: User) -> dict:
+    return {
+        column.name: getattr(UserModel.from_domain(user), column.name)
+        for column in UserModel.__table__.columns
+    }
+
+@pytest.mark.asyncio
+async def test_lookups_run_on_the_sessions_connection():
+    user = User.create(email="test@example.com", hashed_password="hashed")
+    session = FakeSession([_row(user)])
+    repository = FastPathUserRepository(session)
+
+    found = await repository.get_by_email("test@example.com")
+    many = await repository.get_many_by_ids([str(user.id), "not-a-uuid"])
+
+    assert found.id == user.id and found.version == user.version
+    assert list(many) == [str(user.id)]
+    (by_email, by_email_args), (by_ids, by_ids_args) = session.bound.executed
+    assert "deleted_at IS NULL" in by_email and by_email_args == ("test@example.com",)
+    assert by_ids_args == ([user.id],)
+
+@pytest.mark.asyncio
+async def test_pending_orm_changes_are_flushed_before_a_lookup():
+    session = FakeSession()
+    session.new = {UserModel.from_domain(User.create(email="a@example.com", hashed_password="x"))}
+
+    assert await FastPathUserRepository(session).get_by_email("a@example.com") is None
+
+    assert session.flushes == 1
@@ -0,0 +1,158 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.infrastructures.databases.postgresql import instrumentation as instrumentation_module
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.instrumentation import (
+    InstrumentationSettings,
+    QueryInstrumentation,
+    UNTAGGED_OPERATION,
+    current_operation,
+    tag_queries,
+)
+from app.infrastructures.metrics import MetricsRegistry
+
+class ExplainConnection:
+    """Connection the slow query hook must not run statements on."""
+
+    def __init__(self) -> None:
+        self.info = {}
+        self.executed = []
+
+    async def exec_driver_sql(self, statement, parameters):
+        self.executed.append((statement, parameters))
+        return [("Seq Scan on users",)]
+
+    async def rollback(self) -> None:
+        pass
+
+class RecordingInstrumentation(QueryInstrumentation):
+    """Instrumentation explaining on a fake connection instead of the engine."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(slow_query_threshold_ms=100, registry=MetricsRegistry(), **kwargs)
+        self.explain_connection = ExplainConnection()
+
+    @asynccontextmanager
+    async def _connect(self):
+        yield self.explain_connection
+
+def _run_slow_statement(instrumentation, conn, statement, parameters=()):
+    conn.info[instrumentation_module._START_TIMES_KEY] = [time.perf_counter() - 1]
+    instrumentation._after_cursor_execute(conn, None, statement, parameters, None, False)
+
+class FakeRepository:
+    @tag_queries
+    async def get_by_id(self) -> str:
+        return current_operation()
+
+@pytest.mark.asyncio
+async def test_tag_queries_skips_the_tag_until_instrumentation_is_attached(monkeypatch):
+    monkeypatch.setattr(instrumentation_module, "_operation_tags_enabled", False)
+
+    assert await FakeRepository().get_by_id() == UNTAGGED_OPERATION
+
+    Database("postgresql+asyncpg://localhost/test", instrumentation=QueryInstrumentation())
+    assert await FakeRepository().get_by_id() == "FakeRepository.get_by_id"
+
+@pytest.mark.asyncio
+async def test_tag_queries_sets_operation_for_call_only(monkeypatch):
+    monkeypatch.setattr(instrumentation_module, "_operation_tags_enabled", True)
+    assert current_operation() == UNTAGGED_OPERATION
+    assert await FakeRepository().get_by_id() == "FakeRepository.get_by_id"
+    assert current_operation() == UNTAGGED_OPERATION
+
+def test_record_builds_histogram_per_operation():
+    registry = MetricsRegistry()
+    instrumentation = QueryInstrumentation(registry=registry)
+    instrumentation.record("Repo.get_by_id", "SELECT 1", 0.7)
+    instrumentation.record("Repo.get_by_id", "SELECT 1", 30.0)
+    instrumentation.record("Repo.create", "INSERT", 9000.0)
+
+    snapshot = instrumentation.snapshot()["statements"]
+    get_by_id = snapshot["Repo.get_by_id"]
+    assert get_by_id["count"] == 2
+    assert get_by_id["sum"] == pytest.approx(30.7)
+    assert get_by_id["buckets"]["0.5"] == 0
+    assert get_by_id["buckets"]["1.0"] == 1
+    assert get_by_id["buckets"]["50.0"] == 2
+    assert snapshot["Repo.create"]["buckets"]["5000.0"] == 0
+    assert snapshot["Repo.create"]["buckets"]["+Inf"] == 1
+    exposition = registry.exposition()
+    assert 'db_statement_milliseconds_bucket{operation="Repo.get_by_id",le="1"} 1\n' in exposition
+    assert 'db_statement_milliseconds_count{operation="Repo.create"} 1\n' in exposition
+
+def test_unit_of_work_reports_repeated_statements(caplog):
+    instrumentation = QueryInstrumentation(n_plus_one_threshold=3, registry=MetricsRegistry())
+
+    with caplog.at_level(logging.WARNING):
+        with instrumentation.unit_of_work() as stats:
+            for _ in range(3):
+                instrumentation.record("Repo.get_by_id", "SELECT users", 1.0)
+            instrumentation.record("Repo.get_by_email", "SELECT email", 1.0)
+
+    assert stats.query_count == 4
+    assert "Possible N+1 pattern: Repo.get_by_id" in caplog.text
+    assert "Repo.get_by_email" not in caplog.text
+    assert instrumentation.snapshot()["queries_per_unit_of_work"]["count"] == 1
+
+def test_record_outside_unit_of_work_is_not_counted():
+    instrumentation = QueryInstrumentation()
+    with instrumentation.unit_of_work() as stats:
+        pass
+    instrumentation.record("Repo.get_by_id", "SELECT users", 1.0)
+    assert stats.query_count == 0
+
+def test_from_settings_is_opt_in():
+    assert QueryInstrumentation.from_settings(InstrumentationSettings()) is None
+
+    instrumentation = QueryInstrumentation.from_settings(
+        InstrumentationSettings(enabled=True, slow_query_threshold_ms=50)
+    )
+    assert instrumentation is not None
+    assert instrumentation.slow_query_threshold_ms == 50
+
+def test_database_attaches_instrumentation():
+    instrumentation = QueryInstrumentation()
+    database = Database("postgresql+asyncpg://localhost/test", instrumentation=instrumentation)
+
+    sync_engine = database._engine.sync_engine
+    assert database.instrumentation is instrumentation
+    assert event.contains(
+        sync_engine, "after_cursor_execute", instrumentation._after_cursor_execute
+    )
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_explained_off_the_cursor_hook(caplog):
+    instrumentation = RecordingInstrumentation()
+    Database("postgresql+asyncpg://localhost/test", instrumentation=instrumentation)
+    conn = ExplainConnection()
+
+    with caplog.at_level(logging.WARNING):
+        _run_slow_statement(instrumentation, conn, "SELECT * FROM users WHERE id = $1", (7,))
+        assert conn.executed == []
+        assert "Slow query in untagged" in caplog.text
+
+        await instrumentation._explain_task
+
+    assert instrumentation.explain_connection.executed == [
+        ("EXPLAIN SELECT * FROM users WHERE id = $1", (7,))
+    ]
+    assert "Seq Scan on users" in caplog.text
+    assert instrumentation.explain_connection.info[instrumentation_module._EXPLAINING_KEY] is False
+
+@pytest.mark.asyncio
+async def test_pending_explains_are_deduplicated_and_bounded():
+    instrumentation = RecordingInstrumentation(max_pending_explains=2)
+    conn = ExplainConnection()
+
+    for statement in ("SELECT 1", "SELECT 1", "COMMIT", "SELECT 2", "SELECT 3"):
+        _run_slow_statement(instrumentation, conn, statement)
+    plans = await instrumentation.explain_pending()
+
+    assert plans == {"SELECT 1": "Seq Scan on users", "SELECT 2": "Seq Scan on users"}
+    assert await instrumentation.explain_pending() == {}
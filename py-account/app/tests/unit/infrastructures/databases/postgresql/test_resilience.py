@@ -0,0 +1,260 @@
+import random
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.exceptions.infrastructure import DatabaseConnectionError, DatabaseQueryError
+from app.exceptions.repository import DuplicateEmailError
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.resilience import (
+    GUARD_KEY,
+    BreakerState,
+    CircuitBreaker,
+    DatabaseGuard,
+    RetryPolicy,
+    is_transient_error,
+    resilient,
+)
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class SqlStateError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+class FakeSession:
+    def __init__(self, guard: DatabaseGuard) -> None:
+        self.info = {GUARD_KEY: guard}
+        self.new = self.dirty = self.deleted = ()
+        self.rollbacks = 0
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+class Base(DeclarativeBase):
+    pass
+
+class Note(Base):
+    __tablename__ = "notes"
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+class WritingSession(FakeSession):
+    """Guarded session backed by a real ORM session on in-memory SQLite."""
+
+    def __init__(self, guard: DatabaseGuard) -> None:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.orm = Session(engine, info={GUARD_KEY: guard})
+        super().__init__(guard)
+        self.info = self.orm.info
+
+    async def rollback(self) -> None:
+        await super().rollback()
+        self.orm.rollback()
+
+class FlakyRepository:
+    """Fails its first calls with the given errors, then succeeds."""
+
+    def __init__(self, session: FakeSession, *errors: Exception) -> None:
+        self._session = session
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def _call(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "user"
+
+    @resilient(retry=True)
+    async def get(self) -> str:
+        return await self._call()
+
+    @resilient()
+    async def create(self) -> str:
+        return await self._call()
+
+def _guard(clock: FakeClock, attempts: int = 3, threshold: int = 3) -> DatabaseGuard:
+    return DatabaseGuard(
+        CircuitBreaker("test", failure_threshold=threshold, reset_timeout=5.0, clock=clock),
+        RetryPolicy(attempts=attempts, base_delay=0.0, rng=random.Random(0)),
+    )
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=5.0, clock=clock)
+
+    for _ in range(3):
+        breaker.acquire()
+        breaker.record_failure()
+
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(DatabaseConnectionError) as error:
+        breaker.acquire()
+    assert error.value.http_status == 503
+    assert error.value.details == {"circuit": "open", "retry_after": 5.0}
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, clock=FakeClock())
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.CLOSED
+
+def test_half_open_admits_limited_trials_and_closes_on_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=5.0, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 5.0
+    breaker.acquire()
+    assert breaker.state is BreakerState.HALF_OPEN
+    with pytest.raises(DatabaseConnectionError):
+        breaker.acquire()
+
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+
+def test_failed_trial_reopens_the_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=5.0, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 5.0
+    breaker.acquire()
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.OPEN
+    clock.now = 9.0
+    assert breaker.state is BreakerState.OPEN
+
+def test_released_trial_frees_its_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=5.0, clock=clock)
+    breaker.record_failure()
+    clock.now = 5.0
+
+    breaker.acquire()
+    breaker.release()
+
+    breaker.acquire()
+
+def test_retry_delays_are_jittered_within_the_exponential_bound():
+    policy = RetryPolicy(attempts=5, base_delay=0.1, max_delay=0.3, rng=random.Random(1))
+
+    delays = [policy.delay(retry) for retry in range(4) for _ in range(50)]
+
+    assert all(0.0 <= delay <= 0.3 for delay in delays)
+    assert len(set(delays)) == len(delays)
+    assert max(policy.delay(0) for _ in range(50)) <= 0.1
+
+@pytest.mark.parametrize("error, transient", [
+    (ConnectionRefusedError(), True),
+    (TimeoutError(), True),
+    (SqlStateError("08006"), True),
+    (SqlStateError("53300"), True),
+    (SqlStateError("57P03"), True),
+    (SqlStateError("23505"), False),
+    (ValueError("bad uuid"), False),
+])
+def test_transient_error_classification(error, transient):
+    assert is_transient_error(error) is transient
+
+@pytest.mark.asyncio
+async def test_reads_are_retried_after_transient_errors():
+    session = FakeSession(_guard(FakeClock()))
+    repository = FlakyRepository(session, ConnectionResetError(), ConnectionResetError())
+
+    assert await repository.get() == "user"
+    assert repository.calls == 3
+    assert session.rollbacks == 2
+
+@pytest.mark.asyncio
+async def test_writes_are_not_retried():
+    session = FakeSession(_guard(FakeClock()))
+    repository = FlakyRepository(session, ConnectionResetError())
+
+    with pytest.raises(DatabaseConnectionError) as error:
+        await repository.create()
+
+    assert repository.calls == 1
+    assert error.value.details["attempts"] == 1
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_without_calling_the_database():
+    guard = _guard(FakeClock(), attempts=1, threshold=2)
+    session = FakeSession(guard)
+    repository = FlakyRepository(session, ConnectionResetError(), ConnectionResetError())
+    for _ in range(2):
+        with pytest.raises(DatabaseConnectionError):
+            await repository.get()
+
+    with pytest.raises(DatabaseConnectionError) as error:
+        await repository.get()
+
+    assert repository.calls == 2
+    assert error.value.details["circuit"] == "open"
+
+@pytest.mark.asyncio
+async def test_statement_errors_do_not_trip_the_breaker():
+    guard = _guard(FakeClock(), threshold=1)
+    session = FakeSession(guard)
+    statement_error = DBAPIError("SELECT", {}, SqlStateError("42P01"))
+    repository = FlakyRepository(session, DuplicateEmailError(), statement_error)
+
+    with pytest.raises(DuplicateEmailError):
+        await repository.create()
+    with pytest.raises(DatabaseQueryError):
+        await repository.get()
+
+    assert repository.calls == 2
+    assert guard.breaker.state is BreakerState.CLOSED
+
+@pytest.mark.asyncio
+async def test_get_session_fails_fast_while_the_circuit_is_open():
+    guard = _guard(FakeClock(), threshold=1)
+    database = Database("postgresql+asyncpg://localhost/unused", guard=guard)
+    guard.breaker.record_failure()
+
+    with pytest.raises(DatabaseConnectionError):
+        async with database.get_session():
+            pass
+    await database.dispose()
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write", [
+    lambda orm: (orm.add(Note(id=1)), orm.flush()),
+    lambda orm: orm.execute(text("INSERT INTO notes (id) VALUES (1)")),
+])
+async def test_reads_are_not_retried_once_the_transaction_wrote(write):
+    session = WritingSession(_guard(FakeClock()))
+    repository = FlakyRepository(session, ConnectionResetError())
+    write(session.orm)
+
+    with pytest.raises(DatabaseConnectionError) as error:
+        await repository.get()
+
+    assert repository.calls == 1
+    assert error.value.details["attempts"] == 1
+    assert session.rollbacks == 0
+
+@pytest.mark.asyncio
+async def test_reads_are_retried_again_after_the_writing_transaction_ends():
+    session = WritingSession(_guard(FakeClock()))
+    session.orm.add(Note(id=1))
+    session.orm.commit()
+    session.orm.get(Note, 1)
+    repository = FlakyRepository(session, ConnectionResetError())
+
+    assert await repository.get() == "user"
+    assert repository.calls == 2
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.infrastructures.databases.postgresql.user_versions import UserVersionFeed
+from app.infrastructures.security.claims import AccessTokenClaims, UserVersionMap
+from app.repository.models.user import User
+
+class ScriptedFeed(UserVersionFeed):
+    """Feed reading from a list of rows instead of the users table."""
+
+    def __init__(self, versions: UserVersionMap, **kwargs) -> None:
+        super().__init__(None, versions, **kwargs)
+        self.rows = []
+        self.queries = []
+
+    async def _fetch(self, since):
+        self.queries.append(since)
+        rows = sorted((row for row in self.rows if row[4] > since), key=lambda row: row[4])
+        return rows[:self._batch_size]
+
+def _row(user: User, deleted: bool = False):
+    return (
+        user.id, user.version, user.is_active,
+        user.updated_at if deleted else None, user.updated_at,
+    )
+
+def _changed(user: User, **changes) -> User:
+    for name, value in changes.items():
+        setattr(user, name, value)
+    user.update_version()
+    return user
+
+@pytest.mark.asyncio
+async def test_poll_revokes_tokens_of_users_changed_by_other_processes():
+    versions = UserVersionMap(retention=timedelta(minutes=15))
+    feed = ScriptedFeed(versions)
+    deactivated = User.create(email="a@example.com", hashed_password="x")
+    deleted = User.create(email="b@example.com", hashed_password="x")
+    modified = User.create(email="c@example.com", hashed_password="x")
+    old_claims = [AccessTokenClaims.from_user(user) for user in (deactivated, deleted, modified)]
+
+    feed.rows = [
+        _row(_changed(deactivated, is_active=False)),
+        _row(_changed(deleted), deleted=True),
+        _row(_changed(modified, hashed_password="y")),
+    ]
+    assert await feed.poll() == 3
+
+    assert not any(versions.is_accepted(claims) for claims in old_claims)
+    assert versions.is_accepted(AccessTokenClaims.from_user(modified))
+
+@pytest.mark.asyncio
+async def test_polls_page_through_batches_and_overlap_by_the_lag():
+    versions = UserVersionMap(retention=timedelta(minutes=15))
+    feed = ScriptedFeed(versions, batch_size=2, lag=5.0)
+    users = [_changed(User.create(email=f"{i}@example.com", hashed_password="x")) for i in range(5)]
+    feed.rows = [_row(user) for user in users]
+
+    assert await feed.poll() == 5
+    assert len(feed.queries) == 3
+    first_since = feed.queries[0]
+    assert datetime.now(timezone.utc) - first_since >= timedelta(minutes=15)
+
+    # The next poll re-reads the last lag seconds, which the map ignores
+    await feed.poll()
+    assert feed.queries[3] == users[-1].updated_at - timedelta(seconds=5)
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        UserVersionFeed(None, UserVersionMap(retention=timedelta(minutes=1)), batch_size=0)
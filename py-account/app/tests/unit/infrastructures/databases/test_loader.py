@@ -0,0 +1,103 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from app.infrastructures.databases.loader import BatchLoader, BatchStats, CoalescingUserRepository
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.repository.models.user import User
+
+class CountingRepository(InMemoryUserRepository):
+    def __init__(self, users: List[User]) -> None:
+        super().__init__(users)
+        self.batches: List[List[str]] = []
+
+    async def get_many_by_ids(self, user_ids):
+        self.batches.append(list(user_ids))
+        return await super().get_many_by_ids(user_ids)
+
+    async def get_many_by_emails(self, emails):
+        self.batches.append(list(emails))
+        return await super().get_many_by_emails(emails)
+
+def make_users(count: int) -> List[User]:
+    return [User.create(email=f"user{n}@example.com", hashed_password="hashed") for n in range(count)]
+
+@pytest.mark.asyncio
+async def test_loads_in_same_tick_are_coalesced_and_deduplicated():
+    calls: List[List[int]] = []
+
+    async def batch(keys: List[int]) -> Dict[int, str]:
+        calls.append(keys)
+        return {key: f"value{key}" for key in keys if key != 3}
+
+    loader = BatchLoader(batch)
+    results = await asyncio.gather(*(loader.load(key) for key in [1, 2, 1, 3, 2]))
+
+    assert results == ["value1", "value2", "value1", None, "value2"]
+    assert calls == [[1, 2, 3]]
+    assert loader.stats.batches == 1
+    assert loader.stats.loads == 5
+    assert loader.stats.cache_hits == 2
+
+@pytest.mark.asyncio
+async def test_max_batch_size_splits_batches():
+    calls: List[List[int]] = []
+
+    async def batch(keys: List[int]) -> Dict[int, int]:
+        calls.append(keys)
+        return {key: key for key in keys}
+
+    loader = BatchLoader(batch, max_batch_size=2)
+    await asyncio.gather(*(loader.load(key) for key in range(5)))
+
+    assert calls == [[0, 1], [2, 3], [4]]
+    assert loader.stats.max_batch_size == 2
+    assert loader.stats.mean_batch_size == pytest.approx(5 / 3)
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_cached():
+    attempts = 0
+
+    async def batch(keys: List[int]) -> Dict[int, int]:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("database unavailable")
+        return {key: key for key in keys}
+
+    loader = BatchLoader(batch)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert await loader.load(1) == 1
+
+@pytest.mark.asyncio
+async def test_coalescing_repository_fans_out_to_one_batch():
+    users = make_users(5)
+    inner = CountingRepository(users)
+    stats = BatchStats()
+    repository = CoalescingUserRepository(inner, stats=stats)
+
+    ids = [str(user.id) for user in users] * 3
+    results = await asyncio.gather(*(repository.get_by_id(user_id) for user_id in ids))
+
+    assert [user.id for user in results] == [user.id for user in users] * 3
+    assert len(inner.batches) == 1
+    assert stats.keys_dispatched == 5
+    assert await repository.get_by_id("not-a-uuid") is None
+
+@pytest.mark.asyncio
+async def test_coalescing_repository_refreshes_cache_on_write():
+    users = make_users(1)
+    repository = CoalescingUserRepository(CountingRepository(users))
+
+    user = await repository.get_by_email("user0@example.com")
+    user.email = "renamed@example.com"
+    updated = await repository.update(user)
+
+    assert (await repository.get_by_id(str(user.id))).version == updated.version
+    assert await repository.get_by_email("user0@example.com") is None
+    assert (await repository.get_by_email("renamed@example.com")).id == user.id
+
+    assert await repository.delete(str(user.id)) is True
+    assert await repository.get_by_id(str(user.id)) is None
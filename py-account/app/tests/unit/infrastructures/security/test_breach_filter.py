@@ -0,0 +1,87 @@
+import hashlib
+
+import pytest
+
+from app.infrastructures.security.breach_filter import (
+    BreachFilter,
+    BreachFilterBuilder,
+    main,
+    measure_fp_rate,
+    optimal_parameters,
+    read_digests,
+)
+
+
+@pytest.fixture
+def filter_path(tmp_path):
+    path = str(tmp_path / "breached.bloom")
+    with BreachFilterBuilder(path, capacity=10_000, fp_rate=0.001) as builder:
+        for i in range(10_000):
+            builder.add(f"breached-{i}")
+    return path
+
+
+def test_filter_contains_every_added_password(filter_path):
+    # Act
+    with BreachFilter(filter_path) as breach_filter:
+        missing = [i for i in range(10_000) if f"breached-{i}" not in breach_filter]
+
+    # Assert
+    assert missing == []
+
+
+def test_filter_false_positive_rate_is_near_target(filter_path):
+    # Act
+    with BreachFilter(filter_path) as breach_filter:
+        rate = measure_fp_rate(breach_filter, samples=50_000)
+
+    # Assert
+    assert breach_filter.num_items == 10_000
+    assert rate < 0.003
+
+
+def test_optimal_parameters_validate_input():
+    # Act / Assert
+    with pytest.raises(ValueError):
+        optimal_parameters(0, 0.001)
+    with pytest.raises(ValueError):
+        optimal_parameters(1_000, 1.5)
+
+
+def test_invalid_filter_file_is_rejected(tmp_path):
+    # Arrange
+    path = tmp_path / "not-a-filter.bloom"
+    path.write_bytes(b"\0" * 128)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        BreachFilter(str(path))
+
+
+def test_read_digests_parses_sha1_corpus_lines():
+    # Arrange
+    digest = hashlib.sha1(b"password").digest()
+    lines = [f"{digest.hex().upper()}:3861493\n", "\n"]
+
+    # Act
+    digests = list(read_digests(lines, "sha1"))
+
+    # Assert
+    assert digests == [digest]
+
+
+def test_build_command_writes_filter(tmp_path, capsys):
+    # Arrange
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("".join(
+        f"{hashlib.sha1(f'password{i}'.encode()).hexdigest().upper()}:1\n" for i in range(100)
+    ))
+    output = tmp_path / "breached.bloom"
+
+    # Act
+    main(["build", "--input", str(corpus), "--output", str(output), "--samples", "1000"])
+
+    # Assert
+    with BreachFilter(str(output)) as breach_filter:
+        assert "password42" in breach_filter
+    assert "False-positive rate" in capsys.readouterr().out
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.helpers.identifiers import uuid7, uuid7_at
+from app.infrastructures.security.claims import (
+    AccessTokenClaims,
+    UserVersionMap,
+    VersionTrackingUserRepository,
+    create_user_access_token,
+)
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.infrastructures.security.exceptions import TokenInvalidError, TokenRevokedError
+from app.infrastructures.security.jwt import create_access_token, decode_token
+from app.repository.models.user import User
+
+
+def _user() -> User:
+    return User.create(email="test@example.com", hashed_password="hashed")
+
+
+def test_user_access_token_carries_snapshot_claims():
+    # Arrange
+    user = _user()
+
+    # Act
+    decoded = decode_token(create_user_access_token(user), version_map=UserVersionMap())
+
+    # Assert
+    assert decoded["sub"] == str(user.id)
+    assert decoded["ver"] == str(user.version)
+    assert decoded["act"] is True
+
+
+def test_token_rejected_after_user_update():
+    # Arrange
+    user = _user()
+    token = create_user_access_token(user)
+    versions = UserVersionMap()
+
+    # Act
+    versions.apply(user.id, uuid7(), is_active=True)
+
+    # Assert
+    with pytest.raises(TokenRevokedError):
+        decode_token(token, version_map=versions)
+
+
+def test_token_rejected_after_deactivation():
+    # Arrange
+    user = _user()
+    token = create_user_access_token(user)
+    versions = UserVersionMap()
+
+    # Act
+    versions.apply(user.id, user.version, is_active=False)
+
+    # Assert
+    with pytest.raises(TokenRevokedError):
+        decode_token(token, version_map=versions)
+
+
+def test_token_issued_after_change_is_accepted():
+    # Arrange
+    user = _user()
+    versions = UserVersionMap()
+    versions.observe(user)
+    user.version = uuid7()
+
+    # Act
+    decoded = decode_token(create_user_access_token(user), version_map=versions)
+
+    # Assert
+    assert decoded["ver"] == str(user.version)
+
+
+def test_out_of_order_changes_keep_newest_version():
+    # Arrange
+    user = _user()
+    newer = uuid7()
+    versions = UserVersionMap()
+
+    # Act
+    versions.apply(user.id, newer, is_active=True)
+    versions.apply(user.id, user.version, is_active=False)
+
+    # Assert
+    claims = AccessTokenClaims(sub=str(user.id), ver=str(newer), act=True)
+    assert versions.is_accepted(claims)
+
+
+def test_non_uuid7_versions_require_exact_match():
+    # Arrange
+    user_id, version = uuid4(), uuid4()
+    versions = UserVersionMap()
+    versions.apply(user_id, version, is_active=True)
+
+    # Act / Assert
+    assert versions.is_accepted(AccessTokenClaims(sub=str(user_id), ver=str(version), act=True))
+    assert not versions.is_accepted(
+        AccessTokenClaims(sub=str(user_id), ver=str(uuid4()), act=True)
+    )
+
+
+def test_token_without_snapshot_claims_is_invalid_with_version_map():
+    # Arrange
+    token = create_access_token({"sub": "test@example.com"})
+
+    # Act / Assert
+    assert decode_token(token)["sub"] == "test@example.com"
+    with pytest.raises(TokenInvalidError):
+        decode_token(token, version_map=UserVersionMap())
+
+
+def test_prune_forgets_changes_older_than_retention():
+    # Arrange
+    now = datetime.now(timezone.utc)
+    versions = UserVersionMap(retention=timedelta(minutes=30))
+    versions.apply(uuid4(), uuid7_at(now - timedelta(hours=1), 0), is_active=False)
+    versions.apply(uuid4(), uuid7_at(now - timedelta(minutes=5), 0), is_active=False)
+
+    # Act
+    removed = versions.prune(now)
+
+    # Assert
+    assert removed == 1
+    assert len(versions) == 1
+
+
+@pytest.mark.asyncio
+async def test_tracking_repository_revokes_tokens_on_update_and_delete():
+    # Arrange
+    versions = UserVersionMap()
+    repository = VersionTrackingUserRepository(InMemoryUserRepository(), versions)
+    user = await repository.create(_user())
+    before_update = create_user_access_token(user)
+
+    # Act
+    user.hashed_password = "changed"
+    updated = await repository.update(user)
+    after_update = create_user_access_token(updated)
+    await repository.delete(str(user.id))
+
+    # Assert
+    with pytest.raises(TokenRevokedError):
+        decode_token(before_update, version_map=versions)
+    with pytest.raises(TokenRevokedError):
+        decode_token(after_update, version_map=versions)
+
+
+@pytest.mark.asyncio
+async def test_periodic_pruning_runs_until_cancelled():
+    # Arrange
+    versions = UserVersionMap(retention=timedelta(0))
+    versions.apply(uuid4(), uuid7_at(datetime.now(timezone.utc) - timedelta(hours=1), 0), True)
+
+    # Act
+    task = asyncio.get_running_loop().create_task(versions.prune_periodically(0))
+    await asyncio.sleep(0.01)
+    task.cancel()
+
+    # Assert
+    assert len(versions) == 0
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from app.exceptions.repository import DuplicateEmailError
+from app.infrastructures.metrics import MetricsRegistry, get_metrics_registry
+
+def test_counter_counts_per_label_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("logins_total", "Logins", labels=("result",))
+
+    counter.labels("success").inc()
+    counter.labels("success").inc()
+    counter.labels("failure").inc()
+
+    assert counter.labels("success").value == 2
+    assert counter.labels("failure").value == 1
+
+def test_counter_increments_are_exact_across_threads():
+    counter = MetricsRegistry().counter("events_total", "Events")
+
+    def work() -> None:
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 80_000
+
+def test_histogram_observations_are_exact_across_threads():
+    histogram = MetricsRegistry().histogram("latency_seconds", "Latency", buckets=(1.0,))
+
+    def work() -> None:
+        for _ in range(10_000):
+            histogram.observe(0.5)
+            histogram.observe(2.0)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert histogram.labels().snapshot() == {
+        "buckets": {"1.0": 80_000, "+Inf": 160_000}, "count": 160_000, "sum": 200_000.0,
+    }
+
+def test_labels_require_matching_arity():
+    counter = MetricsRegistry().counter("events_total", "Events", labels=("kind",))
+
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
+    with pytest.raises(ValueError):
+        counter.inc()
+
+def test_registry_returns_existing_metric_and_rejects_conflicts():
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", labels=("kind",))
+
+    assert registry.counter("events_total", "Events", labels=("kind",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("events_total", "Events")
+
+def test_exposition_renders_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events by kind", labels=("kind",)).labels('a"b').inc()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    registry.gauge("queue_depth", "Queued events", lambda: 7)
+
+    text = registry.exposition()
+
+    assert "# TYPE events_total counter\n" in text
+    assert 'events_total{kind="a\\"b"} 1\n' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="1"} 2\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3\n' in text
+    assert "latency_seconds_sum 5.55\n" in text
+    assert "latency_seconds_count 3\n" in text
+    assert "# TYPE queue_depth gauge\nqueue_depth 7\n" in text
+
+def test_register_stats_exposes_slots_as_gauges():
+    class Stats:
+        __slots__ = ("batches",)
+
+        def __init__(self) -> None:
+            self.batches = 0
+
+    registry = MetricsRegistry()
+    stats = Stats()
+    registry.register_stats("loader", stats)
+    stats.batches = 3
+
+    assert "loader_batches 3\n" in registry.exposition()
+
+def test_app_exceptions_are_counted_by_code_and_layer():
+    counter = get_metrics_registry().get("app_exceptions_total")
+    child = counter.labels("4099902001", "repository", "expected")
+    before = child.value
+
+    DuplicateEmailError("test@example.com")
+
+    assert child.value == before + 1
@@ -0,0 +1,227 @@
+"""Benchmark command line.
+
+Usage:
+    # Run every benchmark that can run here and store the results
+    python -m benchmarks run --output benchmarks/baselines/local.json
+
+    # Run and fail (exit code 1) on regressions against a stored baseline
+    python -m benchmarks run --group security --baseline benchmarks/baselines/local.json
+
+    # Compare two stored runs
+    python -m benchmarks compare benchmarks/baselines/local.json current.json
+
+    # Seed a database with two million synthetic users
+    python -m benchmarks seed --users 2000000
+
+    # Compare uuid4 and UUIDv7 primary keys: insert throughput and index size
+    python -m benchmarks uuid-index --rows 1000000
+
+    # Open-model register/login/lookup traffic, in process or against a server
+    python -m benchmarks loadgen --rate 50 --duration 30
+    python -m benchmarks loadgen --url http://127.0.0.1:8000 --rate 200
+
+Repository benchmarks, seeding and uuid-index need ``BENCH_DATABASE_URL``; so
+does loadgen in process, unless run with ``--memory``.
+"""
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from app.infrastructures.databases.postgresql.connection import Database
+from benchmarks import suites  # noqa: F401  (registers benchmarks)
+from benchmarks.datagen import seed_users
+from benchmarks.harness import (
+    BenchmarkReport,
+    compare,
+    format_comparisons,
+    format_duration,
+    format_report,
+    get_benchmarks,
+    run,
+)
+from benchmarks.loadgen import LoadProfile, format_load_report, parse_mix, run_load
+from benchmarks.settings import get_benchmark_settings
+from benchmarks.uuid_index import compare_uuid_index, format_uuid_index
+
+
+def _check_regressions(baseline: BenchmarkReport, current: BenchmarkReport) -> int:
+    comparisons = compare(baseline, current)
+    print(format_comparisons(comparisons))
+
+    if baseline.environment.get("platform") != current.environment.get("platform"):
+        print("\nWARNING: baseline was recorded on a different platform, ratios are unreliable")
+
+    regressions = [comparison for comparison in comparisons if comparison.is_regression]
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed beyond tolerance:")
+        for comparison in regressions:
+            print(
+                f"  {comparison.name}: {comparison.ratio:.2f}x baseline "
+                f"(tolerance {comparison.tolerance:.0%})"
+            )
+        return 1
+    return 0
+
+
+def command_run(args: argparse.Namespace) -> int:
+    settings = get_benchmark_settings()
+    benchmarks = get_benchmarks(args.group)
+    if not settings.database_url:
+        skipped = [bench.name for bench in benchmarks if bench.requires_database]
+        if skipped:
+            print(f"Skipping {len(skipped)} database benchmark(s): BENCH_DATABASE_URL is not set")
+        benchmarks = [bench for bench in benchmarks if not bench.requires_database]
+
+    report = run(benchmarks)
+    print(format_report(report))
+
+    if args.output:
+        report.save(args.output)
+        print(f"\nSaved results to {args.output}")
+
+    status = 0
+    over_budget = [result for result in report.results.values() if result.over_budget]
+    if over_budget:
+        print(f"\n{len(over_budget)} benchmark(s) exceeded their budget:")
+        for result in over_budget:
+            print(
+                f"  {result.name}: {format_duration(result.median_ns)} "
+                f"(budget {format_duration(result.budget_ns or 0)})"
+            )
+        status = 1
+    if args.baseline:
+        print()
+        status = max(status, _check_regressions(BenchmarkReport.load(args.baseline), report))
+    return status
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    baseline = BenchmarkReport.load(args.baseline)
+    return _check_regressions(baseline, BenchmarkReport.load(args.current))
+
+
+def command_seed(args: argparse.Namespace) -> int:
+    url = get_benchmark_settings().database_url
+    if not url:
+        print("BENCH_DATABASE_URL is required for seeding", file=sys.stderr)
+        return 2
+
+    async def seed() -> None:
+        database = Database(url)
+        try:
+            await database.create_database()
+        finally:
+            await database.dispose()
+        await seed_users(
+            url,
+            args.users,
+            start=args.start,
+            seed=get_benchmark_settings().seed,
+            batch_size=args.batch_size,
+        )
+
+    asyncio.run(seed())
+    print(f"Seeded {args.users} users")
+    return 0
+
+
+def command_uuid_index(args: argparse.Namespace) -> int:
+    url = get_benchmark_settings().database_url
+    if not url:
+        print("BENCH_DATABASE_URL is required for uuid-index", file=sys.stderr)
+        return 2
+
+    results = asyncio.run(compare_uuid_index(url, rows=args.rows, batch_size=args.batch_size))
+    print(format_uuid_index(results))
+    return 0
+
+
+def command_loadgen(args: argparse.Namespace) -> int:
+    database_url = None
+    if args.url is None and not args.memory:
+        database_url = get_benchmark_settings().database_url
+        if not database_url:
+            print(
+                "BENCH_DATABASE_URL is required for loadgen in process; use --memory or --url",
+                file=sys.stderr,
+            )
+            return 2
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+    profile = LoadProfile(
+        rate=args.rate,
+        duration=args.duration,
+        mix=mix,
+        think_time=args.think_time,
+        users=args.users,
+        max_in_flight=args.max_in_flight,
+        seed=get_benchmark_settings().seed,
+    )
+    report = asyncio.run(
+        run_load(profile, url=args.url, database_url=database_url, connections=args.connections)
+    )
+    print(format_load_report(report))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("--group", action="append", help="Only run this group (repeatable)")
+    run_parser.add_argument("--output", help="Store results as a JSON baseline")
+    run_parser.add_argument("--baseline", help="Fail on regressions against this baseline")
+    run_parser.set_defaults(handler=command_run)
+
+    compare_parser = commands.add_parser("compare", help="Compare two stored runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.set_defaults(handler=command_compare)
+
+    seed_parser = commands.add_parser("seed", help="Seed synthetic users with COPY")
+    seed_parser.add_argument("--users", type=int, required=True)
+    seed_parser.add_argument(
+        "--start", type=int, default=0, help="Sequence number of the first user"
+    )
+    seed_parser.add_argument("--batch-size", type=int, default=50_000)
+    seed_parser.set_defaults(handler=command_seed)
+
+    uuid_index_parser = commands.add_parser(
+        "uuid-index", help="Compare uuid4 and UUIDv7 insert throughput and index size"
+    )
+    uuid_index_parser.add_argument("--rows", type=int, default=1_000_000)
+    uuid_index_parser.add_argument("--batch-size", type=int, default=1_000)
+    uuid_index_parser.set_defaults(handler=command_uuid_index)
+
+    loadgen_parser = commands.add_parser(
+        "loadgen", help="Generate open-model register, login and lookup traffic"
+    )
+    loadgen_parser.add_argument("--url", help="Server to load, e.g. http://127.0.0.1:8000")
+    loadgen_parser.add_argument(
+        "--memory", action="store_true", help="In process with an in-memory repository"
+    )
+    loadgen_parser.add_argument("--rate", type=float, default=20.0, help="Sessions per second")
+    loadgen_parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    loadgen_parser.add_argument("--mix", default="register=1,login=2,lookup=7")
+    loadgen_parser.add_argument(
+        "--think-time", type=float, default=0.5, help="Mean seconds between session steps"
+    )
+    loadgen_parser.add_argument("--users", type=int, default=20, help="Accounts created up front")
+    loadgen_parser.add_argument("--max-in-flight", type=int, default=10_000)
+    loadgen_parser.add_argument(
+        "--connections", type=int, default=64, help="HTTP connections with --url"
+    )
+    loadgen_parser.set_defaults(handler=command_loadgen)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
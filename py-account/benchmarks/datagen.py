@@ -0,0 +1,122 @@
+"""Synthetic user data generator.
+
+Seeds the ``users`` table through ``COPY`` so that millions of rows load in
+minutes rather than hours. Rows are derived from a fixed seed, so the same
+arguments always produce the same data set.
+
+Every generated user shares one bcrypt hash of ``SEED_PASSWORD``: hashing
+millions of distinct passwords would take days and does not change the shape
+of the table or its indexes.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Iterator, List, Tuple
+from uuid import UUID
+
+import asyncpg
+
+from app.helpers.identifiers import uuid7_at
+from app.helpers.password import hash_password
+
+SEED_PASSWORD = "Str0ng!Passw0rd"
+DEFAULT_EMAIL_DOMAIN = "bench.example.com"
+
+USER_COLUMNS = (
+    "id", "email", "hashed_password", "version", "is_active", "created_at", "updated_at"
+)
+
+
+def to_asyncpg_dsn(url: str) -> str:
+    """Convert a SQLAlchemy ``postgresql+asyncpg`` URL to a plain asyncpg DSN."""
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def generate_user_records(
+    count: int,
+    start: int = 0,
+    seed: int = 42,
+    email_domain: str = DEFAULT_EMAIL_DOMAIN,
+    hashed_password: str = "",
+) -> Iterator[Tuple[Any, ...]]:
+    """Generate deterministic user rows in ``USER_COLUMNS`` order.
+
+    Args:
+        count: Number of users to generate
+        start: Sequence number of the first user, to extend an existing data set
+        seed: Random seed
+        email_domain: Domain of the generated email addresses
+        hashed_password: Password hash stored for every user
+
+    Returns:
+        Iterator of row tuples
+    """
+    rng = random.Random(f"{seed}:{start}")
+    now = datetime.now(timezone.utc)
+    for number in range(start, start + count):
+        created_at = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        updated_at = None
+        if rng.random() < 0.3:
+            updated_at = created_at + timedelta(seconds=rng.randrange(3600))
+        yield (
+            uuid7_at(created_at, rng.getrandbits(74)),
+            f"user{number:010d}@{email_domain}",
+            hashed_password,
+            uuid7_at(updated_at or created_at, rng.getrandbits(74)),
+            rng.random() >= 0.05,
+            created_at,
+            updated_at,
+        )
+
+
+async def seed_users(
+    database_url: str,
+    count: int,
+    start: int = 0,
+    seed: int = 42,
+    email_domain: str = DEFAULT_EMAIL_DOMAIN,
+    batch_size: int = 50_000,
+) -> List[UUID]:
+    """Bulk load synthetic users with ``COPY``.
+
+    The ``users`` table must already exist.
+
+    Args:
+        database_url: SQLAlchemy or asyncpg database URL
+        count: Number of users to insert
+        start: Sequence number of the first user
+        seed: Random seed
+        email_domain: Domain of the generated email addresses
+        batch_size: Rows per ``COPY`` batch
+
+    Returns:
+        List of inserted user ids when ``count`` is at most ``batch_size``,
+        otherwise an empty list to keep memory flat for large loads
+    """
+    records = generate_user_records(
+        count,
+        start=start,
+        seed=seed,
+        email_domain=email_domain,
+        hashed_password=hash_password(SEED_PASSWORD),
+    )
+    ids: List[UUID] = []
+    conn = await asyncpg.connect(to_asyncpg_dsn(database_url))
+    try:
+        while batch := list(islice(records, batch_size)):
+            await conn.copy_records_to_table("users", records=batch, columns=USER_COLUMNS)
+            if count <= batch_size:
+                ids.extend(row[0] for row in batch)
+        await conn.execute("ANALYZE users")
+    finally:
+        await conn.close()
+    return ids
+
+
+async def delete_seeded_users(database_url: str, email_domain: str) -> None:
+    """Delete users generated with the given email domain."""
+    conn = await asyncpg.connect(to_asyncpg_dsn(database_url))
+    try:
+        await conn.execute("DELETE FROM users WHERE email LIKE $1", f"%@{email_domain}")
+    finally:
+        await conn.close()
@@ -0,0 +1,333 @@
+"""Benchmark registration, timing and baseline comparison.
+
+Benchmarks are generator (or async generator) functions decorated with
+``@benchmark``. Code before the ``yield`` is setup, the yielded callable is the
+operation being timed and code after the ``yield`` is teardown:
+
+    @benchmark("security.create_access_token", group="security")
+    def bench_create_access_token() -> Iterator[Callable[[], Any]]:
+        yield lambda: create_access_token({"sub": "user@example.com"})
+
+Each benchmark runs ``rounds`` timed rounds of ``loops`` calls. Unless fixed
+explicitly, ``loops`` is calibrated so that one round takes at least
+``min_time`` seconds. The garbage collector is disabled while timing.
+
+Rounds are timed by wall clock, or by process CPU time with ``timer="cpu"``
+to leave out time spent waiting on the database.
+
+A benchmark may declare an absolute ``budget_ns`` per operation; ``run``
+fails when its median exceeds it, independent of any baseline.
+"""
+import asyncio
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_TOLERANCE = 0.10
+
+TIMERS: Dict[str, Callable[[], float]] = {
+    "wall": time.perf_counter,
+    "cpu": time.process_time,
+}
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark."""
+    name: str
+    group: str
+    factory: Callable[[], Any]
+    rounds: int = 7
+    loops: Optional[int] = None
+    min_time: float = 0.1
+    tolerance: float = DEFAULT_TOLERANCE
+    requires_database: bool = False
+    timer: str = "wall"
+    budget_ns: Optional[float] = None
+
+    @property
+    def is_async(self) -> bool:
+        return inspect.isasyncgenfunction(self.factory)
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics of one benchmark, in nanoseconds per operation."""
+    name: str
+    group: str
+    loops: int
+    rounds: int
+    median_ns: float
+    mean_ns: float
+    min_ns: float
+    stdev_ns: float
+    tolerance: float
+    budget_ns: Optional[float] = None
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1e9 / self.median_ns if self.median_ns else 0.0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_ns is not None and self.median_ns > self.budget_ns
+
+    @classmethod
+    def from_samples(
+        cls, benchmark: Benchmark, loops: int, samples: List[float]
+    ) -> "BenchmarkResult":
+        per_op = [sample / loops * 1e9 for sample in samples]
+        return cls(
+            name=benchmark.name,
+            group=benchmark.group,
+            loops=loops,
+            rounds=len(per_op),
+            median_ns=statistics.median(per_op),
+            mean_ns=statistics.fmean(per_op),
+            min_ns=min(per_op),
+            stdev_ns=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+            tolerance=benchmark.tolerance,
+            budget_ns=benchmark.budget_ns,
+        )
+
+
+@dataclass
+class Comparison:
+    """Comparison of one benchmark against its baseline."""
+    name: str
+    baseline_ns: float
+    current_ns: float
+    tolerance: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+    @property
+    def is_regression(self) -> bool:
+        return self.ratio > 1 + self.tolerance
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of one benchmark run together with its environment."""
+    results: Dict[str, BenchmarkResult]
+    environment: Dict[str, Any] = field(default_factory=lambda: collect_environment())
+
+    def save(self, path: str) -> None:
+        """Store the report as a JSON baseline."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        payload = {
+            "environment": self.environment,
+            "results": {name: result.__dict__ for name, result in self.results.items()},
+        }
+        with open(path, "w") as file:
+            json.dump(payload, file, indent=2, sort_keys=True)
+
+    @classmethod
+    def load(cls, path: str) -> "BenchmarkReport":
+        """Load a report previously stored with ``save``."""
+        with open(path) as file:
+            payload = json.load(file)
+        return cls(
+            results={
+                name: BenchmarkResult(**result) for name, result in payload["results"].items()
+            },
+            environment=payload["environment"],
+        )
+
+
+_registry: Dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    group: str,
+    rounds: int = 7,
+    loops: Optional[int] = None,
+    min_time: float = 0.1,
+    tolerance: float = DEFAULT_TOLERANCE,
+    requires_database: bool = False,
+    timer: str = "wall",
+    budget_ns: Optional[float] = None,
+) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    """Register a generator function as a benchmark.
+
+    Args:
+        name: Unique benchmark name, used as the baseline key
+        group: Benchmark group used for filtering
+        rounds: Number of timed rounds
+        loops: Fixed number of calls per round (calibrated when None)
+        min_time: Minimum duration of one round in seconds when calibrating
+        tolerance: Allowed slowdown of the median before it counts as a regression
+        requires_database: Whether the benchmark needs ``BENCH_DATABASE_URL``
+        timer: ``"wall"`` for elapsed time or ``"cpu"`` for process CPU time
+        budget_ns: Maximum median nanoseconds per operation, checked on every run
+
+    Raises:
+        ValueError: If the name is already registered or the timer is unknown
+    """
+    if timer not in TIMERS:
+        raise ValueError(f"Unknown timer {timer}, expected one of {sorted(TIMERS)}")
+
+    def decorator(factory: Callable[[], Any]) -> Callable[[], Any]:
+        if name in _registry:
+            raise ValueError(f"Benchmark {name} is already registered")
+        _registry[name] = Benchmark(
+            name=name,
+            group=group,
+            factory=factory,
+            rounds=rounds,
+            loops=loops,
+            min_time=min_time,
+            tolerance=tolerance,
+            requires_database=requires_database,
+            timer=timer,
+            budget_ns=budget_ns,
+        )
+        return factory
+
+    return decorator
+
+
+def get_benchmarks(groups: Optional[List[str]] = None) -> List[Benchmark]:
+    """Get registered benchmarks, optionally filtered by group."""
+    return [
+        bench for bench in _registry.values()
+        if not groups or bench.group in groups
+    ]
+
+
+def collect_environment() -> Dict[str, Any]:
+    """Describe the machine and interpreter a report was produced on."""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _time_sync(operation: Callable[[], Any], loops: int, timer: Callable[[], float]) -> float:
+    start = timer()
+    for _ in range(loops):
+        operation()
+    return timer() - start
+
+
+async def _time_async(
+    operation: Callable[[], Any], loops: int, timer: Callable[[], float]
+) -> float:
+    start = timer()
+    for _ in range(loops):
+        await operation()
+    return timer() - start
+
+
+async def run_benchmark(bench: Benchmark) -> BenchmarkResult:
+    """Run a single benchmark.
+
+    Returns:
+        BenchmarkResult with per-operation statistics
+    """
+    if bench.is_async:
+        async with asynccontextmanager(bench.factory)() as operation:
+            return await _measure(bench, operation)
+    with contextmanager(bench.factory)() as operation:
+        return await _measure(bench, operation)
+
+
+async def _measure(bench: Benchmark, operation: Callable[[], Any]) -> BenchmarkResult:
+    timer = TIMERS[bench.timer]
+
+    async def timed(loops: int) -> float:
+        if bench.is_async:
+            return await _time_async(operation, loops, timer)
+        return _time_sync(operation, loops, timer)
+
+    loops = bench.loops
+    if loops is None:
+        loops = 1
+        while (elapsed := await timed(loops)) < bench.min_time:
+            loops = max(loops * 2, int(loops * bench.min_time / max(elapsed, 1e-9)))
+
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        samples = [await timed(loops) for _ in range(bench.rounds)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return BenchmarkResult.from_samples(bench, loops, samples)
+
+
+async def run_benchmarks(benchmarks: List[Benchmark]) -> BenchmarkReport:
+    """Run benchmarks in registration order."""
+    results: Dict[str, BenchmarkResult] = {}
+    for bench in benchmarks:
+        results[bench.name] = await run_benchmark(bench)
+    return BenchmarkReport(results=results)
+
+
+def run(benchmarks: List[Benchmark]) -> BenchmarkReport:
+    """Run benchmarks in a fresh event loop."""
+    return asyncio.run(run_benchmarks(benchmarks))
+
+
+def compare(baseline: BenchmarkReport, current: BenchmarkReport) -> List[Comparison]:
+    """Compare the medians of benchmarks present in both reports."""
+    return [
+        Comparison(
+            name=name,
+            baseline_ns=baseline.results[name].median_ns,
+            current_ns=result.median_ns,
+            tolerance=result.tolerance,
+        )
+        for name, result in current.results.items()
+        if name in baseline.results
+    ]
+
+
+def format_duration(nanoseconds: float) -> str:
+    """Format a per-operation duration with a readable unit."""
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if nanoseconds >= scale:
+            return f"{nanoseconds / scale:.2f} {unit}"
+    return f"{nanoseconds:.0f} ns"
+
+
+def format_report(report: BenchmarkReport) -> str:
+    """Render benchmark results as a text table."""
+    lines = [f"{'benchmark':<48} {'median':>12} {'stdev':>12} {'ops/s':>12}"]
+    for result in report.results.values():
+        flag = "  OVER BUDGET" if result.over_budget else ""
+        lines.append(
+            f"{result.name:<48} {format_duration(result.median_ns):>12} "
+            f"{format_duration(result.stdev_ns):>12} {result.ops_per_second:>12,.0f}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparisons(comparisons: List[Comparison]) -> str:
+    """Render baseline comparisons, flagging regressions."""
+    lines = [f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison.is_regression else ""
+        lines.append(
+            f"{comparison.name:<48} {format_duration(comparison.baseline_ns):>12} "
+            f"{format_duration(comparison.current_ns):>12} "
+            f"{(comparison.ratio - 1) * 100:>+8.1f}%{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,538 @@
+"""Open-model load generator for end-to-end register, login and lookup flows.
+
+Sessions arrive as a Poisson process at a fixed rate, independent of how fast
+the service answers (an open model): a slow service builds up a queue instead
+of slowing the load down, as real traffic would. Each session runs one flow:
+
+- ``register``: register a new user, think, look the user up with its token
+- ``login``: log in as a known user, think, look the user up
+- ``lookup``: look a known user up with a token from an earlier session
+
+Latency is measured from the moment a step was scheduled, not from when the
+generator got around to sending it, so the generator's own delays show up as
+latency rather than being hidden (no coordinated omission).
+
+Stage quantiles come from the service's own histograms: the metrics
+exposition is read before and after the run, and the bucket deltas are
+interpolated like Prometheus' ``histogram_quantile``. Their precision is
+bounded by the bucket bounds. Over HTTP, ``/metrics`` is per worker process;
+run the server with ``--workers 1`` for complete stage numbers.
+
+Usage:
+    # In process, against BENCH_DATABASE_URL
+    python -m benchmarks loadgen --rate 50 --duration 30
+
+    # In process, in memory (no database; the repository stage stays empty)
+    python -m benchmarks loadgen --memory --rate 20 --duration 10
+
+    # Over localhost, against a running server
+    python -m benchmarks loadgen --url http://127.0.0.1:8000 --rate 200 --mix login=1,lookup=9
+"""
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from collections import defaultdict
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+from app.controllers.http.app import HttpSettings, PostgresRepositoryScope, create_app
+from app.controllers.http.serialization import dumps
+from app.controllers.http.testing import call_json, lifespan
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.infrastructures.databases.postgresql.connection import Database, DatabaseSettings
+from app.infrastructures.metrics import get_metrics_registry
+from app.infrastructures.security.claims import UserVersionMap
+from app.repository.interfaces.user import UserRepository
+
+LOADGEN_PASSWORD = "L0adgen!Passw0rd"
+QUANTILES = (0.5, 0.99, 0.999)
+
+# Service histograms reported as stages, by stage name
+STAGE_HISTOGRAMS: Dict[str, str] = {
+    "validation": "request_validation_seconds",
+    "bcrypt": "password_hash_seconds",
+    "repository": "repository_call_seconds",
+    "jwt": "jwt_seconds",
+}
+
+_SAMPLE = re.compile(
+    r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})? (?P<value>\S+)$'
+)
+_LABEL = re.compile(r'(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)="(?P<value>(?:[^"\\]|\\.)*)"')
+
+# Histogram series: metric name and its label pairs other than "le"
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass
+class LoadProfile:
+    """Shape of the generated traffic."""
+    # Session arrivals per second
+    rate: float
+    duration: float
+    # Relative weight of each flow
+    mix: Dict[str, float] = field(
+        default_factory=lambda: {"register": 1.0, "login": 2.0, "lookup": 7.0}
+    )
+    # Mean think time between the steps of a session, exponentially distributed
+    think_time: float = 0.5
+    # Users registered before the run, so that login and lookup have accounts
+    users: int = 20
+    # Arrivals beyond this many running sessions are dropped and counted
+    max_in_flight: int = 10_000
+    seed: int = 42
+
+
+class Target(Protocol):
+    """Where requests go: the application in process or a server over HTTP."""
+
+    async def request(
+        self, method: str, path: str, payload: Optional[Any] = None, token: Optional[str] = None
+    ) -> Tuple[int, bytes]:
+        ...
+
+    async def metrics(self) -> str:
+        ...
+
+
+class InProcessTarget:
+    """Calls the ASGI application directly; stages read from this process' registry."""
+
+    def __init__(self, app: Any) -> None:
+        self._app = app
+
+    async def request(
+        self, method: str, path: str, payload: Optional[Any] = None, token: Optional[str] = None
+    ) -> Tuple[int, bytes]:
+        response = await call_json(self._app, method, path, payload, token)
+        return response.status, response.body
+
+    async def metrics(self) -> str:
+        return get_metrics_registry().exposition()
+
+
+class HttpTarget:
+    """Minimal HTTP/1.1 keep-alive client for a server on localhost.
+
+    Keeps up to ``connections`` open connections; requests beyond that wait
+    for a free connection, and that wait counts as latency.
+    """
+
+    def __init__(self, url: str, connections: int = 64) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Only plain http:// URLs are supported, got {url!r}")
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._host_header = parts.netloc.encode()
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(connections)
+
+    async def request(
+        self, method: str, path: str, payload: Optional[Any] = None, token: Optional[str] = None
+    ) -> Tuple[int, bytes]:
+        body = dumps(payload) if payload is not None else b""
+        head = [
+            f"{method} {path} HTTP/1.1".encode(),
+            b"host: " + self._host_header,
+            b"content-type: application/json",
+            b"content-length: " + str(len(body)).encode(),
+        ]
+        if token:
+            head.append(b"authorization: Bearer " + token.encode())
+        message = b"\r\n".join(head) + b"\r\n\r\n" + body
+
+        async with self._slots:
+            reader, writer = await self._connection()
+            try:
+                writer.write(message)
+                status, response, keep_alive = await self._read_response(reader)
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+        return status, response
+
+    async def metrics(self) -> str:
+        status, body = await self.request("GET", "/metrics")
+        if status != 200:
+            raise RuntimeError(f"GET /metrics answered {status}")
+        return body.decode()
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._idle:
+            return self._idle.pop()
+        return await asyncio.open_connection(self._host, self._port)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        status_line = await reader.readuntil(b"\r\n")
+        status = int(status_line.split(b" ", 2)[1])
+        length = 0
+        keep_alive = True
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"connection" and value.strip().lower() == b"close":
+                keep_alive = False
+        return status, await reader.readexactly(length), keep_alive
+
+
+@dataclass
+class OperationStats:
+    """Client-side outcome of one request type."""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+@dataclass
+class StageQuantiles:
+    """Latency quantiles of one service histogram series over the run."""
+    stage: str
+    series: str
+    count: int
+    quantiles: Dict[float, float]
+
+
+@dataclass
+class LoadReport:
+    """Result of a load run."""
+    elapsed: float
+    sessions: int
+    dropped: int
+    operations: Dict[str, OperationStats]
+    stages: List[StageQuantiles]
+
+    @property
+    def requests(self) -> int:
+        return sum(len(stats.latencies) for stats in self.operations.values())
+
+
+def quantile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank quantile of sorted values."""
+    if not sorted_values:
+        return math.nan
+    rank = max(math.ceil(q * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def parse_histograms(exposition: str) -> Dict[SeriesKey, List[Tuple[float, float]]]:
+    """Extract cumulative histogram buckets from a Prometheus text exposition.
+
+    Returns:
+        Dict: ``(metric name, labels without le)`` to ``(upper bound, cumulative count)``
+            pairs in bucket order
+    """
+    histograms: Dict[SeriesKey, List[Tuple[float, float]]] = defaultdict(list)
+    for line in exposition.splitlines():
+        match = _SAMPLE.match(line)
+        if match is None or not match["name"].endswith("_bucket"):
+            continue
+        labels = {
+            label["name"]: label["value"] for label in _LABEL.finditer(match["labels"] or "")
+        }
+        bound = float(labels.pop("le", "+Inf"))
+        key = (match["name"][:-len("_bucket")], tuple(sorted(labels.items())))
+        histograms[key].append((bound, float(match["value"])))
+    return dict(histograms)
+
+
+def histogram_quantile(q: float, buckets: Sequence[Tuple[float, float]]) -> float:
+    """Estimate a quantile from cumulative buckets by linear interpolation within a bucket.
+
+    Observations above the highest finite bound are reported at that bound.
+    """
+    total = buckets[-1][1] if buckets else 0
+    if total <= 0:
+        return math.nan
+    rank = q * total
+    lower_bound, lower_count = 0.0, 0.0
+    for bound, cumulative in buckets:
+        if cumulative >= rank:
+            if math.isinf(bound):
+                return lower_bound
+            if cumulative == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (
+                cumulative - lower_count
+            )
+        lower_bound, lower_count = bound, cumulative
+    return lower_bound
+
+
+def stage_quantiles(before: str, after: str) -> List[StageQuantiles]:
+    """Quantiles of every stage histogram series over the interval between two expositions."""
+    start = parse_histograms(before)
+    end = parse_histograms(after)
+    stages: List[StageQuantiles] = []
+    for stage, metric in STAGE_HISTOGRAMS.items():
+        for (name, labels), buckets in sorted(end.items()):
+            if name != metric:
+                continue
+            previous = dict(start.get((name, labels), []))
+            delta = [(bound, value - previous.get(bound, 0.0)) for bound, value in buckets]
+            observations = int(delta[-1][1]) if delta else 0
+            if observations == 0:
+                continue
+            stages.append(StageQuantiles(
+                stage=stage,
+                series=",".join(value for _, value in labels),
+                count=observations,
+                quantiles={q: histogram_quantile(q, delta) for q in QUANTILES},
+            ))
+    return stages
+
+
+class LoadGenerator:
+    """Drives sessions against a target following a load profile.
+
+    Usage:
+        report = await LoadGenerator(InProcessTarget(app), LoadProfile(rate=50, duration=30)).run()
+        print(format_load_report(report))
+    """
+
+    def __init__(self, target: Target, profile: LoadProfile) -> None:
+        unknown = set(profile.mix) - {"register", "login", "lookup"}
+        if unknown:
+            raise ValueError(f"Unknown flows in mix: {', '.join(sorted(unknown))}")
+        self._target = target
+        self._profile = profile
+        self._random = random.Random(profile.seed)
+        self._flows = list(profile.mix)
+        self._weights = [profile.mix[flow] for flow in self._flows]
+        # Accounts known to exist, and the most recent token of each
+        self._emails: List[str] = []
+        self._tokens: List[str] = []
+        self._sequence = count()
+        self._run_id = f"{int(time.time())}-{profile.seed}"
+        self._operations: Dict[str, OperationStats] = defaultdict(OperationStats)
+
+    async def run(self) -> LoadReport:
+        await self._prepare()
+        before = await self._target.metrics()
+
+        sessions: Set["asyncio.Task[None]"] = set()
+        started = time.perf_counter()
+        deadline = started + self._profile.duration
+        due = started
+        arrivals = dropped = 0
+        while True:
+            due += self._random.expovariate(self._profile.rate)
+            if due >= deadline:
+                break
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            arrivals += 1
+            if len(sessions) >= self._profile.max_in_flight:
+                dropped += 1
+                continue
+            flow = self._random.choices(self._flows, self._weights)[0]
+            task = asyncio.create_task(self._session(flow, due))
+            sessions.add(task)
+            task.add_done_callback(sessions.discard)
+        if sessions:
+            await asyncio.gather(*sessions)
+        elapsed = time.perf_counter() - started
+
+        after = await self._target.metrics()
+        return LoadReport(
+            elapsed=elapsed,
+            sessions=arrivals - dropped,
+            dropped=dropped,
+            operations=dict(self._operations),
+            stages=stage_quantiles(before, after),
+        )
+
+    async def _prepare(self) -> None:
+        """Register the initial accounts, outside of the measured run."""
+        results = await asyncio.gather(*(
+            self._target.request(
+                "POST", "/v1/auth/register", self._credentials(self._new_email())
+            )
+            for _ in range(self._profile.users)
+        ))
+        for status, body in results:
+            if status != 201:
+                raise RuntimeError(f"Registering a load generator user failed ({status}): {body!r}")
+            self._remember(body)
+        self._operations.clear()
+
+    async def _session(self, flow: str, due: float) -> None:
+        if flow == "lookup":
+            if self._tokens:
+                token = self._pick(self._tokens)
+                await self._step("lookup", due, "GET", "/v1/auth/me", token=token)
+            return
+
+        if flow == "register":
+            body = await self._step(
+                "register", due, "POST", "/v1/auth/register", self._credentials(self._new_email())
+            )
+        else:
+            body = await self._step(
+                "login", due, "POST", "/v1/auth/login", self._credentials(self._pick(self._emails))
+            )
+        token = self._remember(body) if body is not None else None
+        if token is None:
+            return
+
+        if self._profile.think_time > 0:
+            await asyncio.sleep(self._random.expovariate(1 / self._profile.think_time))
+        await self._step("lookup", time.perf_counter(), "GET", "/v1/auth/me", token=token)
+
+    async def _step(
+        self,
+        operation: str,
+        due: float,
+        method: str,
+        path: str,
+        payload: Optional[Any] = None,
+        token: Optional[str] = None,
+    ) -> Optional[bytes]:
+        stats = self._operations[operation]
+        try:
+            status, body = await self._target.request(method, path, payload, token)
+        except (OSError, asyncio.IncompleteReadError):
+            status, body = 0, b""
+        stats.latencies.append(time.perf_counter() - due)
+        if status >= 400 or status == 0:
+            stats.errors += 1
+            return None
+        return body
+
+    def _remember(self, body: bytes) -> Optional[str]:
+        """Keep the account and token of a register or login response."""
+        data = json.loads(body)
+        token = data.get("access_token") or data.get("token", {}).get("access_token")
+        if "email" in data:
+            self._emails.append(data["email"])
+        if token:
+            self._tokens.append(token)
+        return token
+
+    def _new_email(self) -> str:
+        return f"loadgen-{self._run_id}-{next(self._sequence)}@example.com"
+
+    def _pick(self, values: List[str]) -> str:
+        return values[self._random.randrange(len(values))]
+
+    @staticmethod
+    def _credentials(email: str) -> Dict[str, str]:
+        return {"email": email, "password": LOADGEN_PASSWORD}
+
+
+def _format_ms(seconds: float) -> str:
+    return "-" if math.isnan(seconds) else f"{seconds * 1000:.2f}"
+
+
+def format_load_report(report: LoadReport) -> str:
+    """Render a load report as aligned tables."""
+    header = f"{'':<32}{'count':>9}{'errors':>9}" + "".join(
+        f"{'p' + format(q * 100, 'g').replace('.', ''):>11}" for q in QUANTILES
+    )
+    lines = [
+        f"{report.sessions} sessions ({report.dropped} dropped), {report.requests} requests "
+        f"in {report.elapsed:.1f}s: {report.requests / report.elapsed:,.1f} requests/s",
+        "",
+        "request (ms)" + header[len("request (ms)"):],
+    ]
+    for operation, stats in sorted(report.operations.items()):
+        latencies = sorted(stats.latencies)
+        lines.append(
+            f"{operation:<32}{len(latencies):>9}{stats.errors:>9}"
+            + "".join(f"{_format_ms(quantile(latencies, q)):>11}" for q in QUANTILES)
+        )
+    lines += ["", "stage (ms)" + header[len("stage (ms)"):]]
+    for stage in report.stages:
+        name = f"{stage.stage} {stage.series}".strip()
+        lines.append(
+            f"{name:<32}{stage.count:>9}{'':>9}"
+            + "".join(f"{_format_ms(stage.quantiles[q]):>11}" for q in QUANTILES)
+        )
+    return "\n".join(lines)
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse a flow mix such as ``register=1,login=2,lookup=7``.
+
+    Raises:
+        ValueError: If an entry is not ``flow=weight``
+    """
+    mix: Dict[str, float] = {}
+    for entry in value.split(","):
+        flow, separator, weight = entry.partition("=")
+        if not separator:
+            raise ValueError(f"Expected flow=weight, got {entry!r}")
+        mix[flow.strip()] = float(weight)
+    return mix
+
+
+@asynccontextmanager
+async def in_process_target(database_url: Optional[str]) -> AsyncIterator[InProcessTarget]:
+    """Run the application in this process, on PostgreSQL or, without a URL, in memory."""
+    if database_url is None:
+        repository = InMemoryUserRepository()
+
+        @asynccontextmanager
+        async def memory_scope() -> AsyncIterator[UserRepository]:
+            yield repository
+
+        app = create_app(memory_scope, UserVersionMap(), HttpSettings())
+    else:
+        database = Database(database_url)
+        try:
+            await database.create_database()
+        finally:
+            await database.dispose()
+        app = create_app(
+            PostgresRepositoryScope(DatabaseSettings(url=database_url)),
+            UserVersionMap(),
+            HttpSettings(),
+        )
+
+    async with lifespan(app):
+        yield InProcessTarget(app)
+
+
+@asynccontextmanager
+async def http_target(url: str, connections: int) -> AsyncIterator[HttpTarget]:
+    target = HttpTarget(url, connections)
+    try:
+        yield target
+    finally:
+        await target.close()
+
+
+async def run_load(
+    profile: LoadProfile,
+    url: Optional[str] = None,
+    database_url: Optional[str] = None,
+    connections: int = 64,
+) -> LoadReport:
+    """Run a load profile over HTTP when ``url`` is given, otherwise in process."""
+    async with AsyncExitStack() as stack:
+        if url is not None:
+            target: Target = await stack.enter_async_context(http_target(url, connections))
+        else:
+            target = await stack.enter_async_context(in_process_target(database_url))
+        return await LoadGenerator(target, profile).run()
@@ -0,0 +1,10 @@
+"""Benchmark suites. Importing this package registers every benchmark."""
+from . import (
+    exceptions, http, identifiers, memory_repository, metrics, models, repository, schemas,
+    security,
+)
+
+__all__ = [
+    "exceptions", "http", "identifiers", "memory_repository", "metrics", "models", "repository",
+    "schemas", "security",
+]
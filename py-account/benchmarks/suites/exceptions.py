@@ -0,0 +1,59 @@
+"""Raise-and-serialize benchmarks of application exceptions.
+
+Each call raises an exception, catches it and builds its response body, which
+is what a failed login or duplicate registration costs the HTTP layer besides
+the service work. Expected errors should stay within a few microseconds.
+"""
+from typing import Any, Callable, Iterator, Type
+
+from app.controllers.http.asgi import Response
+from app.exceptions.base import AppException
+from app.exceptions.infrastructure import DatabaseConnectionError
+from app.exceptions.repository import DuplicateEmailError
+from app.exceptions.service import InvalidCredentialsError, InvalidTokenError
+from benchmarks.harness import benchmark
+
+EXPECTED_BUDGET_NS = 5_000
+
+
+def _raise_and_serialize(raise_error: Callable[[], None]) -> Callable[[], Any]:
+    def call() -> Response:
+        try:
+            raise_error()
+        except AppException as error:
+            return Response.error(error)
+        raise AssertionError("nothing was raised")
+
+    return call
+
+
+def _raiser(error_type: Type[AppException], *args: Any, **kwargs: Any) -> Callable[[], None]:
+    def raise_error() -> None:
+        raise error_type(*args, **kwargs)
+
+    return raise_error
+
+
+@benchmark("exceptions.invalid_credentials", group="exceptions", budget_ns=EXPECTED_BUDGET_NS)
+def bench_invalid_credentials() -> Iterator[Callable[[], Any]]:
+    yield _raise_and_serialize(_raiser(InvalidCredentialsError))
+
+
+@benchmark("exceptions.invalid_token", group="exceptions", budget_ns=EXPECTED_BUDGET_NS)
+def bench_invalid_token() -> Iterator[Callable[[], Any]]:
+    yield _raise_and_serialize(_raiser(InvalidTokenError, "expired"))
+
+
+# Details defeat the prebuilt body: the per-instance serialization path
+@benchmark("exceptions.duplicate_email_details", group="exceptions")
+def bench_duplicate_email_details() -> Iterator[Callable[[], Any]]:
+    yield _raise_and_serialize(
+        _raiser(DuplicateEmailError, details={"email": "user@example.com"})
+    )
+
+
+@benchmark("exceptions.database_unavailable", group="exceptions")
+def bench_database_unavailable() -> Iterator[Callable[[], Any]]:
+    yield _raise_and_serialize(
+        _raiser(DatabaseConnectionError, details={"circuit": "open", "retry_after": 5.0})
+    )
@@ -0,0 +1,54 @@
+"""In-process HTTP benchmarks.
+
+Requests go straight into the ASGI application, without sockets, against an
+in-memory repository, so the numbers are the per-request cost of routing,
+body parsing, serialization and metrics. Login and register are left out:
+their bcrypt work costs orders of magnitude more than the HTTP layer.
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+from app.controllers.http.app import HttpSettings, create_app
+from app.controllers.http.asgi import HttpApplication
+from app.controllers.http.testing import call_app, call_json
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.infrastructures.security.claims import UserVersionMap, create_user_access_token
+from app.repository.interfaces.user import UserRepository
+from app.repository.models.user import User
+from benchmarks.harness import benchmark
+
+
+def _app() -> HttpApplication:
+    repository = InMemoryUserRepository()
+
+    @asynccontextmanager
+    async def repository_scope() -> AsyncIterator[UserRepository]:
+        yield repository
+
+    return create_app(repository_scope, UserVersionMap(), HttpSettings())
+
+
+@benchmark("http.health", group="http")
+async def bench_health() -> AsyncIterator[Callable[[], Any]]:
+    app = _app()
+    yield lambda: call_app(app, "GET", "/health")
+
+
+@benchmark("http.not_found", group="http")
+async def bench_not_found() -> AsyncIterator[Callable[[], Any]]:
+    app = _app()
+    yield lambda: call_app(app, "GET", "/missing")
+
+
+@benchmark("http.verify_token", group="http")
+async def bench_verify_token() -> AsyncIterator[Callable[[], Any]]:
+    app = _app()
+    token = create_user_access_token(User.create(email="user@example.com", hashed_password="x"))
+    yield lambda: call_json(app, "GET", "/v1/auth/token", token=token)
+
+
+@benchmark("http.register_invalid", group="http")
+async def bench_register_invalid() -> AsyncIterator[Callable[[], Any]]:
+    app = _app()
+    payload = {"email": "not-an-email", "password": "short"}
+    yield lambda: call_json(app, "POST", "/v1/auth/register", payload)
@@ -0,0 +1,16 @@
+"""Identifier generation benchmarks."""
+from typing import Any, Callable, Iterator
+from uuid import uuid4
+
+from app.helpers.identifiers import uuid7
+from benchmarks.harness import benchmark
+
+
+@benchmark("identifiers.uuid4", group="identifiers")
+def bench_uuid4() -> Iterator[Callable[[], Any]]:
+    yield uuid4
+
+
+@benchmark("identifiers.uuid7", group="identifiers")
+def bench_uuid7() -> Iterator[Callable[[], Any]]:
+    yield uuid7
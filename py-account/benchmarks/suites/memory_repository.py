@@ -0,0 +1,52 @@
+"""InMemoryUserRepository benchmarks, the database-free baseline for repository overhead."""
+from itertools import count
+from typing import Any, AsyncIterator, Callable
+
+from app.infrastructures.databases.memory.repositories.user import InMemoryUserRepository
+from app.repository.models.user import User
+from benchmarks.harness import benchmark
+
+SEEDED_USERS = 10_000
+
+
+def _seeded_repository() -> InMemoryUserRepository:
+    return InMemoryUserRepository(
+        User.create(email=f"user{number}@example.com", hashed_password="hashed")
+        for number in range(SEEDED_USERS)
+    )
+
+
+@benchmark("memory_repository.create", group="memory_repository")
+async def bench_create() -> AsyncIterator[Callable[[], Any]]:
+    repository = InMemoryUserRepository()
+    sequence = count()
+
+    async def create() -> None:
+        await repository.create(
+            User.create(email=f"new{next(sequence)}@example.com", hashed_password="hashed")
+        )
+
+    yield create
+
+
+@benchmark("memory_repository.get_by_id", group="memory_repository")
+async def bench_get_by_id() -> AsyncIterator[Callable[[], Any]]:
+    repository = _seeded_repository()
+    user = await repository.get_by_email("user0@example.com")
+    user_id = str(user.id)
+
+    async def get_by_id() -> None:
+        await repository.get_by_id(user_id)
+
+    yield get_by_id
+
+
+@benchmark("memory_repository.update", group="memory_repository")
+async def bench_update() -> AsyncIterator[Callable[[], Any]]:
+    repository = _seeded_repository()
+    user = await repository.get_by_email("user0@example.com")
+
+    async def update() -> None:
+        await repository.update(user)
+
+    yield update
@@ -0,0 +1,91 @@
+"""Metrics registry benchmarks.
+
+Recording must stay under a microsecond per event so that instrumentation can
+stay enabled on every request; the recording benchmarks carry that budget. A
+tagged repository call also sets the operation tag and reads the clock twice
+around the call, so it has its own budget, measured with tags on.
+"""
+import time
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from app.infrastructures.databases.postgresql import instrumentation
+from app.infrastructures.databases.postgresql.instrumentation import tag_queries
+from app.infrastructures.metrics import MetricsRegistry
+from benchmarks.harness import benchmark
+
+EVENT_BUDGET_NS = 1_000
+# A few microseconds against a database round trip of a millisecond or more
+REPOSITORY_CALL_BUDGET_NS = 3_000
+
+
+def _registry() -> MetricsRegistry:
+    # A private registry keeps benchmark series out of the process registry
+    return MetricsRegistry()
+
+
+@benchmark("metrics.counter_inc", group="metrics", budget_ns=EVENT_BUDGET_NS)
+def bench_counter_inc() -> Iterator[Callable[[], Any]]:
+    counter = _registry().counter("events_total", "Events", labels=("kind",)).labels("login")
+    yield counter.inc
+
+
+@benchmark("metrics.counter_labels_inc", group="metrics", budget_ns=EVENT_BUDGET_NS)
+def bench_counter_labels_inc() -> Iterator[Callable[[], Any]]:
+    counter = _registry().counter(
+        "app_exceptions_total", "Exceptions", labels=("code", "layer", "severity")
+    )
+    yield lambda: counter.labels("4099902001", "repository", "expected").inc()
+
+
+@benchmark("metrics.histogram_observe", group="metrics", budget_ns=EVENT_BUDGET_NS)
+def bench_histogram_observe() -> Iterator[Callable[[], Any]]:
+    histogram = _registry().histogram("latency_seconds", "Latency", labels=("op",)).labels("get")
+    yield lambda: histogram.observe(0.0012)
+
+
+@benchmark("metrics.timed_observe", group="metrics", budget_ns=EVENT_BUDGET_NS)
+def bench_timed_observe() -> Iterator[Callable[[], Any]]:
+    histogram = _registry().histogram("latency_seconds", "Latency", labels=("op",)).labels("get")
+    perf_counter = time.perf_counter
+
+    def timed() -> None:
+        started = perf_counter()
+        histogram.observe(perf_counter() - started)
+
+    yield timed
+
+
+class _Repository:
+    async def untagged(self) -> None:
+        return None
+
+    @tag_queries
+    async def tagged(self) -> None:
+        return None
+
+
+@benchmark("metrics.repository_call_untagged", group="metrics")
+async def bench_repository_call_untagged() -> AsyncIterator[Callable[[], Any]]:
+    yield _Repository().untagged
+
+
+# Tags are on once a QueryInstrumentation is attached, so budget that case
+@benchmark("metrics.repository_call_tagged", group="metrics", budget_ns=REPOSITORY_CALL_BUDGET_NS)
+async def bench_repository_call_tagged() -> AsyncIterator[Callable[[], Any]]:
+    enabled = instrumentation._operation_tags_enabled
+    instrumentation._operation_tags_enabled = True
+    try:
+        yield _Repository().tagged
+    finally:
+        instrumentation._operation_tags_enabled = enabled
+
+
+@benchmark("metrics.exposition", group="metrics", rounds=5)
+def bench_exposition() -> Iterator[Callable[[], Any]]:
+    registry = _registry()
+    histogram = registry.histogram("latency_seconds", "Latency", labels=("op",))
+    counter = registry.counter("events_total", "Events", labels=("kind",))
+    for i in range(50):
+        histogram.labels(f"op{i}").observe(0.001 * i)
+        counter.labels(f"kind{i}").inc()
+    yield registry.exposition
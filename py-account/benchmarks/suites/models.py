@@ -0,0 +1,25 @@
+"""Domain and ORM model mapping benchmarks."""
+from typing import Any, Callable, Iterator
+
+from app.infrastructures.databases.postgresql.models.user import UserModel
+from app.repository.models.user import User
+from benchmarks.harness import benchmark
+
+
+@benchmark("models.user_create", group="models")
+def bench_user_create() -> Iterator[Callable[[], Any]]:
+    yield lambda: User.create(email="user@example.com", hashed_password="hashed")
+
+
+@benchmark("models.user_model_from_domain", group="models")
+def bench_user_model_from_domain() -> Iterator[Callable[[], Any]]:
+    user = User.create(email="user@example.com", hashed_password="hashed")
+    yield lambda: UserModel.from_domain(user)
+
+
+@benchmark("models.user_model_to_domain", group="models")
+def bench_user_model_to_domain() -> Iterator[Callable[[], Any]]:
+    db_user = UserModel.from_domain(
+        User.create(email="user@example.com", hashed_password="hashed")
+    )
+    yield db_user.to_domain
@@ -0,0 +1,211 @@
+"""PostgresUserRepository benchmarks against a local PostgreSQL.
+
+Each operation opens its own session, as a request would. Requires
+``BENCH_DATABASE_URL`` to point at a disposable database.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from itertools import count
+from typing import Any, AsyncIterator, Callable, Dict
+from uuid import uuid4
+
+from app.infrastructures.databases.loader import CoalescingUserRepository
+from app.infrastructures.databases.postgresql.connection import Database
+from app.infrastructures.databases.postgresql.repositories.fast_user import FastPathUserRepository
+from app.infrastructures.databases.postgresql.repositories.user import PostgresUserRepository
+from app.repository.models.user import User
+from benchmarks.datagen import delete_seeded_users, seed_users
+from benchmarks.harness import benchmark
+from benchmarks.settings import get_benchmark_settings
+
+SEEDED_USERS = 1_000
+FANOUT = 50
+
+
+@asynccontextmanager
+async def seeded_database(users: int = SEEDED_USERS) -> AsyncIterator[Dict[str, Any]]:
+    """Create the schema, seed users under a run-unique email domain and clean up afterwards."""
+    url = get_benchmark_settings().database_url
+    if not url:
+        raise RuntimeError("BENCH_DATABASE_URL is required for repository benchmarks")
+
+    database = Database(url)
+    await database.create_database()
+    email_domain = f"{uuid4().hex[:12]}.bench.example.com"
+    ids = await seed_users(
+        url, users, email_domain=email_domain, seed=get_benchmark_settings().seed
+    )
+    try:
+        yield {"database": database, "ids": ids, "email_domain": email_domain}
+    finally:
+        await delete_seeded_users(url, email_domain)
+        await database.dispose()
+
+
+@benchmark("repository.create", group="repository", rounds=5, loops=200, requires_database=True)
+async def bench_create() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database(users=0) as context:
+        database = context["database"]
+        sequence = count()
+
+        async def create() -> None:
+            user = User.create(
+                email=f"new{next(sequence)}@{context['email_domain']}",
+                hashed_password="hashed",
+            )
+            async with database.get_session() as session:
+                await PostgresUserRepository(session).create(user)
+
+        yield create
+
+
+@benchmark("repository.get_by_id", group="repository", rounds=5, requires_database=True)
+async def bench_get_by_id() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        ids = [str(user_id) for user_id in context["ids"]]
+        sequence = count()
+
+        async def get_by_id() -> None:
+            async with database.get_session() as session:
+                await PostgresUserRepository(session).get_by_id(ids[next(sequence) % len(ids)])
+
+        yield get_by_id
+
+
+@benchmark("repository.get_by_email", group="repository", rounds=5, requires_database=True)
+async def bench_get_by_email() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        emails = [f"user{number:010d}@{context['email_domain']}" for number in range(SEEDED_USERS)]
+        sequence = count()
+
+        async def get_by_email() -> None:
+            async with database.get_session() as session:
+                await PostgresUserRepository(session).get_by_email(
+                    emails[next(sequence) % len(emails)]
+                )
+
+        yield get_by_email
+
+
+# CPU time per lookup, leaving out time spent waiting on PostgreSQL
+@benchmark(
+    "repository.get_by_id_orm_cpu",
+    group="repository",
+    rounds=5,
+    requires_database=True,
+    timer="cpu",
+)
+async def bench_get_by_id_orm_cpu() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        ids = [str(user_id) for user_id in context["ids"]]
+        sequence = count()
+
+        async def get_by_id() -> None:
+            async with database.get_session() as session:
+                await PostgresUserRepository(session).get_by_id(ids[next(sequence) % len(ids)])
+
+        yield get_by_id
+
+
+@benchmark(
+    "repository.get_by_id_fast_path_cpu",
+    group="repository",
+    rounds=5,
+    requires_database=True,
+    timer="cpu",
+)
+async def bench_get_by_id_fast_path_cpu() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        ids = [str(user_id) for user_id in context["ids"]]
+        sequence = count()
+
+        async def get_by_id() -> None:
+            async with database.get_session() as session:
+                await FastPathUserRepository(session).get_by_id(ids[next(sequence) % len(ids)])
+
+        yield get_by_id
+
+
+@benchmark(
+    "repository.get_by_id_fanout_sequential",
+    group="repository",
+    rounds=5,
+    requires_database=True,
+)
+async def bench_get_by_id_fanout_sequential() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        ids = [str(user_id) for user_id in context["ids"][:FANOUT]]
+
+        async def fanout() -> None:
+            async with database.get_session() as session:
+                repository = PostgresUserRepository(session)
+                for user_id in ids:
+                    await repository.get_by_id(user_id)
+
+        yield fanout
+
+
+@benchmark(
+    "repository.get_by_id_fanout_coalesced",
+    group="repository",
+    rounds=5,
+    requires_database=True,
+)
+async def bench_get_by_id_fanout_coalesced() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        ids = [str(user_id) for user_id in context["ids"][:FANOUT]]
+
+        async def fanout() -> None:
+            async with database.get_session() as session:
+                repository = CoalescingUserRepository(PostgresUserRepository(session))
+                await asyncio.gather(*(repository.get_by_id(user_id) for user_id in ids))
+
+        yield fanout
+
+
+@benchmark("repository.get_by_id_missing", group="repository", rounds=5, requires_database=True)
+async def bench_get_by_id_missing() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database(users=0) as context:
+        database = context["database"]
+        missing_id = str(uuid4())
+
+        async def get_by_id_missing() -> None:
+            async with database.get_session() as session:
+                await PostgresUserRepository(session).get_by_id(missing_id)
+
+        yield get_by_id_missing
+
+
+@benchmark("repository.update", group="repository", rounds=5, requires_database=True)
+async def bench_update() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        async with database.get_session() as session:
+            user = await PostgresUserRepository(session).get_by_id(str(context["ids"][0]))
+
+        async def update() -> None:
+            async with database.get_session() as session:
+                # update() bumps the version on the passed user, so it stays current
+                await PostgresUserRepository(session).update(user)
+
+        yield update
+
+
+# Every call consumes a seeded user, so loops are fixed: rounds * loops <= SEEDED_USERS
+@benchmark("repository.delete", group="repository", rounds=5, loops=200, requires_database=True)
+async def bench_delete() -> AsyncIterator[Callable[[], Any]]:
+    async with seeded_database() as context:
+        database = context["database"]
+        ids = [str(user_id) for user_id in context["ids"]]
+
+        async def delete() -> None:
+            async with database.get_session() as session:
+                await PostgresUserRepository(session).delete(ids.pop())
+
+        yield delete
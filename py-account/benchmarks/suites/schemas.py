@@ -0,0 +1,26 @@
+"""Request schema validation benchmarks."""
+from typing import Any, Callable, Iterator
+
+from pydantic import ValidationError
+
+from app.schemas.auth import RegisterRequest
+from benchmarks.harness import benchmark
+
+VALID_PAYLOAD = {"email": "user@example.com", "password": "Str0ng!Passw0rd"}
+WEAK_PASSWORD_PAYLOAD = {"email": "user@example.com", "password": "weakpassword"}
+
+
+@benchmark("schemas.register_request_valid", group="schemas")
+def bench_register_request_valid() -> Iterator[Callable[[], Any]]:
+    yield lambda: RegisterRequest.model_validate(VALID_PAYLOAD)
+
+
+@benchmark("schemas.register_request_weak_password", group="schemas")
+def bench_register_request_weak_password() -> Iterator[Callable[[], Any]]:
+    def validate() -> None:
+        try:
+            RegisterRequest.model_validate(WEAK_PASSWORD_PAYLOAD)
+        except ValidationError:
+            pass
+
+    yield validate
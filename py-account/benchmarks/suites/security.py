@@ -0,0 +1,52 @@
+"""Password hashing, breached password screening and JWT benchmarks."""
+import os
+import tempfile
+from typing import Any, Callable, Iterator
+
+from app.helpers.password import hash_password, verify_password
+from app.infrastructures.security.breach_filter import BreachFilter, BreachFilterBuilder
+from app.infrastructures.security.jwt import create_access_token, decode_token
+from benchmarks.harness import benchmark
+
+PASSWORD = "Str0ng!Passw0rd"
+CLAIMS = {"sub": "2f1b6c1e-8f0a-4a7e-9d8e-1c2b3a4d5e6f", "email": "user@example.com"}
+
+
+# bcrypt is deliberately slow, so a handful of calls per round is enough
+@benchmark("security.hash_password", group="security", rounds=5, loops=3)
+def bench_hash_password() -> Iterator[Callable[[], Any]]:
+    yield lambda: hash_password(PASSWORD)
+
+
+@benchmark("security.verify_password", group="security", rounds=5, loops=3)
+def bench_verify_password() -> Iterator[Callable[[], Any]]:
+    hashed = hash_password(PASSWORD)
+    yield lambda: verify_password(PASSWORD, hashed)
+
+
+@benchmark("security.verify_password_mismatch", group="security", rounds=5, loops=3)
+def bench_verify_password_mismatch() -> Iterator[Callable[[], Any]]:
+    hashed = hash_password(PASSWORD)
+    yield lambda: verify_password("Wr0ng!Passw0rd", hashed)
+
+
+@benchmark("security.create_access_token", group="security")
+def bench_create_access_token() -> Iterator[Callable[[], Any]]:
+    yield lambda: create_access_token(CLAIMS)
+
+
+@benchmark("security.decode_token", group="security")
+def bench_decode_token() -> Iterator[Callable[[], Any]]:
+    token = create_access_token(CLAIMS)
+    yield lambda: decode_token(token)
+
+
+@benchmark("security.breach_filter_lookup", group="security")
+def bench_breach_filter_lookup() -> Iterator[Callable[[], Any]]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "breached.bloom")
+        with BreachFilterBuilder(path, capacity=100_000) as builder:
+            for i in range(100_000):
+                builder.add(f"breached-{i}")
+        with BreachFilter(path) as breach_filter:
+            yield lambda: PASSWORD in breach_filter
@@ -0,0 +1,96 @@
+"""Insert throughput and primary-key index size of uuid4 versus UUIDv7 keys.
+
+Creates two scratch tables shaped like ``users``, inserts the same number of
+rows into each in batches and reports rows per second together with the size
+of the primary-key index. Random uuid4 keys land on arbitrary leaf pages and
+split them, so their index ends up larger and inserts slow down once the index
+outgrows shared buffers.
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, List
+from uuid import UUID, uuid4
+
+import asyncpg
+
+from app.helpers.identifiers import uuid7
+from benchmarks.datagen import to_asyncpg_dsn
+
+
+@dataclass
+class UuidIndexResult:
+    """Insert and index statistics for one key generator."""
+    generator: str
+    rows: int
+    seconds: float
+    index_bytes: int
+    table_bytes: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+async def _measure(
+    conn: asyncpg.Connection,
+    name: str,
+    generate: Callable[[], UUID],
+    rows: int,
+    batch_size: int,
+) -> UuidIndexResult:
+    table = f"bench_keys_{name}"
+    await conn.execute(f"DROP TABLE IF EXISTS {table}")
+    await conn.execute(
+        f"CREATE TABLE {table} (id uuid PRIMARY KEY, email varchar(255) NOT NULL, "
+        "created_at timestamptz NOT NULL DEFAULT now())"
+    )
+    insert = f"INSERT INTO {table} (id, email) SELECT * FROM unnest($1::uuid[], $2::varchar[])"
+
+    elapsed = 0.0
+    for offset in range(0, rows, batch_size):
+        count = min(batch_size, rows - offset)
+        ids = [generate() for _ in range(count)]
+        emails = [f"user{offset + number}@example.com" for number in range(count)]
+        start = time.perf_counter()
+        await conn.execute(insert, ids, emails)
+        elapsed += time.perf_counter() - start
+
+    await conn.execute(f"VACUUM ANALYZE {table}")
+    index_bytes = await conn.fetchval(f"SELECT pg_relation_size('{table}_pkey')")
+    table_bytes = await conn.fetchval(f"SELECT pg_relation_size('{table}')")
+    await conn.execute(f"DROP TABLE {table}")
+    return UuidIndexResult(name, rows, elapsed, index_bytes, table_bytes)
+
+
+async def compare_uuid_index(
+    database_url: str, rows: int = 1_000_000, batch_size: int = 1_000
+) -> List[UuidIndexResult]:
+    """Run the insert benchmark for uuid4 and UUIDv7 keys.
+
+    Args:
+        database_url: SQLAlchemy or asyncpg URL of a disposable database
+        rows: Rows inserted per generator
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        One result per generator
+    """
+    conn = await asyncpg.connect(to_asyncpg_dsn(database_url))
+    try:
+        return [
+            await _measure(conn, "uuid4", uuid4, rows, batch_size),
+            await _measure(conn, "uuid7", uuid7, rows, batch_size),
+        ]
+    finally:
+        await conn.close()
+
+
+def format_uuid_index(results: List[UuidIndexResult]) -> str:
+    """Render results as a text table."""
+    lines = [f"{'generator':<10} {'rows':>10} {'rows/s':>12} {'index MiB':>10} {'table MiB':>10}"]
+    for result in results:
+        lines.append(
+            f"{result.generator:<10} {result.rows:>10,} {result.rows_per_second:>12,.0f} "
+            f"{result.index_bytes / 2**20:>10.1f} {result.table_bytes / 2**20:>10.1f}"
+        )
+    return "\n".join(lines)